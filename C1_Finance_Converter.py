@@ -1,7 +1,7 @@
 from tkinter import *
 from functools import partial
 from tkinter import ttk, messagebox
-import calculation_finance as calc
+import calculators
 
 
 class PersonalFinanceCalculator:
@@ -46,12 +46,7 @@ class PersonalFinanceCalculator:
         self.notebook.pack(expand=True, fill="both", padx=10, pady=10)
 
         # Create tab frames
-        self.tabs = {
-            "Loan Calculator": ttk.Frame(self.notebook),
-            "Mortgage Calculator": ttk.Frame(self.notebook),
-            "Investment Projector": ttk.Frame(self.notebook),
-            "Retirement Planner": ttk.Frame(self.notebook)
-        }
+        self.tabs = {definition["title"]: ttk.Frame(self.notebook) for definition in calculators.CALCULATORS.values()}
 
         # Add tabs to notebook
         for tab_name, tab_frame in self.tabs.items():
@@ -59,31 +54,13 @@ class PersonalFinanceCalculator:
 
     def setup_tab_content(self):
         """Setup content for each tab"""
-        tab_configs = {
-            "Loan Calculator": {
-                "fields": ["Loan Amount (NZD)", "Annual Interest Rate (%)", "Loan Term (Years)"],
-                "button_text": "Calculate Loan",
-                "command": self.calculate_loan
-            },
-            "Mortgage Calculator": {
-                "fields": ["Home Price (NZD)", "Down Payment (NZD)", "Annual Interest Rate (%)",
-                           "Mortgage Term (Years)"],
-                "button_text": "Calculate Mortgage",
-                "command": self.calculate_mortgage
-            },
-            "Investment Projector": {
-                "fields": ["Initial Investment (NZD)", "Annual Contribution (NZD)", "Annual Return Rate (%)",
-                           "Investment Period (Years)"],
-                "button_text": "Calculate Investment",
-                "command": self.calculate_investment
-            },
-            "Retirement Planner": {
-                "fields": ["Current Age", "Retirement Age", "Current KiwiSaver Balance (NZD)", "Annual Salary (NZD)",
-                           "Employee Contribution Rate (%)", "Expected Annual Return (%)"],
-                "button_text": "Calculate Retirement",
-                "command": self.calculate_retirement
+        tab_configs = {}
+        for definition in calculators.CALCULATORS.values():
+            tab_configs[definition["title"]] = {
+                "fields": definition["fields"],
+                "button_text": definition["button_text"],
+                "command": partial(self.calculate, definition["title"])
             }
-        }
 
         self.entries = {}
         self.result_labels = {}
@@ -150,137 +127,28 @@ class PersonalFinanceCalculator:
         current_tab = self.notebook.index(self.notebook.select())
         return self.notebook.tab(current_tab, option="text")
 
-    def validate_inputs(self, tab_name, required_fields):
+    def validate_inputs(self, tab_name):
         """Validate input fields for calculations"""
-        values = []
-        for field in required_fields:
-            try:
-                value = float(self.entries[tab_name][field].get())
-                if value < 0:
-                    raise ValueError("Negative values not allowed")
-                values.append(value)
-            except ValueError:
-                messagebox.showerror("Input Error", f"Please enter a valid positive number for {field}")
-                return None
-        return values
-
-    def calculate_loan(self):
-        """Calculate loan payment using NZ-specific calculations"""
-        tab_name = "Loan Calculator"
-        fields = ["Loan Amount (NZD)", "Annual Interest Rate (%)", "Loan Term (Years)"]
-        values = self.validate_inputs(tab_name, fields)
-
-        if values:
-            principal, annual_rate, years = values
-
-            try:
-                monthly_payment, total_interest, total_amount = calc.calculate_loan_payment(
-                    principal, annual_rate, years
-                )
-
-                result_text = (f"Monthly Payment: {calc.format_nz_currency(monthly_payment)}\n"
-                               f"Total Interest: {calc.format_nz_currency(total_interest)}\n"
-                               f"Total Amount: {calc.format_nz_currency(total_amount)}")
-
-                self.result_labels[tab_name].config(text=result_text, fg="#0066CC")
-
-            except Exception as e:
-                messagebox.showerror("Calculation Error", f"Error calculating loan: {str(e)}")
-
-    def calculate_mortgage(self):
-        """Calculate mortgage payment using NZ-specific calculations"""
-        tab_name = "Mortgage Calculator"
-        fields = ["Home Price (NZD)", "Down Payment (NZD)", "Annual Interest Rate (%)", "Mortgage Term (Years)"]
-        values = self.validate_inputs(tab_name, fields)
-
-        if values:
-            home_price, down_payment, annual_rate, years = values
-
-            if down_payment >= home_price:
-                messagebox.showerror("Input Error", "Down payment cannot be greater than or equal to home price")
-                return
-
-            try:
-                mortgage_details = calc.calculate_nz_mortgage_payment(
-                    home_price, down_payment, annual_rate, years
-                )
-
-                lvr_warning = " ⚠️ LMI Required" if mortgage_details['requires_lmi'] else ""
-
-                result_text = (f"Monthly Payment: {calc.format_nz_currency(mortgage_details['monthly_payment'])}\n"
-                               f"+ Insurance: {calc.format_nz_currency(mortgage_details['insurance_monthly'])}\n"
-                               f"Total Monthly: {calc.format_nz_currency(mortgage_details['total_monthly_payment'])}\n"
-                               f"LVR: {mortgage_details['lvr']:.1f}%{lvr_warning}\n"
-                               f"Total Interest: {calc.format_nz_currency(mortgage_details['total_interest'])}")
-
-                self.result_labels[tab_name].config(text=result_text, fg="#0066CC")
-
-            except Exception as e:
-                messagebox.showerror("Calculation Error", f"Error calculating mortgage: {str(e)}")
-
-    def calculate_investment(self):
-        """Calculate investment growth using NZ-specific calculations with tax considerations"""
-        tab_name = "Investment Projector"
-        fields = ["Initial Investment (NZD)", "Annual Contribution (NZD)", "Annual Return Rate (%)",
-                  "Investment Period (Years)"]
-        values = self.validate_inputs(tab_name, fields)
-
-        if values:
-            initial_investment, annual_contribution, annual_return_rate, years = values
-
+        fields = calculators.CALCULATORS[calculators.TITLES[tab_name]]["fields"]
+        try:
+            return calculators.validate_inputs(tab_name, [self.entries[tab_name][field].get() for field in fields])
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+            return None
+
+    def calculate(self, tab_name):
+        """Calculate using NZ-specific calculations"""
+        values = self.validate_inputs(tab_name)
+
+        if values is not None:
             try:
-                investment_details = calc.calculate_investment_growth_nz(
-                    initial_investment, annual_contribution, annual_return_rate, years, include_tax=True
-                )
-
-                result_text = (f"Final Value: {calc.format_nz_currency(investment_details['final_value'])}\n"
-                               f"Total Contributions: {calc.format_nz_currency(investment_details['total_contributions'])}\n"
-                               f"Growth (After PIE Tax): {calc.format_nz_currency(investment_details['total_growth'])}\n"
-                               f"Effective Return: {investment_details['effective_annual_return']:.2f}%\n"
-                               f"Est. Tax Paid: {calc.format_nz_currency(investment_details['tax_paid_estimate'])}")
-
-                self.result_labels[tab_name].config(text=result_text, fg="#0066CC")
-
-            except Exception as e:
-                messagebox.showerror("Calculation Error", f"Error calculating investment: {str(e)}")
-
-    def calculate_retirement(self):
-        """Calculate KiwiSaver retirement projection"""
-        tab_name = "Retirement Planner"
-        fields = ["Current Age", "Retirement Age", "Current KiwiSaver Balance (NZD)", "Annual Salary (NZD)",
-                  "Employee Contribution Rate (%)", "Expected Annual Return (%)"]
-        values = self.validate_inputs(tab_name, fields)
-
-        if values:
-            current_age, retirement_age, current_balance, annual_salary, employee_rate, expected_return = values
-
-            if retirement_age <= current_age:
-                messagebox.showerror("Input Error", "Retirement age must be greater than current age")
-                return
-
-            if retirement_age < 65:
-                messagebox.showwarning("NZ Super Warning", "Note: NZ Super is available from age 65")
-
-            try:
-                retirement_details = calc.calculate_kiwisaver_retirement(
-                    current_age, retirement_age, current_balance, annual_salary,
-                    employee_rate, expected_return, salary_growth=2
-                )
-
-                total_annual_income = retirement_details['annual_nz_super'] + retirement_details[
-                    'sustainable_annual_withdrawal']
-
-                result_text = (
-                    f"KiwiSaver at Retirement: {calc.format_nz_currency(retirement_details['projected_balance'])}\n"
-                    f"Annual NZ Super: {calc.format_nz_currency(retirement_details['annual_nz_super'])}\n"
-                    f"Sustainable Withdrawal: {calc.format_nz_currency(retirement_details['sustainable_annual_withdrawal'])}\n"
-                    f"Total Annual Income: {calc.format_nz_currency(total_annual_income)}\n"
-                    f"Years to Retirement: {retirement_details['years_to_retirement']}")
-
+                details = calculators.calculate(tab_name, values)
+                result_text = calculators.result_text(tab_name, values, details)
                 self.result_labels[tab_name].config(text=result_text, fg="#0066CC")
 
             except Exception as e:
-                messagebox.showerror("Calculation Error", f"Error calculating retirement: {str(e)}")
+                details_name = calculators.CALCULATORS[calculators.TITLES[tab_name]]["details_name"]
+                messagebox.showerror("Calculation Error", f"Error calculating {details_name}: {str(e)}")
 
     def to_help(self):
         """Open help dialogue box"""
@@ -1,6 +1,28 @@
 # Finance Calculator Constants
 MAX_FINANCE_CALCS = 5
+MAX_HISTORY_RECORDS = 1000  # Records kept in memory; older ones spill to disk
+HISTORY_VIEW_ROWS = 12  # Rows on screen in the history viewer
+HISTORY_SEARCH_CHUNK = 5000  # Records checked per step of a history search
+STARTUP_BUDGET_SECONDS = 1.5  # Longest acceptable time from launch to the first drawn window
+LIVE_UPDATE_DELAY_MS = 150  # Typing pause before a tab's result is recalculated
+LIVE_FRAME_MS = 16  # Shortest gap between showing a live result and starting the next one
+WORKER_STARTUP_BUDGET_SECONDS = 0.25  # Longest acceptable time to spawn a batch worker and import what it needs
 MIN_LOAN_AMOUNT = 1000
 MAX_LOAN_TERM = 30
 MIN_INTEREST_RATE = 0.1
 EXPORT_FILE_PREFIX = "finance_calculations"
+JOURNAL_FILE_PREFIX = "finance"
+JOURNAL_MAX_BYTES = 1000000  # Start a new journal segment once one reaches ~1 MB
+JOURNAL_FSYNC_BATCH = 10  # Calculations written between fsyncs
+GRID_MIN_RATE = 4.0  # Mortgage rate x term grid: rates from 4% to 9% in 5bp steps
+GRID_MAX_RATE = 9.0
+GRID_RATE_STEP = 0.05
+GRID_TERMS = [5, 10, 15, 20, 25, 30]
+EXPORT_CHOICES = {  # History export format: (export_writers format, compression)
+    "Text (.txt)": ("text", None),
+    "CSV (.csv)": ("csv", None),
+    "JSON Lines (.jsonl)": ("jsonl", None),
+    "CSV, gzip (.csv.gz)": ("csv", "gzip"),
+    "JSON Lines, gzip (.jsonl.gz)": ("jsonl", "gzip"),
+    "CSV, zstd (.csv.zst)": ("csv", "zstd")
+}
@@ -0,0 +1,464 @@
+"""
+Batch Finance Runner - New Zealand Edition
+Runs files of loan, mortgage, investment or retirement scenarios through the
+calculation_finance functions without the GUI
+
+Input is CSV (with a header row) or JSONL. Output is CSV, JSONL or text, gzip or
+zstd compressed when the output name ends in .gz or .zst (see export_writers), or
+a columnar result store for NumPy when it ends in .pfcs (see result_store). Each
+result row repeats its scenario's inputs ahead of the results.
+Rows are streamed in chunks so memory use stays constant however big the input
+file is.
+
+Usage:
+    python -m batch_finance scenarios.csv results.csv --calculator loan --workers 4
+    python -m batch_finance scenarios.csv results.jsonl.gz --calculator mortgage
+
+Without --calculator every input row needs a "calculator" column. With --validate
+each chunk is first checked against the calculators schema (with NumPy), and rows
+that break it get the same error message the GUI would show.
+"""
+
+import csv
+import json
+import sys
+import time
+from collections import deque
+from itertools import islice
+
+import calculation_cents
+import calculators
+
+DEFAULT_CHUNK_SIZE = 5000  # Rows handed to a worker at a time
+STORE_FORMAT = "store"  # --output-format for a columnar result store
+STORE_EXTENSION = ".pfcs"  # result_store.EXTENSION (not imported here so other formats don't need NumPy)
+BOOLEAN_RESULTS = ["requires_lmi", "mismatch"]
+INTEGER_RESULTS = ["row", "months", "years_to_retirement"]  # Plus every *_cents result
+READ_ERROR = "__read_error__"  # Scenario key holding why an input line couldn't be read
+
+
+def _from_schema(schema, results, flags=(), optional=(), function=None):
+    """
+    Build a batch calculator from a calculators.CALCULATORS entry
+
+    Args:
+        schema: calculators.CALCULATORS name (its fields are the input columns)
+        results: Output columns (calculate_loan_payment's tuple is named in this order)
+        flags: Yes/no input columns passed as keyword arguments
+        optional: Extra keyword argument columns the GUI doesn't ask for
+        function: Function to run instead of the calculator's own
+
+    Returns:
+        dict: Batch calculator ("fields" are required, "optional" are passed when present)
+    """
+    definition = calculators.CALCULATORS[schema]
+    return {
+        "schema": schema,
+        "function": function or definition["function"],
+        "fields": [field["name"] for field in definition["schema"] if field["default"] is None],
+        "optional": [field["name"] for field in definition["schema"] if field["default"] is not None]
+                    + list(optional),
+        "flags": list(flags),
+        "results": results
+    }
+
+
+# Input fields come from the calculators schema of the same name, so the GUI and
+# batch runs always take the same arguments; "schema" is what --validate checks
+CALCULATORS = {
+    "loan": _from_schema("loan", ["monthly_payment", "total_interest", "total_amount"]),
+    "loan_cents": _from_schema("loan", ["monthly_payment_cents", "final_payment_cents", "total_interest_cents",
+                                        "total_amount_cents", "float_total_interest_cents",
+                                        "interest_difference_cents", "mismatch"],
+                               function=calculation_cents.calculate_loan_payment_cents),
+    "mortgage": _from_schema("mortgage", ["loan_amount", "monthly_payment", "total_cost", "total_interest", "lvr",
+                                          "insurance_monthly", "total_monthly_payment", "requires_lmi"],
+                             flags=["include_insurance"]),
+    "investment": _from_schema("investment", ["final_value", "total_contributions", "total_growth",
+                                              "effective_annual_return", "tax_paid_estimate", "pre_tax_growth"],
+                               flags=["include_tax"]),
+    "retirement": _from_schema("retirement", ["projected_balance", "annual_nz_super",
+                                              "sustainable_annual_withdrawal", "years_to_retirement"],
+                               optional=["salary_growth"])
+}
+
+
+def input_fields(config):
+    """
+    Get a batch calculator's input columns
+
+    Args:
+        config: CALCULATORS entry
+
+    Returns:
+        list: Required fields, then optional fields, then flags
+    """
+    return config["fields"] + config["optional"] + config["flags"]
+
+
+def output_fields(calculator=None):
+    """
+    Get the output CSV columns for one calculator, or for a mixed file
+
+    Each output row echoes its scenario's inputs before the results, so the
+    output can be read on its own.
+
+    Args:
+        calculator: Calculator name, or None when rows name their own calculator
+
+    Returns:
+        list: Column names
+    """
+    names = [calculator] if calculator else list(CALCULATORS)
+    inputs = []
+    results = []
+    for name in names:
+        for field in input_fields(CALCULATORS[name]):
+            if field not in inputs:
+                inputs.append(field)
+        for field in CALCULATORS[name]["results"]:
+            if field not in results:
+                results.append(field)
+    return ["row", "calculator"] + inputs + results + ["error"]
+
+
+def store_columns(fields):
+    """
+    Get result store column types for output columns
+
+    Args:
+        fields: Column names from output_fields()
+
+    Returns:
+        dict: Column name to NumPy type name (the error column becomes a failed/ok flag)
+    """
+    import result_store
+
+    flags = {flag for config in CALCULATORS.values() for flag in config["flags"]}
+    columns = {}
+    for field in fields:
+        if field == "calculator":
+            columns[field] = result_store.CATEGORY
+        elif field == "error" or field in BOOLEAN_RESULTS or field in flags:
+            columns[field] = "bool"
+        elif field in INTEGER_RESULTS or field.endswith("_cents"):
+            columns[field] = "int64"
+        else:
+            columns[field] = "float64"
+    return columns
+
+
+def parse_flag(value):
+    """
+    Parse a yes/no column value
+
+    Args:
+        value: Text such as "true", "1", "yes" (or an actual bool from JSONL)
+
+    Returns:
+        bool: Parsed flag
+    """
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+def run_scenario(scenario, calculator=None, use_cache=False):
+    """
+    Run one scenario through its calculation_finance function
+
+    Args:
+        scenario: dict of input values keyed by argument name
+        calculator: Calculator name (defaults to the row's "calculator" value)
+        use_cache: Whether to go through the calculation_cache LRU caches
+
+    Returns:
+        dict: Parsed input values and result values keyed by output column
+    """
+    name = calculator or str(scenario.get("calculator", "")).strip().lower()
+    if READ_ERROR in scenario:
+        return {"calculator": name, "error": scenario[READ_ERROR]}
+    config = CALCULATORS.get(name)
+    if config is None:
+        return {"calculator": name, "error": f"Unknown calculator '{name}'"}
+
+    # Inputs are parsed one at a time so a failed row still echoes those that were read
+    args = []
+    kwargs = {}
+    try:
+        for field in config["fields"]:
+            args.append(float(scenario[field]))
+        for field in config["optional"]:
+            if scenario.get(field) not in (None, ""):
+                kwargs[field] = float(scenario[field])
+        for flag in config["flags"]:
+            if scenario.get(flag) not in (None, ""):
+                kwargs[flag] = parse_flag(scenario[flag])
+
+        function = config["function"]
+        if use_cache:
+            import calculation_cache
+            function = calculation_cache.CACHES.get(function.__name__, function)
+
+        result = function(*args, **kwargs)
+    except KeyError as e:
+        result = {"error": f"Missing value for {e.args[0]}"}
+    except (ValueError, TypeError, OverflowError, ZeroDivisionError) as e:
+        result = {"error": str(e)}
+    else:
+        # calculate_loan_payment returns a tuple, the others a dict
+        if not isinstance(result, dict):
+            result = dict(zip(config["results"], result))
+
+    result.update(zip(config["fields"], args))
+    result.update(kwargs)
+    result["calculator"] = name
+    return result
+
+
+def validate_scenarios(scenarios, calculator=None):
+    """
+    Check a chunk of scenarios against the calculators schema, a column at a time
+
+    Args:
+        scenarios: list of scenario dicts
+        calculator: Calculator name for every row, or None
+
+    Returns:
+        dict: Position in scenarios to error message, for each row that isn't valid
+    """
+    groups = {}  # Schema name: positions of its rows
+    for position, scenario in enumerate(scenarios):
+        name = calculator or str(scenario.get("calculator", "")).strip().lower()
+        if name in CALCULATORS and READ_ERROR not in scenario:
+            groups.setdefault(CALCULATORS[name]["schema"], []).append(position)
+
+    errors = {}
+    for schema, positions in groups.items():
+        columns = {field["name"]: [scenarios[position].get(field["name"]) for position in positions]
+                   for field in calculators.field_schema(schema)}
+        _, messages = calculators.validate_columns(schema, columns)
+        for position, message in zip(positions, messages):
+            if message is not None:
+                errors[position] = message
+    return errors
+
+
+def run_chunk(first_row, scenarios, calculator=None, cache_size=0, validate=False):
+    """
+    Run a chunk of scenarios (runs in a worker process when --workers > 1)
+
+    Args:
+        first_row: Row number of the first scenario in the chunk
+        scenarios: list of scenario dicts
+        calculator: Calculator name for every row, or None
+        cache_size: Per-function LRU cache size (0 disables caching)
+        validate: Check the chunk with validate_scenarios() first (rows that fail aren't run)
+
+    Returns:
+        list: Result dicts with their row numbers
+    """
+    if cache_size:
+        import calculation_cache
+        calculation_cache.configure_caches(cache_size)
+
+    errors = validate_scenarios(scenarios, calculator) if validate else {}
+
+    results = []
+    for position, scenario in enumerate(scenarios):
+        row_number = first_row + position
+        if position in errors:
+            name = calculator or str(scenario.get("calculator", "")).strip().lower()
+            results.append({"calculator": name, "error": errors[position], "row": row_number})
+            continue
+        result = run_scenario(scenario, calculator, use_cache=bool(cache_size))
+        result["row"] = row_number
+        results.append(result)
+    return results
+
+
+def read_scenarios(input_file, input_format="csv"):
+    """
+    Stream scenarios from an open CSV or JSONL file one row at a time
+
+    Args:
+        input_file: Open text file
+        input_format: "csv" or "jsonl"
+
+    Yields:
+        dict: One scenario per input row (a JSONL line that isn't a JSON object gives
+              {READ_ERROR: message}, so it gets an error result like any other bad row)
+    """
+    if input_format == "jsonl":
+        for line_number, line in enumerate(input_file, start=1):
+            if not line.strip():
+                continue
+            try:
+                scenario = json.loads(line)
+            except ValueError as e:
+                yield {READ_ERROR: f"Line {line_number} is not valid JSON: {e}"}
+                continue
+            if isinstance(scenario, dict):
+                yield scenario
+            else:
+                yield {READ_ERROR: f"Line {line_number} is not a JSON object"}
+    else:
+        yield from csv.DictReader(input_file)
+
+
+def read_chunks(scenarios, chunk_size):
+    """
+    Group a scenario stream into numbered chunks
+
+    Args:
+        scenarios: Iterator of scenario dicts
+        chunk_size: Rows per chunk
+
+    Yields:
+        tuple: (first_row, list of scenarios)
+    """
+    first_row = 1
+    while True:
+        chunk = list(islice(scenarios, chunk_size))
+        if not chunk:
+            return
+        yield first_row, chunk
+        first_row += len(chunk)
+
+
+def run_batch(input_file, writer, calculator=None, input_format="csv", workers=1,
+              chunk_size=DEFAULT_CHUNK_SIZE, cache_size=0, validate=False):
+    """
+    Run every scenario in input_file and write one result row per scenario
+
+    At most two chunks per worker are in flight, so memory stays constant and output
+    rows stay in input order.
+
+    Args:
+        input_file: Open text file of scenarios
+        writer: export_writers.ExportWriter or result_store.ResultStoreWriter for the results
+                (fields from output_fields())
+        calculator: Calculator name for every row, or None to use each row's "calculator" column
+        input_format: "csv" or "jsonl"
+        workers: Number of worker processes (1 runs everything in this process)
+        chunk_size: Rows per chunk
+        cache_size: Per-function LRU cache size (0 disables caching; each worker has its own)
+        validate: Check each chunk against the calculators schema before running it (needs NumPy)
+
+    Returns:
+        int: Number of rows processed
+    """
+    chunks = read_chunks(read_scenarios(input_file, input_format), chunk_size)
+    row_count = 0
+
+    if workers <= 1:
+        for first_row, scenarios in chunks:
+            results = run_chunk(first_row, scenarios, calculator, cache_size, validate)
+            writer.write_all(results)
+            row_count += len(results)
+        return row_count
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for first_row, scenarios in chunks:
+            pending.append(executor.submit(run_chunk, first_row, scenarios, calculator, cache_size,
+                                           validate))
+            if len(pending) >= workers * 2:
+                results = pending.popleft().result()
+                writer.write_all(results)
+                row_count += len(results)
+
+        while pending:
+            results = pending.popleft().result()
+            writer.write_all(results)
+            row_count += len(results)
+
+    return row_count
+
+
+def main(argv=None):
+    """
+    Command line entry point
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        int: Exit status
+    """
+    # Only the command line needs these; worker processes import this module without them
+    import argparse
+    import export_writers
+
+    parser = argparse.ArgumentParser(prog="python -m batch_finance",
+                                     description="Run finance scenarios from a CSV/JSONL file.")
+    parser.add_argument("input", help="Scenario file (CSV or JSONL), or - for stdin")
+    parser.add_argument("output", help="Result file (.csv, .jsonl or .txt, optionally .gz/.zst), or - for stdout")
+    parser.add_argument("--calculator", choices=sorted(CALCULATORS),
+                        help="Calculator for every row (default: each row's 'calculator' column)")
+    parser.add_argument("--format", dest="input_format", choices=["csv", "jsonl"],
+                        help="Input format (default: from the file extension)")
+    parser.add_argument("--output-format", choices=sorted([*export_writers.EXPORT_WRITERS, STORE_FORMAT]),
+                        help="Output format (default: from the file extension, else csv)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Rows per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="Cache up to this many repeated scenarios per calculator (default: off)")
+    parser.add_argument("--validate", action="store_true",
+                        help="Check inputs with the calculator's own rules first, as the GUI does (needs NumPy)")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    input_format = args.input_format
+    if input_format is None:
+        input_format = "jsonl" if args.input.endswith((".jsonl", ".ndjson")) else "csv"
+
+    output_format, compression = export_writers.format_from_name(args.output)
+    if args.output.lower().endswith(STORE_EXTENSION):
+        output_format = STORE_FORMAT
+    output_format = args.output_format or output_format
+    fields = output_fields(args.calculator)
+
+    if output_format == STORE_FORMAT:
+        if args.output == "-":
+            parser.error("A result store needs an output file, not stdout")
+        import result_store  # Needs NumPy
+        writer = result_store.ResultStoreWriter(args.output, store_columns(fields), kind=args.calculator)
+    else:
+        try:
+            writer = export_writers.open_writer(sys.stdout if args.output == "-" else args.output,
+                                                output_format, compression, fields)
+        except ValueError as e:
+            parser.error(str(e))
+
+    input_file = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+
+    start = time.perf_counter()
+    try:
+        with writer:  # A result store is discarded, not finished, if the run fails
+            row_count = run_batch(input_file, writer, args.calculator, input_format,
+                                  args.workers, args.chunk_size, args.cache_size, args.validate)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+    elapsed = time.perf_counter() - start
+
+    rate = row_count / elapsed if elapsed > 0 else 0
+    print(f"Processed {row_count:,} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)", file=sys.stderr)
+
+    # Worker processes keep their own caches, so only in-process stats are available
+    if args.cache_size and args.workers <= 1:
+        import calculation_cache
+        for name, stats in calculation_cache.cache_stats().items():
+            if stats['hits'] or stats['misses']:
+                print(f"{name}: {stats['hit_rate']:.1%} hit rate ({stats['hits']:,} hits, "
+                      f"{stats['misses']:,} misses, {stats['evictions']:,} evictions)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
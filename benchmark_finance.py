@@ -0,0 +1,419 @@
+"""
+Benchmark Suite - New Zealand Edition
+Times every scalar entry point (calculation_finance, goal_seek, calculation_cents
+and mortgage_events) and the NumPy batch versions when NumPy is installed, on
+realistic NZ inputs
+
+Usage:
+    python -m benchmark_finance --save benchmark_baseline.json
+    python -m benchmark_finance --compare benchmark_baseline.json --threshold 15
+
+With --compare the exit status is 1 if any benchmark is more than --threshold
+percent slower (in ns/call) than the baseline.
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from collections import deque
+from datetime import date
+from functools import wraps
+
+import calculation_cents
+import calculation_finance as calc
+import goal_seek
+import mortgage_events
+
+DEFAULT_CALLS = 20000  # Calls (or batch rows) per timing run
+DEFAULT_REPEATS = 5  # Timing runs per benchmark; the fastest one is reported
+DEFAULT_THRESHOLD = 10.0  # Allowed slowdown against the baseline, in percent
+DEFAULT_SEED = 2024
+KIWISAVER_RATES = [3, 4, 6, 8, 10]
+LOAN_START = date(2025, 1, 15)  # Fixed start date so event simulations don't depend on today
+
+
+def loan_inputs(rng, count):
+    """Personal/car loans: $5k-$80k, 6-14% p.a., 1-7 years"""
+    return [(round(rng.uniform(5000, 80000), -2), round(rng.uniform(6, 14), 2), rng.randint(1, 7))
+            for _ in range(count)]
+
+
+def mortgage_inputs(rng, count):
+    """NZ homes around $850k (lognormal), 10-35% deposit, 5.5-7.5% p.a., 25 or 30 years"""
+    rows = []
+    for _ in range(count):
+        home_price = round(rng.lognormvariate(13.65, 0.35), -3)
+        down_payment = round(home_price * rng.uniform(0.10, 0.35), -3)
+        rows.append((home_price, down_payment, round(rng.uniform(5.5, 7.5), 2), rng.choice([25, 30])))
+    return rows
+
+
+def investment_inputs(rng, count):
+    """Managed funds: $0-$50k initial, $1k-$20k a year, 3-9% return, 5-40 years"""
+    return [(round(rng.uniform(0, 50000), -2), round(rng.uniform(1000, 20000), -2),
+             round(rng.uniform(3, 9), 1), rng.randint(5, 40)) for _ in range(count)]
+
+
+def retirement_inputs(rng, count):
+    """KiwiSaver members aged 20-60 retiring at 65, $45k-$150k salary"""
+    return [(rng.randint(20, 60), 65, round(rng.uniform(0, 200000), -2), round(rng.uniform(45000, 150000), -3),
+             rng.choice(KIWISAVER_RATES), round(rng.uniform(3, 7), 1)) for _ in range(count)]
+
+
+def _loans_with_payments(rng, count):
+    """Loan inputs with their monthly payment: (principal, rate, years, payment)"""
+    return [(principal, rate, years, calc.calculate_loan_payment(principal, rate, years)[0])
+            for principal, rate, years in loan_inputs(rng, count)]
+
+
+def principal_solver_inputs(rng, count):
+    """Monthly payments, rates and terms of personal/car loans"""
+    return [(payment, rate, years) for principal, rate, years, payment in _loans_with_payments(rng, count)]
+
+
+def term_solver_inputs(rng, count):
+    """Loan amounts, monthly payments and rates of personal/car loans"""
+    return [(principal, payment, rate) for principal, rate, years, payment in _loans_with_payments(rng, count)]
+
+
+def rate_solver_inputs(rng, count):
+    """Loan amounts, monthly payments and terms of personal/car loans"""
+    return [(principal, payment, years) for principal, rate, years, payment in _loans_with_payments(rng, count)]
+
+
+def _mortgages_with_payments(rng, count):
+    """Mortgage inputs with their total monthly payment: (home price, deposit, rate, years, payment)"""
+    return [(home_price, down_payment, rate, years,
+             calc.calculate_nz_mortgage_payment(home_price, down_payment, rate, years)['total_monthly_payment'])
+            for home_price, down_payment, rate, years in mortgage_inputs(rng, count)]
+
+
+def home_price_solver_inputs(rng, count):
+    """Total monthly payments, deposits, rates and terms of NZ mortgages"""
+    return [(payment, down_payment, rate, years)
+            for home_price, down_payment, rate, years, payment in _mortgages_with_payments(rng, count)]
+
+
+def mortgage_term_solver_inputs(rng, count):
+    """Home prices, deposits, total monthly payments and rates of NZ mortgages"""
+    return [(home_price, down_payment, payment, rate)
+            for home_price, down_payment, rate, years, payment in _mortgages_with_payments(rng, count)]
+
+
+def mortgage_rate_solver_inputs(rng, count):
+    """Home prices, deposits, total monthly payments and terms of NZ mortgages"""
+    return [(home_price, down_payment, payment, years)
+            for home_price, down_payment, rate, years, payment in _mortgages_with_payments(rng, count)]
+
+
+def mortgage_event_inputs(rng, count):
+    """NZ mortgages with a yearly lump sum, a payment rise, an offset deposit and a redraw"""
+    rows = []
+    for home_price, down_payment, rate, years in mortgage_inputs(rng, count):
+        loan_amount = home_price - down_payment
+        events = [(month, "lump_sum", round(rng.uniform(1000, 10000), -2)) for month in range(12, 121, 12)]
+        events.append((rng.randint(24, 60), "payment_change",
+                       round(calc.calculate_loan_payment(loan_amount, rate, years)[0] * 1.2, 2)))
+        events.append((rng.randint(1, 36), "offset_change", round(rng.uniform(5000, 50000), -2)))
+        events.append((rng.randint(60, 120), "redraw", round(rng.uniform(1000, 20000), -2)))
+        rows.append((loan_amount, rate, years, events, LOAN_START))
+    return rows
+
+
+def contribution_inputs(rng, count):
+    """Salaries and KiwiSaver rates"""
+    return [(round(rng.uniform(45000, 150000), -3), rng.choice(KIWISAVER_RATES)) for _ in range(count)]
+
+
+def currency_inputs(rng, count):
+    """Amounts from cents to millions"""
+    return [(round(10 ** rng.uniform(-1, 7), 2),) for _ in range(count)]
+
+
+def currency_code_inputs(rng, count):
+    """Amounts from cents to millions in each CURRENCY_FORMATS style"""
+    currencies = list(calc.CURRENCY_FORMATS)
+    return [(round(10 ** rng.uniform(-1, 7), 2), rng.choice(currencies)) for _ in range(count)]
+
+
+def _consumed(generator_function):
+    """Wrap a generator function so each timed call runs it to the end"""
+    @wraps(generator_function)
+    def consume(*args):
+        deque(generator_function(*args), maxlen=0)
+    return consume
+
+
+def _columns(rows):
+    """Turn a list of argument tuples into NumPy columns"""
+    import numpy as np
+    return [np.array(column, dtype=np.float64) for column in zip(*rows)]
+
+
+def _grid_arguments(columns):
+    """mortgage_payment_grid arguments: one home, and a square rate x term grid of about as many cells as rows"""
+    home_price, down_payment, annual_rates, years = columns
+    side = max(int(len(home_price) ** 0.5), 1)
+    return [home_price[0], down_payment[0], annual_rates[:side], years[:side]]
+
+
+# name: (function to time, input generator). Generator functions (the schedules) are
+# run to the end on every call.
+SCALAR_BENCHMARKS = {
+    "calculate_loan_payment": (calc.calculate_loan_payment, loan_inputs),
+    "calculate_nz_mortgage_payment": (calc.calculate_nz_mortgage_payment, mortgage_inputs),
+    "calculate_investment_growth_nz": (calc.calculate_investment_growth_nz, investment_inputs),
+    "calculate_kiwisaver_retirement": (calc.calculate_kiwisaver_retirement, retirement_inputs),
+    "calculate_kiwisaver_contributions": (calc.calculate_kiwisaver_contributions, contribution_inputs),
+    "calculate_gst_inclusive": (calc.calculate_gst_inclusive, currency_inputs),
+    "calculate_gst_exclusive": (calc.calculate_gst_exclusive, currency_inputs),
+    "loan_amortization_schedule": (_consumed(calc.loan_amortization_schedule), loan_inputs),
+    "mortgage_amortization_schedule": (_consumed(calc.mortgage_amortization_schedule), mortgage_inputs),
+    "format_nz_currency": (calc.format_nz_currency, currency_inputs),
+    "format_currency": (calc.format_currency, currency_code_inputs),
+    "solve_loan_principal": (goal_seek.solve_loan_principal, principal_solver_inputs),
+    "solve_loan_term": (goal_seek.solve_loan_term, term_solver_inputs),
+    "solve_loan_rate": (goal_seek.solve_loan_rate, rate_solver_inputs),
+    "solve_mortgage_home_price": (goal_seek.solve_mortgage_home_price, home_price_solver_inputs),
+    "solve_mortgage_term": (goal_seek.solve_mortgage_term, mortgage_term_solver_inputs),
+    "solve_mortgage_rate": (goal_seek.solve_mortgage_rate, mortgage_rate_solver_inputs),
+    "calculate_loan_payment_cents": (calculation_cents.calculate_loan_payment_cents, loan_inputs),
+    "loan_schedule_cents": (_consumed(calculation_cents.loan_schedule_cents), loan_inputs),
+    "simulate_mortgage": (mortgage_events.simulate_mortgage, mortgage_event_inputs)
+}
+
+# name: (calculation_batch function name, input generator, column adapter or None) - called
+# once on whole columns. Every calculation_batch kernel should have an entry here so
+# --compare catches its regressions.
+BATCH_BENCHMARKS = {
+    "calculate_loan_payment_batch": ("calculate_loan_payment_batch", loan_inputs, None),
+    "calculate_loan_payment_cents_batch": ("calculate_loan_payment_cents_batch", loan_inputs, None),
+    "loan_amortization_schedule_batch": ("loan_amortization_schedule_batch", loan_inputs, None),
+    "solve_loan_principal_batch": ("solve_loan_principal_batch", principal_solver_inputs, None),
+    "solve_loan_term_batch": ("solve_loan_term_batch", term_solver_inputs, None),
+    "solve_loan_rate_batch": ("solve_loan_rate_batch", rate_solver_inputs, None),
+    "mortgage_payment_grid": ("mortgage_payment_grid", mortgage_inputs, _grid_arguments),
+    "calculate_investment_growth_nz_batch": ("calculate_investment_growth_nz_batch", investment_inputs, None),
+    "calculate_kiwisaver_retirement_cohort": ("calculate_kiwisaver_retirement_cohort", retirement_inputs, None),
+    "format_currency_bytes_batch": ("format_currency_bytes_batch", currency_inputs, None),
+    "format_currency_batch": ("format_currency_batch", currency_inputs, None)
+}
+
+
+def time_scalar(function, rows, repeats):
+    """
+    Time one call per input row
+
+    Args:
+        function: Function to call
+        rows: list of argument tuples
+        repeats: Number of timing runs
+
+    Returns:
+        float: Fastest run in seconds
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for args in rows:
+            function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_batch(function, columns, repeats):
+    """
+    Time one call over whole input columns
+
+    Args:
+        function: Batch function
+        columns: list of NumPy input columns
+        repeats: Number of timing runs
+
+    Returns:
+        float: Fastest run in seconds
+    """
+    function(*columns)  # Warm up (first-touch page faults on the output arrays)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*columns)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(calls=DEFAULT_CALLS, repeats=DEFAULT_REPEATS, seed=DEFAULT_SEED, names=None):
+    """
+    Run the benchmark suite
+
+    Args:
+        calls: Calls (or batch rows) per timing run
+        repeats: Timing runs per benchmark
+        seed: Seed for the input generators
+        names: Benchmark names to run (None runs all)
+
+    Returns:
+        dict: {name: {'ns_per_call', 'calls_per_sec', 'calls'}}
+    """
+    results = {}
+
+    for name, (function, make_inputs) in SCALAR_BENCHMARKS.items():
+        if names and name not in names:
+            continue
+        rows = make_inputs(random.Random(seed), calls)
+        results[name] = _result(time_scalar(function, rows, repeats), calls)
+
+    try:
+        import calculation_batch
+    except ImportError:
+        calculation_batch = None  # NumPy not installed: scalar benchmarks only
+
+    if calculation_batch is not None:
+        for name, (function_name, make_inputs, make_arguments) in BATCH_BENCHMARKS.items():
+            if names and name not in names:
+                continue
+            columns = _columns(make_inputs(random.Random(seed), calls))
+            if make_arguments is not None:
+                columns = make_arguments(columns)
+            results[name] = _result(time_batch(getattr(calculation_batch, function_name), columns, repeats),
+                                    calls)
+
+    return results
+
+
+def _result(seconds, calls):
+    """Convert a timing into per-call figures"""
+    return {
+        'ns_per_call': seconds / calls * 1e9,
+        'calls_per_sec': calls / seconds if seconds > 0 else float("inf"),
+        'calls': calls
+    }
+
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Find benchmarks that got slower than the baseline by more than threshold percent
+
+    Args:
+        results: Current run_benchmarks() results
+        baseline: Saved results (the 'results' part of a baseline file)
+        threshold: Allowed slowdown in percent
+
+    Returns:
+        list: (name, baseline ns/call, current ns/call, percent change) for each regression
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        change = (current['ns_per_call'] / previous['ns_per_call'] - 1) * 100
+        if change > threshold:
+            regressions.append((name, previous['ns_per_call'], current['ns_per_call'], change))
+    return regressions
+
+
+def save_baseline(path, results):
+    """
+    Save results as a JSON baseline
+
+    Args:
+        path: File to write
+        results: run_benchmarks() results
+    """
+    baseline = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'results': results
+    }
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(baseline, baseline_file, indent=2)
+
+
+def load_baseline(path):
+    """
+    Load a JSON baseline
+
+    Args:
+        path: File to read
+
+    Returns:
+        dict: Saved results keyed by benchmark name
+    """
+    with open(path, encoding="utf-8") as baseline_file:
+        return json.load(baseline_file)['results']
+
+
+def format_results(results, baseline=None):
+    """
+    Format results as a text table
+
+    Args:
+        results: run_benchmarks() results
+        baseline: Saved results to show the change against (optional)
+
+    Returns:
+        str: Table text
+    """
+    lines = [f"{'Benchmark':<40}{'ns/call':>12}{'calls/sec':>16}{'vs baseline':>14}"]
+    for name, result in results.items():
+        change = ""
+        if baseline and name in baseline:
+            change = f"{(result['ns_per_call'] / baseline[name]['ns_per_call'] - 1) * 100:+.1f}%"
+        lines.append(f"{name:<40}{result['ns_per_call']:>12,.1f}{result['calls_per_sec']:>16,.0f}{change:>14}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        int: Exit status (1 if a regression was found)
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmark_finance",
+                                     description="Benchmark the finance calculation functions.")
+    parser.add_argument("--calls", type=int, default=DEFAULT_CALLS, help="Calls per timing run")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timing runs per benchmark")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Input generator seed")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="Only run these benchmarks")
+    parser.add_argument("--save", metavar="FILE", help="Save the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="Compare against a saved JSON baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown in percent (default: {DEFAULT_THRESHOLD:g})")
+    args = parser.parse_args(argv)
+    if args.calls < 1:
+        parser.error("--calls must be at least 1")
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1")
+
+    results = run_benchmarks(args.calls, args.repeats, args.seed, args.only)
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    print(format_results(results, baseline))
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"\nBaseline saved to {args.save}")
+
+    if baseline is not None:
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions over {args.threshold:g}%:")
+            for name, previous, current, change in regressions:
+                print(f"  {name}: {previous:,.1f} -> {current:,.1f} ns/call ({change:+.1f}%)")
+            return 1
+        print(f"\nNo regressions over {args.threshold:g}%")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
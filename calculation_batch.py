@@ -0,0 +1,723 @@
+"""
+Batch Calculation Module - New Zealand Edition
+Vectorised (NumPy) versions of the calculation_finance functions
+Used when pricing many scenarios at once instead of one Python call per scenario
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from calculation_cents import INTEREST_DIVISOR, RATE_SCALE, ROUNDING_MODES
+from calculation_finance import (CURRENCY_FORMATS, KIWISAVER_EMPLOYER_RATE, KIWISAVER_GOVERNMENT_CONTRIBUTION,
+                                 MAX_PROJECTED_BALANCE, MAX_YEARS_TO_RETIREMENT, MORTGAGE_INSURANCE_RATE,
+                                 NZ_SUPER_ANNUAL, SUSTAINABLE_WITHDRAWAL_RATE, format_currency)
+from goal_seek import ZERO_RATE_TOLERANCE
+
+
+def _as_float_arrays(*values):
+    """
+    Convert scalars/sequences to broadcast float64 arrays
+
+    Args:
+        *values: Numbers, sequences or NumPy arrays
+
+    Returns:
+        list: Float arrays (at least 1-D) all broadcast to the same shape
+    """
+    return np.broadcast_arrays(*[np.atleast_1d(np.asarray(value, dtype=np.float64)) for value in values])
+
+
+def calculate_loan_payment_batch(principal, annual_rate, years):
+    """
+    Calculate monthly loan payment and total interest for many loans at once
+
+    Matches calculate_loan_payment to well under a cent, including the 0% interest branch.
+    Rows with a zero term give inf/nan instead of raising ZeroDivisionError.
+    Scalar inputs are returned as 1-element arrays.
+
+    Args:
+        principal: Loan amounts in NZD (array, sequence or scalar)
+        annual_rate: Annual interest rates as percentages
+        years: Loan terms in years
+
+    Returns:
+        tuple: (monthly_payment, total_interest, total_amount) as float arrays
+    """
+    principal, annual_rate, years = _as_float_arrays(principal, annual_rate, years)
+
+    monthly_rate = np.multiply(annual_rate, 1 / 1200)
+    months = np.multiply(years, 12)
+    zero_rate = None if monthly_rate.all() else monthly_rate == 0  # Only build the mask if it's needed
+
+    # The scalar formula rewritten as principal * (rate + rate / expm1(months * log1p(rate))):
+    # fewer passes over the arrays than power(), and no cancellation in (1 + rate) ** months - 1.
+    # Done in place, so months becomes the total interest and monthly_rate the total amount.
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        monthly_payment = np.log1p(monthly_rate)
+        monthly_payment *= months
+        np.expm1(monthly_payment, out=monthly_payment)
+        np.divide(monthly_rate, monthly_payment, out=monthly_payment)
+        monthly_payment += monthly_rate
+        monthly_payment *= principal
+
+        # 0% interest rows: straight-line repayment, no interest
+        if zero_rate is not None:
+            np.divide(principal, months, out=monthly_payment, where=zero_rate)
+
+        total_amount = np.multiply(monthly_payment, months, out=monthly_rate)
+        total_interest = np.subtract(total_amount, principal, out=months)
+        if zero_rate is not None:
+            total_interest[zero_rate] = 0.0
+            total_amount[zero_rate] = principal[zero_rate]
+
+    return monthly_payment, total_interest, total_amount
+
+
+def _exact_loan_payment_batch(principal, annual_rate, years):
+    """
+    calculate_loan_payment_batch with calculate_loan_payment's own operation order, so every
+    result is bit-for-bit the scalar one (needed where results are rounded to the cent, since
+    a last-bit difference can move a value across a half cent)
+
+    Args:
+        principal: Loan amounts in NZD
+        annual_rate: Annual interest rates as percentages
+        years: Loan terms in years
+
+    Returns:
+        tuple: (monthly_payment, total_interest, total_amount) as float arrays
+    """
+    principal, annual_rate, years = _as_float_arrays(principal, annual_rate, years)
+
+    monthly_rate = np.divide(annual_rate, 100)
+    monthly_rate /= 12
+    months = np.multiply(years, 12)
+    zero_rate = None if monthly_rate.all() else monthly_rate == 0
+
+    # Done in place: monthly_rate becomes the payment and months the total interest
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        growth = np.add(monthly_rate, 1)
+        np.power(growth, months, out=growth)
+        monthly_payment = np.multiply(monthly_rate, growth, out=monthly_rate)
+        monthly_payment *= principal
+        growth -= 1
+        monthly_payment /= growth
+
+        if zero_rate is not None:
+            np.divide(principal, months, out=monthly_payment, where=zero_rate)
+
+        total_interest = np.multiply(monthly_payment, months, out=months)
+        total_interest -= principal
+        if zero_rate is not None:
+            total_interest[zero_rate] = 0.0
+
+    total_amount = np.add(principal, total_interest, out=growth)
+
+    return monthly_payment, total_interest, total_amount
+
+
+def _annuity_factor_batch(rate, periods):
+    """
+    Future value of 1 NZD paid at the end of each period, in closed form
+    (sum of (1 + rate) ** k for k < periods; 0% gives periods)
+
+    Args:
+        rate: Growth rates per period as decimals
+        periods: Whole numbers of payments
+
+    Returns:
+        ndarray: Annuity accumulation factors
+    """
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        factor = np.where(rate > -1,
+                          np.expm1(periods * np.log1p(np.maximum(rate, -1))) / rate,
+                          ((1 + rate) ** periods - 1) / rate)
+    return np.where(rate == 0, periods, factor)
+
+
+def calculate_investment_growth_nz_batch(initial_investment, annual_contribution, annual_return_rate, years,
+                                         include_tax=True):
+    """
+    Calculate investment growth for many scenarios at once with NZ tax considerations
+
+    Matches calculate_investment_growth_nz element by element, including non-integer years,
+    to within rounding (about 1e-14 relative): contributions use the closed-form annuity
+    factor where the scalar function sums them year by year.
+
+    Args:
+        initial_investment: Starting investment amounts in NZD
+        annual_contribution: Amounts added each year in NZD
+        annual_return_rate: Expected annual returns as percentages
+        years: Investment periods in years
+        include_tax: Whether to include PIE tax estimates (28% for high earners)
+
+    Returns:
+        dict: Investment projection details, one float array per key
+    """
+    initial_investment, annual_contribution, annual_return_rate, years = _as_float_arrays(
+        initial_investment, annual_contribution, annual_return_rate, years)
+
+    rate = annual_return_rate / 100
+    effective_rate = rate * (1 - 0.28) if include_tax else rate
+
+    contribution_years = np.maximum(np.trunc(years), 0)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        final_value = initial_investment * (1 + effective_rate) ** years
+        final_value += (annual_contribution * (1 + effective_rate) ** (years - contribution_years)
+                        * _annuity_factor_batch(effective_rate, contribution_years))
+
+    total_contributions = initial_investment + (annual_contribution * years)
+    total_growth = final_value - total_contributions
+
+    if include_tax:
+        pre_tax_equivalent = total_growth / (1 - 0.28)
+        tax_paid_estimate = pre_tax_equivalent - total_growth
+    else:
+        pre_tax_equivalent = total_growth
+        tax_paid_estimate = np.zeros_like(total_growth)
+
+    return {
+        'final_value': final_value,
+        'total_contributions': total_contributions,
+        'total_growth': total_growth,
+        'effective_annual_return': effective_rate * 100,
+        'tax_paid_estimate': tax_paid_estimate,
+        'pre_tax_growth': pre_tax_equivalent
+    }
+
+
+def calculate_kiwisaver_retirement_cohort(current_age, retirement_age, current_balance, annual_salary,
+                                          employee_rate=3, expected_return=5, salary_growth=2):
+    """
+    Calculate KiwiSaver retirement projections for a whole cohort of members at once
+
+    All members are stepped forward together one year at a time; members who have already
+    reached retirement are masked out of later years. Matches calculate_kiwisaver_retirement
+    element by element. Rows that the scalar function would reject (retirement age not above
+    current age, more than 70 years, negative balance/salary, return outside -100%..100%,
+    balance blowing past the limit) are flagged in 'valid' and given NaN results.
+
+    Args:
+        current_age: Current ages
+        retirement_age: Planned retirement ages
+        current_balance: Current KiwiSaver balances
+        annual_salary: Current annual salaries
+        employee_rate: Employee contribution rates (3, 4, 6, 8, or 10)
+        expected_return: Expected annual return percentages
+        salary_growth: Annual salary growth percentages
+
+    Returns:
+        dict: KiwiSaver retirement projection, one array per key
+    """
+    (current_age, retirement_age, current_balance, annual_salary,
+     employee_rate, expected_return, salary_growth) = _as_float_arrays(
+        current_age, retirement_age, current_balance, annual_salary,
+        employee_rate, expected_return, salary_growth)
+
+    years_to_retirement = np.trunc(retirement_age - current_age)
+
+    valid = ((years_to_retirement > 0) & (years_to_retirement <= MAX_YEARS_TO_RETIREMENT)
+             & (current_balance >= 0) & (annual_salary >= 0)
+             & (expected_return >= -100) & (expected_return <= 100))
+
+    return_multiplier = 1 + expected_return / 100
+    salary_multiplier = 1 + salary_growth / 100
+
+    # Same decimal conversion as calculate_kiwisaver_contributions(salary, employee_rate / 100)
+    employee_decimal = employee_rate / 100
+    employee_decimal = np.where(employee_decimal > 1, employee_decimal / 100, employee_decimal)
+
+    balance = current_balance.copy()
+    current_salary = annual_salary.copy()
+    horizon = int(years_to_retirement[valid].max()) if valid.any() else 0
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        for year in range(horizon):
+            active = valid & (year < years_to_retirement)
+
+            annual_contribution = (current_salary * employee_decimal
+                                   + current_salary * KIWISAVER_EMPLOYER_RATE
+                                   + KIWISAVER_GOVERNMENT_CONTRIBUTION)
+
+            balance = np.where(active, balance * return_multiplier + annual_contribution, balance)
+            current_salary = np.where(active, current_salary * salary_multiplier, current_salary)
+
+            valid &= ~(balance > MAX_PROJECTED_BALANCE)
+
+    balance = np.where(valid, balance, np.nan)
+
+    return {
+        'projected_balance': balance,
+        'annual_nz_super': np.where(valid, NZ_SUPER_ANNUAL, np.nan),
+        'sustainable_annual_withdrawal': balance * SUSTAINABLE_WITHDRAWAL_RATE,
+        'years_to_retirement': np.where(valid, years_to_retirement, 0).astype(np.int64),
+        'valid': valid
+    }
+
+
+def loan_amortization_schedule_batch(principal, annual_rate, years, dtype=np.float64):
+    """
+    Build full amortization schedules for many loans at once, without a per-month loop
+
+    Uses the closed forms principal_k = (payment - rate * P) * (1 + rate) ** (k - 1) and
+    balance_k = P - sum of principal paid. Each loan gets one row; months after a loan's
+    term are zero. Memory is loans x longest term per column (100k 30-year loans is
+    about 290 MB per float64 column; pass dtype=np.float32 to halve it).
+
+    Args:
+        principal: Loan amounts in NZD
+        annual_rate: Annual interest rates as percentages
+        years: Loan terms in years (rounded to whole months)
+        dtype: Float type of the schedule columns
+
+    Returns:
+        dict: 'monthly_payment' and 'months' per loan, plus (loans, months) arrays
+              'interest', 'principal' and 'balance'
+    """
+    principal, annual_rate, years = [value.ravel() for value in _as_float_arrays(principal, annual_rate, years)]
+
+    monthly_payment = calculate_loan_payment_batch(principal, annual_rate, years)[0]
+    months = np.rint(years * 12).astype(np.int64)
+    monthly_rate = (annual_rate / 100 / 12)[:, None]
+    month_numbers = np.arange(1, max(int(months.max(initial=0)), 0) + 1)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # (1 + rate) ** (k - 1) for every loan and month
+        growth = np.power(1 + monthly_rate, month_numbers - 1, dtype=np.float64)
+
+        first_principal = (monthly_payment - monthly_rate[:, 0] * principal)[:, None]
+        principal_paid = growth * first_principal
+
+        # Balance after payment k: P - first_principal * ((1 + rate) ** k - 1) / rate
+        growth *= 1 + monthly_rate
+        growth -= 1
+        growth /= monthly_rate
+        growth *= first_principal
+        balance = np.subtract(principal[:, None], growth, out=growth)
+
+    zero_rate = monthly_rate[:, 0] == 0
+    if zero_rate.any():
+        principal_paid[zero_rate] = monthly_payment[zero_rate, None]
+        balance[zero_rate] = principal[zero_rate, None] - monthly_payment[zero_rate, None] * month_numbers
+
+    interest = monthly_payment[:, None] - principal_paid
+
+    after_term = month_numbers > months[:, None]
+    for column in (interest, principal_paid, balance):
+        column[after_term] = 0
+
+    return {
+        'monthly_payment': monthly_payment,
+        'months': months,
+        'interest': interest.astype(dtype, copy=False),
+        'principal': principal_paid.astype(dtype, copy=False),
+        'balance': balance.astype(dtype, copy=False)
+    }
+
+
+def _to_cents_batch(amount, rounding):
+    """Convert dollar amounts to int64 cents (calculation_cents.to_cents for arrays)"""
+    if rounding == "half_even":
+        return np.rint(amount * 100).astype(np.int64)
+    return np.floor(amount * 100 + 0.5).astype(np.int64)
+
+
+def _round_divide_batch(numerator, denominator, rounding):
+    """Integer division rounded to nearest (calculation_cents.round_divide for int64 arrays)"""
+    quotient, remainder = np.divmod(numerator, denominator)
+    twice_remainder = 2 * remainder
+    round_up = twice_remainder > denominator
+    if rounding == "half_up":
+        round_up |= twice_remainder == denominator
+    else:
+        round_up |= (twice_remainder == denominator) & (quotient % 2 == 1)
+    quotient += round_up
+    return quotient
+
+
+def calculate_loan_payment_cents_batch(principal, annual_rate, years, rounding="half_even", compare=True):
+    """
+    Vectorised calculation_cents.calculate_loan_payment_cents: loan totals in int64 cents
+
+    Runs the monthly schedule for every loan at once (one vector step per month of the
+    longest term). Balances must stay under about $90 billion so balance * rate units
+    fits in int64. Rows with a term under one month or a negative/invalid rate are
+    zero and marked invalid.
+
+    Args:
+        principal: Loan amounts in NZD
+        annual_rate: Annual interest rates as percentages
+        years: Loan terms in years (rounded to whole months)
+        rounding: "half_even" or "half_up"
+        compare: Whether to report the difference from the float calculation
+
+    Returns:
+        dict: int64 cents arrays 'monthly_payment_cents' (the regular payment, see
+              calculation_cents.regular_payment_cents), 'final_payment_cents',
+              'total_interest_cents' and 'total_amount_cents', plus 'months' and 'valid'
+              (and 'float_total_interest_cents', 'interest_difference_cents' and
+              'mismatch' when compare is True)
+    """
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Rounding must be one of {', '.join(ROUNDING_MODES)}")
+
+    principal, annual_rate, years = [value.ravel() for value in _as_float_arrays(principal, annual_rate, years)]
+
+    with np.errstate(invalid="ignore"):
+        valid = np.isfinite(principal) & np.isfinite(annual_rate) & (annual_rate >= 0) & (np.rint(years * 12) >= 1)
+    principal = np.where(valid, principal, 0.0)
+    annual_rate = np.where(valid, annual_rate, 0.0)
+    months = np.where(valid, np.rint(years * 12), 1).astype(np.int64)
+
+    float_payment, float_interest, _ = _exact_loan_payment_batch(principal, annual_rate, months / 12)
+    rate_units = np.rint(annual_rate * RATE_SCALE).astype(np.int64)
+    balance = _to_cents_batch(principal, rounding)
+    monthly_payment = _to_cents_batch(float_payment, rounding)
+
+    total_interest = np.zeros_like(balance)
+    final_payment = np.zeros_like(balance)
+
+    for month in range(1, int(months.max(initial=0)) + 1):
+        active = months >= month
+        interest = _round_divide_batch(balance * rate_units, INTEREST_DIVISOR, rounding)
+        interest[~active] = 0
+
+        final = months == month
+        payment = np.where(final, balance + interest, monthly_payment)
+        payment[~active] = 0
+        final_payment[final] = payment[final]
+
+        balance -= payment - interest
+        total_interest += interest
+
+    result = {
+        'monthly_payment_cents': np.where(valid, monthly_payment, 0),
+        'final_payment_cents': np.where(valid, final_payment, 0),
+        'total_interest_cents': np.where(valid, total_interest, 0),
+        'total_amount_cents': np.where(valid, _to_cents_batch(principal, rounding) + total_interest, 0),
+        'months': np.where(valid, months, 0),
+        'valid': valid
+    }
+
+    if compare:
+        float_total_interest = np.where(valid, _to_cents_batch(float_interest, rounding), 0)
+        result['float_total_interest_cents'] = float_total_interest
+        result['interest_difference_cents'] = result['total_interest_cents'] - float_total_interest
+        result['mismatch'] = result['interest_difference_cents'] != 0
+
+    return result
+
+
+def solve_loan_principal_batch(monthly_payment, annual_rate, years):
+    """
+    Vectorised goal_seek.solve_loan_principal: how much can be borrowed for each payment
+
+    Args:
+        monthly_payment: Target monthly payments in NZD
+        annual_rate: Annual interest rates as percentages
+        years: Loan terms in years
+
+    Returns:
+        ndarray: Loan principals in NZD
+    """
+    monthly_payment, annual_rate, years = _as_float_arrays(monthly_payment, annual_rate, years)
+
+    monthly_rate = annual_rate / 100 / 12
+    months = years * 12
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        growth = (1 + monthly_rate) ** months
+        principal = monthly_payment * (growth - 1) / (monthly_rate * growth)
+
+    return np.where(monthly_rate == 0, monthly_payment * months, principal)
+
+
+def solve_loan_term_batch(principal, monthly_payment, annual_rate):
+    """
+    Vectorised goal_seek.solve_loan_term: years to repay each loan
+
+    Rows whose payment doesn't cover the interest (never repaid) are NaN.
+
+    Args:
+        principal: Loan amounts in NZD
+        monthly_payment: Monthly payments in NZD
+        annual_rate: Annual interest rates as percentages
+
+    Returns:
+        ndarray: Loan terms in years
+    """
+    principal, monthly_payment, annual_rate = _as_float_arrays(principal, monthly_payment, annual_rate)
+
+    monthly_rate = annual_rate / 100 / 12
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        months = -np.log1p(-monthly_rate * principal / monthly_payment) / np.log1p(monthly_rate)
+        months = np.where(monthly_rate == 0, principal / monthly_payment, months)
+
+    never_repaid = (monthly_payment <= 0) | ((monthly_rate != 0) & (monthly_payment <= principal * monthly_rate))
+    return np.where(never_repaid, np.nan, months / 12)
+
+
+def solve_loan_rate_batch(principal, monthly_payment, years, tolerance=1e-12, max_iterations=200):
+    """
+    Vectorised goal_seek.solve_loan_rate: annual rate that gives each monthly payment
+
+    Every row runs the same safeguarded Newton iteration at once: Newton steps that leave
+    the row's bracket [0, payment / principal] are replaced by bisection, so each row is
+    guaranteed to converge. Iteration stops when every row is within tolerance. Rows with
+    no non-negative solution are NaN.
+
+    Args:
+        principal: Loan amounts in NZD
+        monthly_payment: Target monthly payments in NZD
+        years: Loan terms in years
+        tolerance: Convergence tolerance on the monthly rate
+        max_iterations: Maximum number of iterations
+
+    Returns:
+        ndarray: Annual interest rates as percentages
+    """
+    principal, monthly_payment, years = [value.astype(np.float64, copy=True) for value in
+                                         _as_float_arrays(principal, monthly_payment, years)]
+    months = years * 12
+
+    total_paid = monthly_payment * months
+    # Same tolerance as goal_seek.solve_loan_rate: 0% payments can round either side of the principal
+    zero_rate = ((principal > 0) & (monthly_payment > 0) & (months > 0)
+                 & np.isclose(total_paid, principal, rtol=ZERO_RATE_TOLERANCE, atol=0))
+    solvable = zero_rate | ((principal > 0) & (monthly_payment > 0) & (months > 0) & (total_paid >= principal))
+
+    # Park unsolvable rows on a harmless problem so they don't produce warnings
+    active = solvable & ~zero_rate
+    principal[~active], monthly_payment[~active], months[~active] = 1.0, 1.0, 12.0
+
+    low = np.zeros_like(principal)
+    high = monthly_payment / principal
+    rate = np.minimum(2 * (monthly_payment * months - principal) / (principal * months), high / 2)
+    rate[~active] = 0.5
+
+    for _ in range(max_iterations):
+        log_growth = months * np.log1p(rate)
+        growth = np.exp(log_growth)
+        growth_minus_one = np.expm1(log_growth)
+        payment = principal * rate * growth / growth_minus_one
+        slope = principal * (growth * growth_minus_one - rate * months * growth / (1 + rate)) / (
+            growth_minus_one ** 2)
+
+        difference = payment - monthly_payment
+        above = difference > 0
+        high = np.where(above, rate, high)
+        low = np.where(above, low, rate)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            next_rate = rate - difference / slope
+        outside = ~((next_rate > low) & (next_rate < high))
+        next_rate = np.where(outside, (low + high) / 2, next_rate)
+
+        converged = (np.abs(next_rate - rate) <= tolerance) | (high - low <= tolerance)
+        rate = next_rate
+        if converged[active].all():
+            break
+    else:
+        raise ValueError("Interest rate solver did not converge")
+
+    annual_rate = rate * 12 * 100
+    annual_rate[zero_rate] = 0.0
+    annual_rate[~solvable] = np.nan
+    return annual_rate
+
+
+def mortgage_payment_grid(home_price, down_payment, annual_rates, years, include_insurance=True):
+    """
+    Calculate total monthly mortgage payments for every rate and term combination in one pass
+
+    Matches calculate_nz_mortgage_payment's total_monthly_payment for each cell.
+
+    Args:
+        home_price: Total price of the home in NZD
+        down_payment: Down payment amount in NZD
+        annual_rates: Annual interest rates as percentages (grid rows)
+        years: Mortgage terms in years (grid columns)
+        include_insurance: Whether to include mortgage protection insurance estimate
+
+    Returns:
+        ndarray: (len(annual_rates), len(years)) array of total monthly payments
+    """
+    loan_amount = float(home_price) - float(down_payment)
+    annual_rates = np.asarray(annual_rates, dtype=np.float64)[:, None]
+    years = np.asarray(years, dtype=np.float64)[None, :]
+
+    monthly_payment = calculate_loan_payment_batch(loan_amount, annual_rates, years)[0]
+
+    insurance_monthly = loan_amount * MORTGAGE_INSURANCE_RATE / 12 if include_insurance else 0
+    monthly_payment += insurance_monthly
+    return monthly_payment
+
+
+@lru_cache(maxsize=8)
+def _digit_cells(width, separator):
+    """
+    Text of every number below 10 ** width as 8-byte cells, grouped in threes
+
+    Cell bytes are the zero-padded digits with separator in front of each group of
+    three, e.g. 6 digits: ",123,456"; 2 digits (cents): "45" plus six NULs.
+
+    Args:
+        width: Digits per number (2 or 6)
+        separator: Byte placed in front of each group of three digits
+
+    Returns:
+        ndarray: uint64 array with one cell per number
+    """
+    numbers = np.arange(10 ** width)
+    cells = np.zeros((10 ** width, 8), dtype=np.uint8)
+    position = 0
+    for digit in range(width - 1, -1, -1):
+        if digit % 3 == 2:
+            cells[:, position] = ord(separator)
+            position += 1
+        cells[:, position] = numbers // 10 ** digit % 10 + ord("0")
+        position += 1
+    return cells.view(np.uint64).ravel()
+
+
+def _byte_cells(data, align_right):
+    """Pad bytes with NULs to whole 8-byte cells (on the left when align_right)"""
+    padding = b"\0" * (-len(data) % 8)
+    data = padding + data if align_right else data + padding
+    return np.frombuffer(data, dtype=np.uint64)
+
+
+def format_currency_bytes_batch(amounts, currency="NZD", line_end="\n"):
+    """
+    Format many amounts at once as UTF-8 text, each followed by line_end
+
+    Every value gives exactly the same text as format_currency. Amounts are turned
+    into whole cents and written into a grid with one row per amount, six dollar
+    digits (with separators) at a time from a lookup table, and the bytes each row
+    uses are joined in one step. Amounts whose cents can't be read reliably from a
+    float multiply (near a half cent, $10 billion or more, nan/inf) are formatted one
+    at a time instead.
+
+    Args:
+        amounts: Amounts to format (array, sequence or iterable)
+        currency: Key of calculation_finance.CURRENCY_FORMATS (single-character
+                  thousands separator and decimal mark)
+        line_end: Text written after every amount (must not be empty)
+
+    Returns:
+        bytes: The formatted amounts, ready to write to a binary file
+    """
+    if currency not in CURRENCY_FORMATS:
+        raise ValueError(f"Unknown currency format '{currency}'")
+    if not line_end:
+        raise ValueError("line_end can't be empty")
+    prefix, suffix, thousands, decimal = [part.encode("utf-8") for part in CURRENCY_FORMATS[currency]]
+    if len(thousands) != 1 or len(decimal) != 1:
+        raise ValueError("Bulk formatting needs a single-byte thousands separator and decimal mark")
+    line_end_bytes = line_end.encode("utf-8")
+
+    amounts = np.asarray(amounts if hasattr(amounts, "__len__") else list(amounts), dtype=np.float64).ravel()
+    if amounts.size == 0:
+        return b""
+
+    with np.errstate(invalid="ignore"):
+        scaled = np.abs(amounts)
+        scaled *= 100
+        cents = np.rint(scaled)
+        # Fall back to per-value formatting where rounding scaled could disagree with "%.2f"
+        distance = np.subtract(scaled, cents, out=np.empty_like(scaled))
+        np.abs(distance, out=distance)
+        distance -= 0.5
+        np.abs(distance, out=distance)
+        scaled *= 1e-15
+        scaled += 1e-12
+        slow = distance <= scaled
+        slow |= ~(cents < 1e12)
+    cents[slow] = 0
+
+    # Whole numbers below 1e12 are exact in float64, so floor division splits them exactly
+    dollars = np.floor(cents / 100)
+    fraction = (cents - dollars * 100).astype(np.intp)
+    high_dollars = np.floor(dollars / 1e6)
+    low_dollars = (dollars - high_dollars * 1e6).astype(np.intp)
+    has_high = high_dollars.max() > 0
+
+    # Row cells: prefix and sign (right aligned), high and low six dollar digits,
+    # then decimal mark + cents + suffix + line end (left aligned)
+    head = _byte_cells(prefix + b"-", align_right=True)
+    tail_bytes = decimal + b"00" + suffix + line_end_bytes
+    tail = _byte_cells(tail_bytes, align_right=False)
+    digit_cells = 2 if has_high else 1
+    tail_cell = len(head) + digit_cells
+    width = tail_cell + len(tail)
+
+    grid = np.empty((amounts.size, width), dtype=np.uint64)
+    grid[:, :len(head)] = head
+    table = _digit_cells(6, thousands)
+    grid[:, tail_cell - 1] = np.take(table, low_dollars)
+    if has_high:
+        grid[:, tail_cell - 2] = np.take(table, high_dollars.astype(np.intp))
+
+    # Tail cells for every cents value (the two digits follow the decimal mark)
+    tail_table = np.tile(tail.view(np.uint8), (100, 1))
+    tail_table[:, len(decimal):len(decimal) + 2] = _digit_cells(2, thousands).view(np.uint8).reshape(100, 8)[:, :2]
+    grid[:, tail_cell:] = np.take(tail_table.view(np.uint64), fraction, axis=0)
+
+    # Which bytes a row uses depends only on its digit count and sign, so look the mask up
+    max_digits = 6 * digit_cells
+    digit_count = np.ones(amounts.size, dtype=np.intp)
+    for power in range(1, max_digits):
+        digit_count += dollars >= 10.0 ** power
+
+    byte_width = width * 8
+    head_start = len(head) * 8
+    needs_digits = np.full(byte_width, -1)  # A byte is used when the digit count is above this
+    for cell in range(digit_cells):
+        start = head_start + (digit_cells - 1 - cell) * 8
+        needs_digits[start:start + 8] = 6 * cell + np.array([6, 5, 4, 3, 3, 2, 1, 0])
+
+    used_patterns = np.arange(max_digits + 1)[:, None, None] > needs_digits
+    used_patterns = np.repeat(used_patterns, 2, axis=1)
+    used_patterns[:, :, :head_start - len(prefix) - 1] = False
+    used_patterns[:, 0, head_start - 1] = False  # Sign byte only for negative amounts
+    used_patterns[:, :, head_start + digit_cells * 8 + len(tail_bytes):] = False
+    used = np.take(used_patterns.reshape(-1, byte_width), digit_count * 2 + np.signbit(amounts), axis=0)
+
+    grid_bytes = grid.view(np.uint8)
+    slow_rows = np.flatnonzero(slow)
+    if slow_rows.size == 0:
+        return grid_bytes[used].tobytes()
+
+    # Leave the slow rows out of the grid and splice their per-value text in at their offsets
+    used[slow_rows] = False
+    data = grid_bytes[used].tobytes()
+    row_ends = np.cumsum(np.count_nonzero(used, axis=1))
+    pieces = []
+    previous = 0
+    for row in slow_rows:
+        offset = int(row_ends[row])
+        pieces.append(data[previous:offset])
+        pieces.append(format_currency(float(amounts[row]), currency).encode("utf-8") + line_end_bytes)
+        previous = offset
+    pieces.append(data[previous:])
+    return b"".join(pieces)
+
+
+def format_currency_batch(amounts, currency="NZD"):
+    """
+    Format many amounts at once (format_currency for whole columns)
+
+    Creating a Python string per value costs more than the formatting itself, so
+    write format_currency_bytes_batch output straight to the file where possible.
+
+    Args:
+        amounts: Amounts to format (array, sequence or iterable)
+        currency: Key of calculation_finance.CURRENCY_FORMATS
+
+    Returns:
+        list: Formatted strings, e.g. "$1,234.56 NZD"
+    """
+    text = format_currency_bytes_batch(amounts, currency).decode("utf-8")
+    return text.split("\n")[:-1]
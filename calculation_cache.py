@@ -0,0 +1,211 @@
+"""
+Calculation Cache Module - New Zealand Edition
+Opt-in bounded LRU cache in front of the calculation_finance functions
+
+Import the cached functions from here instead of calculation_finance to use them:
+    import calculation_cache as calc
+    calc.calculate_loan_payment(300000, 6.5, 30)
+    calc.cache_stats()
+"""
+
+import inspect
+import numbers
+import threading
+import time
+from collections import OrderedDict
+
+import calculation_finance
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = None  # Seconds before an entry expires (None keeps entries until evicted)
+UNCHANGED = object()  # configure() default: keep the current TTL
+
+
+def normalize_argument(value):
+    """
+    Normalise an argument for use in a cache key
+
+    Numbers become plain floats so 5, 5.0 and numpy.float64(5) share an entry
+    (and -0.0 shares with 0.0). Bools are left alone.
+
+    Args:
+        value: Argument value
+
+    Returns:
+        Hashable key part
+    """
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        return float(value) + 0.0
+    return value
+
+
+def _protect(result):
+    """Copy dict results (values are plain numbers, so a shallow copy is enough)"""
+    return dict(result) if isinstance(result, dict) else result
+
+
+class CalculationCache:
+    """
+    Bounded LRU cache with optional TTL wrapped around one calculation function
+    """
+
+    def __init__(self, function, maxsize=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL, clock=time.monotonic):
+        """
+        Wrap a calculation function
+
+        Args:
+            function: Function to cache
+            maxsize: Maximum number of cached results
+            ttl: Seconds an entry stays valid (None for no expiry)
+            clock: Function returning the current time in seconds
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+
+        self.function = function
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.signature = inspect.signature(function)
+        self.__name__ = function.__name__
+        self.__doc__ = function.__doc__
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def make_key(self, args, kwargs):
+        """
+        Build the cache key for a call, so positional, keyword and default forms match
+
+        Args:
+            args: Positional arguments
+            kwargs: Keyword arguments
+
+        Returns:
+            tuple: Normalised argument values in signature order
+        """
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return tuple(normalize_argument(value) for value in bound.arguments.values())
+
+    def __call__(self, *args, **kwargs):
+        """
+        Return the cached result, calculating it on a miss
+
+        Dict results are copied on the way out so callers can't modify the cached entry.
+        Exceptions are not cached.
+        """
+        key = self.make_key(args, kwargs)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, stored_at = entry
+                if self.ttl is not None and self.clock() - stored_at > self.ttl:
+                    del self._entries[key]
+                    self.expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _protect(result)
+            self.misses += 1
+
+        result = self.function(*args, **kwargs)
+
+        with self._lock:
+            self._entries[key] = (_protect(result), self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return _protect(result)
+
+    def configure(self, maxsize=None, ttl=UNCHANGED):
+        """
+        Change the size limit and TTL, evicting entries if the cache shrinks
+
+        Args:
+            maxsize: New maximum number of cached results (None leaves it unchanged)
+            ttl: New TTL in seconds (None for no expiry; leave it out to keep the current TTL)
+        """
+        with self._lock:
+            if maxsize is not None:
+                if maxsize < 1:
+                    raise ValueError("Cache size must be at least 1")
+                self.maxsize = maxsize
+            if ttl is not UNCHANGED:
+                self.ttl = ttl
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+            dict: Hits, misses, evictions, expirations, size and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+calculate_loan_payment = CalculationCache(calculation_finance.calculate_loan_payment)
+calculate_nz_mortgage_payment = CalculationCache(calculation_finance.calculate_nz_mortgage_payment)
+calculate_investment_growth_nz = CalculationCache(calculation_finance.calculate_investment_growth_nz)
+calculate_kiwisaver_retirement = CalculationCache(calculation_finance.calculate_kiwisaver_retirement)
+
+CACHES = {
+    'calculate_loan_payment': calculate_loan_payment,
+    'calculate_nz_mortgage_payment': calculate_nz_mortgage_payment,
+    'calculate_investment_growth_nz': calculate_investment_growth_nz,
+    'calculate_kiwisaver_retirement': calculate_kiwisaver_retirement
+}
+
+
+def configure_caches(maxsize=None, ttl=UNCHANGED):
+    """
+    Set the size limit and TTL of every calculation cache
+
+    Args:
+        maxsize: Maximum number of cached results per function (None leaves it unchanged)
+        ttl: Seconds an entry stays valid (None for no expiry; leave it out to keep each cache's TTL)
+    """
+    for cache in CACHES.values():
+        cache.configure(maxsize, ttl)
+
+
+def clear_caches():
+    """Empty every calculation cache and reset its counters"""
+    for cache in CACHES.values():
+        cache.clear()
+
+
+def cache_stats():
+    """
+    Get the counters for every calculation cache
+
+    Returns:
+        dict: Stats dict per function name
+    """
+    return {name: cache.stats() for name, cache in CACHES.items()}
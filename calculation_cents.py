@@ -0,0 +1,170 @@
+"""
+Fixed-Point Calculation Module - New Zealand Edition
+Loan schedules in integer cents, rounded every month the way a bank statement is
+
+calculation_finance works in floats and only rounds when formatting, so summed
+interest over a long schedule can drift a few cents from the bank's figures.
+Here the balance is held in whole cents and each month's interest is rounded to
+the cent (half-even or half-up). The last payment is adjusted to clear the loan.
+
+Interest rates are held in 1/10000ths of a percent, so interest is an exact
+integer division. The vectorised (int64) version is
+calculation_batch.calculate_loan_payment_cents_batch.
+"""
+
+import math
+
+from calculation_finance import AmortizationRow, calculate_loan_payment
+
+ROUNDING_MODES = ("half_even", "half_up")
+RATE_SCALE = 10000  # Rate units per percentage point (4.99% is 49900 units)
+INTEREST_DIVISOR = 12 * 100 * RATE_SCALE  # Monthly interest = balance * rate units / INTEREST_DIVISOR
+
+
+def _check_rounding(rounding):
+    """Check a rounding mode name"""
+    if rounding not in ROUNDING_MODES:
+        raise ValueError(f"Rounding must be one of {', '.join(ROUNDING_MODES)}")
+
+
+def to_cents(amount, rounding="half_even"):
+    """
+    Convert a dollar amount to whole cents
+
+    Args:
+        amount: Amount in NZD
+        rounding: "half_even" or "half_up"
+
+    Returns:
+        int: Amount in cents
+    """
+    _check_rounding(rounding)
+    if rounding == "half_even":
+        return int(round(amount * 100))
+    return int(math.floor(amount * 100 + 0.5))
+
+
+def to_rate_units(annual_rate):
+    """
+    Convert an annual interest rate to fixed-point rate units
+
+    Args:
+        annual_rate: Annual interest rate as percentage (0 or more)
+
+    Returns:
+        int: Rate in 1/RATE_SCALE of a percent
+    """
+    if annual_rate < 0:
+        raise ValueError("Interest rate can't be negative")
+    return int(round(annual_rate * RATE_SCALE))
+
+
+def round_divide(numerator, denominator, rounding="half_even"):
+    """
+    Divide two integers, rounding the quotient to the nearest whole number
+
+    Args:
+        numerator: Integer to divide
+        denominator: Positive integer divisor
+        rounding: "half_even" or "half_up" (how exact halves are rounded)
+
+    Returns:
+        int: Rounded quotient
+    """
+    quotient, remainder = divmod(numerator, denominator)
+    twice_remainder = 2 * remainder
+    if twice_remainder > denominator or (twice_remainder == denominator and
+                                         (rounding == "half_up" or quotient % 2)):
+        quotient += 1
+    return quotient
+
+
+def regular_payment_cents(principal, annual_rate, months, rounding="half_even"):
+    """
+    Get a loan's regular monthly payment in cents (calculate_loan_payment's, rounded)
+
+    Args:
+        principal: Loan amount in NZD
+        annual_rate: Annual interest rate as percentage
+        months: Loan term in whole months
+        rounding: "half_even" or "half_up"
+
+    Returns:
+        int: Payment in cents (every month's payment except the final one, which clears the balance)
+    """
+    return to_cents(calculate_loan_payment(principal, annual_rate, months / 12)[0], rounding)
+
+
+def loan_schedule_cents(principal, annual_rate, years, rounding="half_even"):
+    """
+    Generate a month-by-month loan schedule in integer cents
+
+    The regular payment is calculate_loan_payment's payment rounded to the cent. Each
+    month's interest is rounded to the cent, and the final payment clears the balance.
+
+    Args:
+        principal: Loan amount in NZD
+        annual_rate: Annual interest rate as percentage
+        years: Loan term in years
+        rounding: "half_even" or "half_up"
+
+    Yields:
+        AmortizationRow: (month, payment, interest, principal, balance), amounts in cents
+    """
+    _check_rounding(rounding)
+    months = int(round(years * 12))
+    if months < 1:
+        raise ValueError("Loan term must be at least one month")
+
+    rate_units = to_rate_units(annual_rate)
+    balance = to_cents(principal, rounding)
+    monthly_payment = regular_payment_cents(principal, annual_rate, months, rounding)
+
+    for month in range(1, months + 1):
+        interest = round_divide(balance * rate_units, INTEREST_DIVISOR, rounding)
+        payment = balance + interest if month == months else monthly_payment
+        principal_paid = payment - interest
+        balance -= principal_paid
+        yield AmortizationRow(month, payment, interest, principal_paid, balance)
+
+
+def calculate_loan_payment_cents(principal, annual_rate, years, rounding="half_even", compare=True):
+    """
+    Calculate a loan's payments and total interest in integer cents
+
+    Args:
+        principal: Loan amount in NZD
+        annual_rate: Annual interest rate as percentage
+        years: Loan term in years
+        rounding: "half_even" or "half_up"
+        compare: Whether to report the difference from the float calculation
+
+    Returns:
+        dict: Regular monthly payment (see regular_payment_cents, even for a one-month loan)
+              and final payment, total interest and total amount in cents (plus the float
+              total interest and the difference when compare is True)
+    """
+    final_payment = 0
+    total_interest = 0
+    months = 0
+
+    for row in loan_schedule_cents(principal, annual_rate, years, rounding):
+        final_payment = row.payment
+        total_interest += row.interest
+        months = row.month
+
+    result = {
+        'monthly_payment_cents': regular_payment_cents(principal, annual_rate, months, rounding),
+        'final_payment_cents': final_payment,
+        'total_interest_cents': total_interest,
+        'total_amount_cents': to_cents(principal, rounding) + total_interest,
+        'months': months
+    }
+
+    if compare:
+        float_total_interest = to_cents(calculate_loan_payment(principal, annual_rate, months / 12)[1], rounding)
+        result['float_total_interest_cents'] = float_total_interest
+        result['interest_difference_cents'] = total_interest - float_total_interest
+        result['mismatch'] = total_interest != float_total_interest
+
+    return result
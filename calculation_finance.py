@@ -4,11 +4,18 @@ Contains all calculation functions for the Personal Finance Calculator
 Includes NZ-specific features like GST, KiwiSaver, and local formatting
 """
 
+from collections import namedtuple
+
 # New Zealand specific constants
 NZ_GST_RATE = 0.15  # 15% GST in New Zealand
 KIWISAVER_MINIMUM_RATE = 0.03  # 3% minimum employee contribution
 KIWISAVER_EMPLOYER_RATE = 0.03  # 3% employer contribution
 KIWISAVER_GOVERNMENT_CONTRIBUTION = 521.43  # Annual government contribution (2024)
+MORTGAGE_INSURANCE_RATE = 0.007  # Mortgage protection insurance estimate (roughly 0.5-1% of loan annually)
+NZ_SUPER_ANNUAL = 26364  # Approximate annual NZ Super for married couple after tax (April 2024)
+SUSTAINABLE_WITHDRAWAL_RATE = 0.04  # 4% rule for retirement savings to last ~30 years
+MAX_YEARS_TO_RETIREMENT = 70  # Reasonable upper limit for projections
+MAX_PROJECTED_BALANCE = 1e15  # 1 quadrillion limit to prevent infinite numbers
 
 
 def format_nz_currency(amount):
@@ -24,6 +31,39 @@ def format_nz_currency(amount):
     return f"${amount:,.2f} NZD"
 
 
+# Currency display formats: (text before the amount, text after it, thousands separator, decimal mark)
+CURRENCY_FORMATS = {
+    "NZD": ("$", " NZD", ",", "."),
+    "AUD": ("$", " AUD", ",", "."),
+    "USD": ("$", " USD", ",", "."),
+    "GBP": ("£", "", ",", "."),
+    "EUR": ("", " €", ".", ",")
+}
+
+
+def format_currency(amount, currency="NZD"):
+    """
+    Format amount in one of the CURRENCY_FORMATS styles
+
+    "NZD" gives exactly the same text as format_nz_currency.
+
+    Args:
+        amount: Amount to format
+        currency: Key of CURRENCY_FORMATS
+
+    Returns:
+        str: Formatted currency string (e.g., "$1,234.56 NZD" or "1.234,56 €")
+    """
+    if currency not in CURRENCY_FORMATS:
+        raise ValueError(f"Unknown currency format '{currency}'")
+    prefix, suffix, thousands, decimal = CURRENCY_FORMATS[currency]
+
+    text = f"{amount:,.2f}"
+    if (thousands, decimal) != (",", "."):
+        text = text.translate({ord(","): thousands, ord("."): decimal})
+    return f"{prefix}{text}{suffix}"
+
+
 def calculate_gst_inclusive(amount):
     """
     Calculate GST-inclusive price from GST-exclusive amount
@@ -147,7 +187,7 @@ def calculate_nz_mortgage_payment(home_price, down_payment, annual_rate, years,
     lvr = (loan_amount / home_price) * 100
 
     # Estimate mortgage protection insurance (roughly 0.5-1% of loan amount annually)
-    insurance_annual = loan_amount * 0.007 if include_insurance else 0  # 0.7% estimate
+    insurance_annual = loan_amount * MORTGAGE_INSURANCE_RATE if include_insurance else 0
     insurance_monthly = insurance_annual / 12
 
     total_monthly_payment = monthly_payment + insurance_monthly
@@ -164,6 +204,54 @@ def calculate_nz_mortgage_payment(home_price, down_payment, annual_rate, years,
     }
 
 
+# One month of an amortization schedule
+AmortizationRow = namedtuple("AmortizationRow", ["month", "payment", "interest", "principal", "balance"])
+
+
+def loan_amortization_schedule(principal, annual_rate, years):
+    """
+    Generate a month-by-month loan amortization schedule one row at a time
+
+    Uses the same monthly payment as calculate_loan_payment; the interest column sums
+    to its total_interest (up to float rounding). The term is rounded to whole months.
+
+    Args:
+        principal: Loan amount in NZD
+        annual_rate: Annual interest rate as percentage
+        years: Loan term in years
+
+    Yields:
+        AmortizationRow: (month, payment, interest, principal, balance) for each month
+    """
+    monthly_payment = calculate_loan_payment(principal, annual_rate, years)[0]
+    monthly_rate = annual_rate / 100 / 12
+    balance = principal
+
+    for month in range(1, int(round(years * 12)) + 1):
+        interest = balance * monthly_rate
+        principal_paid = monthly_payment - interest
+        balance -= principal_paid
+        yield AmortizationRow(month, monthly_payment, interest, principal_paid, balance)
+
+
+def mortgage_amortization_schedule(home_price, down_payment, annual_rate, years):
+    """
+    Generate a month-by-month NZ mortgage amortization schedule one row at a time
+
+    Covers the loan repayments only (mortgage protection insurance is not amortized).
+
+    Args:
+        home_price: Total price of the home in NZD
+        down_payment: Down payment amount in NZD
+        annual_rate: Annual interest rate as percentage
+        years: Loan term in years
+
+    Yields:
+        AmortizationRow: (month, payment, interest, principal, balance) for each month
+    """
+    return loan_amortization_schedule(home_price - down_payment, annual_rate, years)
+
+
 def calculate_investment_growth_nz(initial_investment, annual_contribution, annual_return_rate, years,
                                    include_tax=True):
     """
@@ -190,9 +278,11 @@ def calculate_investment_growth_nz(initial_investment, annual_contribution, annu
     # Start with initial investment growing
     final_value = initial_investment * (1 + effective_rate) ** years
 
-    # Add contributions with compound growth
+    # Add contributions with compound growth. Kept as a per-year sum so results stay
+    # identical; calculation_batch.calculate_investment_growth_nz_batch uses the closed form.
+    growth = 1 + effective_rate
     for year in range(int(years)):
-        final_value += annual_contribution * (1 + effective_rate) ** (years - year - 1)
+        final_value += annual_contribution * growth ** (years - year - 1)
 
     total_contributions = initial_investment + (annual_contribution * years)
     total_growth = final_value - total_contributions
@@ -248,7 +338,7 @@ def calculate_kiwisaver_retirement(current_age, retirement_age, current_balance,
         # Validate inputs
         if years_to_retirement <= 0:
             raise ValueError("Retirement age must be greater than current age")
-        if years_to_retirement > 70:  # Reasonable upper limit
+        if years_to_retirement > MAX_YEARS_TO_RETIREMENT:
             raise ValueError("Years to retirement exceeds reasonable limit")
         if current_balance < 0 or annual_salary < 0:
             raise ValueError("Negative values not allowed")
@@ -274,18 +364,15 @@ def calculate_kiwisaver_retirement(current_age, retirement_age, current_balance,
             current_salary *= (1 + growth_rate)
 
             # Prevent infinite numbers
-            if balance > 1e15:  # 1 quadrillion limit
+            if balance > MAX_PROJECTED_BALANCE:
                 raise ValueError("Calculation resulted in unreasonably large number")
 
-        # NZ Super estimate (April 2024 rates - married couple)
-        nz_super_annual = 26364  # Approximate annual NZ Super for married couple after tax
-
         # 4% withdrawal rule for retirement savings to last ~30 years
-        sustainable_withdrawal = balance * 0.04
+        sustainable_withdrawal = balance * SUSTAINABLE_WITHDRAWAL_RATE
 
         return {
             'projected_balance': balance,
-            'annual_nz_super': nz_super_annual,
+            'annual_nz_super': NZ_SUPER_ANNUAL,
             'sustainable_annual_withdrawal': sustainable_withdrawal,
             'years_to_retirement': years_to_retirement
         }
@@ -0,0 +1,126 @@
+"""
+Background Calculation Worker - New Zealand Edition
+Runs calculations off the Tk main thread and hands the results back to it
+
+Tk widgets may only be touched from the main thread, so results are put on a
+queue that the main loop drains with root.after polling. Each request has a key
+(the calculator tab); a newer request for the same key supersedes the older
+one, which is cancelled if it hasn't started or ignored when it finishes.
+"""
+
+import itertools
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 2
+DEFAULT_POLL_MS = 30  # How often the result queue is checked while work is pending
+
+logger = logging.getLogger(__name__)
+
+
+class CalculationWorker:
+    """
+    Thread pool for calculations with results delivered on the Tk main loop
+    """
+
+    def __init__(self, root, max_workers=DEFAULT_WORKERS, poll_ms=DEFAULT_POLL_MS, on_busy_change=None):
+        """
+        Create the worker pool
+
+        Args:
+            root: Tk root window (used for after() polling)
+            max_workers: Number of worker threads
+            poll_ms: Result queue polling interval in milliseconds
+            on_busy_change: Called with True/False when work starts/stops being pending
+        """
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_busy_change = on_busy_change
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="calculation")
+        self.results = queue.Queue()
+        self.pending = {}  # key: (request_id, future) of the latest request
+        self._request_ids = itertools.count(1)
+        self._polling = False
+
+    def submit(self, key, function, args, on_result, on_error):
+        """
+        Run function(*args) in the background, superseding any pending request with the same key
+
+        Args:
+            key: Request group (e.g. the calculator tab name)
+            function: Calculation to run
+            args: Arguments for function
+            on_result: Called on the main thread with the result (latest request only)
+            on_error: Called on the main thread with the exception (latest request only)
+
+        Returns:
+            int: Request id
+        """
+        previous = self.pending.get(key)
+        if previous is not None:
+            previous[1].cancel()  # Only succeeds if it hasn't started; otherwise its result is ignored
+
+        request_id = next(self._request_ids)
+        future = self.executor.submit(function, *args)
+        was_busy = self.is_busy()
+        self.pending[key] = (request_id, future)
+
+        # Runs on the worker thread, so it only touches the thread-safe queue
+        future.add_done_callback(
+            lambda done, callbacks=(on_result, on_error): self.results.put((key, request_id, done, callbacks)))
+
+        if not was_busy and self.on_busy_change is not None:
+            self.on_busy_change(True)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self.poll)
+
+        return request_id
+
+    def poll(self):
+        """Deliver finished results on the main thread, dropping superseded ones"""
+        while True:
+            try:
+                key, request_id, future, (on_result, on_error) = self.results.get_nowait()
+            except queue.Empty:
+                break
+
+            latest = self.pending.get(key)
+            if latest is None or latest[0] != request_id or future.cancelled():
+                continue
+            del self.pending[key]
+
+            # A failing callback is logged so polling carries on for the other requests
+            error = future.exception()
+            try:
+                if error is None:
+                    on_result(future.result())
+                else:
+                    on_error(error)
+            except Exception:
+                logger.exception("Calculation callback for %r failed", key)
+
+        if self.pending:
+            self.root.after(self.poll_ms, self.poll)
+        else:
+            self._polling = False
+            if self.on_busy_change is not None:
+                self.on_busy_change(False)
+
+    def is_busy(self, key=None):
+        """
+        Check for pending work
+
+        Args:
+            key: Request group to check (None checks all)
+
+        Returns:
+            bool: Whether a request is still pending
+        """
+        return key in self.pending if key is not None else bool(self.pending)
+
+    def shutdown(self):
+        """Stop the pool, cancelling requests that haven't started"""
+        self.pending.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,438 @@
+"""
+Calculator Definitions - New Zealand Edition
+Input fields, validation, result text and history values for each calculator
+
+This is the compute side of the GUI with no tkinter import: main.py builds its
+tabs from these definitions, and batch jobs or servers can validate and format
+the same way without loading Tk (or NumPy). Each calculator's inputs are described
+by a schema of field rules and cross-field rules: the GUI checks it one field at a
+time as entries change, and validate_columns() checks whole columns at once with
+NumPy, giving the same messages.
+
+Usage:
+    values = calculators.validate_inputs("loan", ["300000", "6.5", "30"])
+    details = calculators.calculate("loan", values)
+    print(calculators.result_text("loan", values, details))
+"""
+
+import math
+import operator
+
+import calculation_finance as calc
+
+
+def _loan_result(values, loan_details):
+    monthly_payment, total_interest, total_amount = loan_details
+    return (f"Monthly Payment: {calc.format_nz_currency(monthly_payment)}\n"
+            f"Total Interest: {calc.format_nz_currency(total_interest)}\n"
+            f"Total Amount: {calc.format_nz_currency(total_amount)}")
+
+
+def _loan_history(values, loan_details):
+    principal, annual_rate, years = values
+    return principal, annual_rate, years, loan_details[0]
+
+
+def _mortgage_result(values, mortgage_details):
+    lvr_warning = " (LMI Required)" if mortgage_details['requires_lmi'] else ""
+    return (f"Monthly Payment: {calc.format_nz_currency(mortgage_details['monthly_payment'])}\n"
+            f"+ Insurance: {calc.format_nz_currency(mortgage_details['insurance_monthly'])}\n"
+            f"Total Monthly: {calc.format_nz_currency(mortgage_details['total_monthly_payment'])}\n"
+            f"LVR: {mortgage_details['lvr']:.1f}%{lvr_warning}\n"
+            f"Total Interest: {calc.format_nz_currency(mortgage_details['total_interest'])}")
+
+
+def _mortgage_history(values, mortgage_details):
+    home_price, down_payment, annual_rate, years = values
+    return home_price, down_payment, annual_rate, mortgage_details['total_monthly_payment'], mortgage_details['lvr']
+
+
+def _investment_result(values, investment_details):
+    return (f"Final Value: {calc.format_nz_currency(investment_details['final_value'])}\n"
+            f"Total Contributions: {calc.format_nz_currency(investment_details['total_contributions'])}\n"
+            f"Growth (After PIE Tax): {calc.format_nz_currency(investment_details['total_growth'])}\n"
+            f"Effective Return: {investment_details['effective_annual_return']:.2f}%\n"
+            f"Est. Tax Paid: {calc.format_nz_currency(investment_details['tax_paid_estimate'])}")
+
+
+def _investment_history(values, investment_details):
+    initial_investment, annual_contribution, annual_return_rate, years = values
+    return initial_investment, annual_contribution, annual_return_rate, years, investment_details['final_value']
+
+
+def _retirement_result(values, retirement_details):
+    retirement_age = values[1]
+    warning_text = "\n⚠️ Note: NZ Super is available from age 65" if retirement_age < 65 else ""
+    total_annual_income = retirement_details['annual_nz_super'] + retirement_details['sustainable_annual_withdrawal']
+    return (f"KiwiSaver at Retirement: {calc.format_nz_currency(retirement_details['projected_balance'])}\n"
+            f"Annual NZ Super: {calc.format_nz_currency(retirement_details['annual_nz_super'])}\n"
+            f"Sustainable Withdrawal: {calc.format_nz_currency(retirement_details['sustainable_annual_withdrawal'])}\n"
+            f"Total Annual Income: {calc.format_nz_currency(total_annual_income)}\n"
+            f"Years to Retirement: {retirement_details['years_to_retirement']}{warning_text}")
+
+
+def _retirement_history(values, retirement_details):
+    current_age, retirement_age, current_balance, annual_salary = values[:4]
+    return current_age, retirement_age, current_balance, annual_salary, retirement_details['projected_balance']
+
+
+# Field rules: (test, limit, message). A value fails "min" when it is below the limit and
+# "max" when it is above it. Messages are formatted with the field label, the value and
+# its whole-number part.
+EMPTY_MESSAGE = "❌ Please enter a value for {field}"
+NUMBER_MESSAGE = "❌ Please enter numbers only for {field}. Remove any letters or symbols."
+NOT_NEGATIVE = ("min", 0, "❌ {field} cannot be negative. Please enter a positive number.")
+PERCENTAGE = ("max", 100, "❌ {field} seems too high ({value}%). Please check your percentage.")
+INTEREST_RATE = ("max", 50, "❌ Interest rate of {value}% seems unusually high. Please verify.")
+AGE_MESSAGE = "❌ {field} of {whole} seems unrealistic. Please enter a valid age."
+AGE = (("min", 16, AGE_MESSAGE), ("max", 120, AGE_MESSAGE))
+YEARS = ("max", 50, "❌ {field} of {whole} years seems too long. Please check your input.")
+FIELD_TESTS = {"min": operator.lt, "max": operator.gt}  # True when a value breaks the rule
+COMPARISONS = {"<": operator.lt, ">": operator.gt}  # True when a cross-field rule holds
+
+
+def _field(name, label, *rules, default=None):
+    """
+    Describe one input field (every field is a float, as calculation_finance expects)
+
+    Args:
+        name: calculation_finance argument name (also the batch input column)
+        label: GUI label
+        rules: Field rules checked after NOT_NEGATIVE, in order
+        default: Value used when a batch row leaves the field out (None makes it required)
+
+    Returns:
+        dict: Field schema
+    """
+    return {"name": name, "label": label, "rules": (NOT_NEGATIVE,) + rules, "default": default}
+
+
+# name: definition. "schema" lists the input fields in the function's argument order,
+# "rules" compare fields as (field, "<" or ">", other field, message) with the message
+# formatted with each field's whole-number value, and "kind" is the history record kind.
+CALCULATORS = {
+    "loan": {
+        "title": "Loan Calculator",
+        "kind": "Loan",
+        "function": calc.calculate_loan_payment,
+        "schema": [
+            _field("principal", "Loan Amount (NZD)"),
+            _field("annual_rate", "Annual Interest Rate (%)", PERCENTAGE, INTEREST_RATE),
+            _field("years", "Loan Term (Years)", YEARS)
+        ],
+        "button_text": "Calculate Loan",
+        "details_name": "loan",
+        "rules": [],
+        "result": _loan_result,
+        "history": _loan_history
+    },
+    "mortgage": {
+        "title": "Mortgage Calculator",
+        "kind": "Mortgage",
+        "function": calc.calculate_nz_mortgage_payment,
+        "schema": [
+            _field("home_price", "Home Price (NZD)"),
+            _field("down_payment", "Down Payment (NZD)"),
+            _field("annual_rate", "Annual Interest Rate (%)", PERCENTAGE, INTEREST_RATE),
+            _field("years", "Mortgage Term (Years)", YEARS)
+        ],
+        "button_text": "Calculate Mortgage",
+        "details_name": "mortgage",
+        "rules": [("down_payment", "<", "home_price",
+                   "❌ Down payment cannot be equal to or greater than the home price.")],
+        "result": _mortgage_result,
+        "history": _mortgage_history
+    },
+    "investment": {
+        "title": "Investment Projector",
+        "kind": "Investment",
+        "function": calc.calculate_investment_growth_nz,
+        "schema": [
+            _field("initial_investment", "Initial Investment (NZD)"),
+            _field("annual_contribution", "Annual Contribution (NZD)"),
+            _field("annual_return_rate", "Annual Return Rate (%)", PERCENTAGE),
+            _field("years", "Investment Period (Years)", YEARS)
+        ],
+        "button_text": "Calculate Investment",
+        "details_name": "investment",
+        "rules": [],
+        "result": _investment_result,
+        "history": _investment_history
+    },
+    "retirement": {
+        "title": "Retirement Planner",
+        "kind": "Retirement",
+        "function": calc.calculate_kiwisaver_retirement,
+        "schema": [
+            _field("current_age", "Current Age", *AGE),
+            _field("retirement_age", "Retirement Age", *AGE),
+            _field("current_balance", "Current KiwiSaver Balance (NZD)"),
+            _field("annual_salary", "Annual Salary (NZD)"),
+            _field("employee_rate", "Employee Contribution Rate (%)", PERCENTAGE, default=3),
+            _field("expected_return", "Expected Annual Return (%)", PERCENTAGE, default=5)
+        ],
+        "button_text": "Calculate Retirement",
+        "details_name": "retirement",
+        "rules": [("retirement_age", ">", "current_age",
+                   "❌ Retirement age ({retirement_age}) must be greater than current age ({current_age}).")],
+        "result": _retirement_result,
+        "history": _retirement_history
+    }
+}
+
+# Input labels in argument order (the GUI's entry fields)
+for _definition in CALCULATORS.values():
+    _definition["fields"] = [field["label"] for field in _definition["schema"]]
+del _definition
+
+# GUI tab title: calculator name
+TITLES = {definition["title"]: name for name, definition in CALCULATORS.items()}
+
+
+def calculator_name(name_or_title):
+    """
+    Look up a calculator by name ("loan") or tab title ("Loan Calculator")
+
+    Args:
+        name_or_title: Calculator name or title
+
+    Returns:
+        str: Calculator name (key of CALCULATORS)
+    """
+    name = TITLES.get(name_or_title, name_or_title)
+    if name not in CALCULATORS:
+        raise ValueError(f"Unknown calculator '{name_or_title}'")
+    return name
+
+
+def field_schema(name):
+    """
+    Get a calculator's input fields
+
+    Args:
+        name: Calculator name or tab title
+
+    Returns:
+        list: Field schema dicts (name, label, rules, default) in argument order
+    """
+    return CALCULATORS[calculator_name(name)]["schema"]
+
+
+def _whole(value):
+    """Whole-number part of a value for messages (infinity is left alone)"""
+    return int(value) if math.isfinite(value) else value
+
+
+def _message(template, label, value):
+    """Fill in a field rule's message"""
+    return template.format(field=label, value=value, whole=_whole(value))
+
+
+def check_value(field, value):
+    """
+    Check a number against a field's rules
+
+    Args:
+        field: Field schema dict (from field_schema())
+        value: Number to check
+
+    Returns:
+        str: Message for the first rule it breaks, or None if it is valid
+    """
+    for test, limit, message in field["rules"]:
+        if FIELD_TESTS[test](value, limit):
+            return _message(message, field["label"], value)
+    return None
+
+
+def parse_field(field, text):
+    """
+    Convert and check one input value (the GUI checks each field as it is edited)
+
+    Args:
+        field: Field schema dict (from field_schema())
+        text: Text as typed
+
+    Returns:
+        float: The value (raises ValueError with a message for the user if it isn't valid)
+    """
+    text = text.strip()
+    if not text:
+        raise ValueError(EMPTY_MESSAGE.format(field=field["label"]))
+
+    try:
+        value = float(text)
+    except ValueError:
+        raise ValueError(NUMBER_MESSAGE.format(field=field["label"])) from None
+
+    error_msg = check_value(field, value)
+    if error_msg:
+        raise ValueError(error_msg)
+    return value
+
+
+def check_rules(name, values):
+    """
+    Check a calculator's cross-field rules (e.g. down payment below home price)
+
+    Args:
+        name: Calculator name or tab title
+        values: Field values in argument order
+
+    Returns:
+        str: Message for the first broken rule, or None if they all hold
+    """
+    definition = CALCULATORS[calculator_name(name)]
+    named = dict(zip((field["name"] for field in definition["schema"]), values))
+    for left, operator_name, right, message in definition["rules"]:
+        if not COMPARISONS[operator_name](named[left], named[right]):
+            return message.format(**{left: _whole(named[left]), right: _whole(named[right])})
+    return None
+
+
+def validate_inputs(name, texts):
+    """
+    Convert and check every input of a calculator, stopping at the first problem
+
+    Args:
+        name: Calculator name or tab title
+        texts: Input text for each field, in CALCULATORS[name]["fields"] order
+
+    Returns:
+        list: Values ready for calculate() (raises ValueError with a message for the user)
+    """
+    values = [parse_field(field, text) for field, text in zip(field_schema(name), texts)]
+
+    error_msg = check_rules(name, values)
+    if error_msg:
+        raise ValueError(error_msg)
+    return values
+
+
+def _parse_column(column, rows):
+    """
+    Convert a column of texts or numbers to floats
+
+    Returns:
+        tuple: (float array, mask of empty entries, mask of entries that aren't numbers)
+    """
+    import numpy as np
+
+    if column is None:
+        return np.full(rows, np.nan), np.ones(rows, dtype=bool), np.zeros(rows, dtype=bool)
+    if isinstance(column, np.ndarray) and column.dtype.kind in "biuf":
+        return column.astype(float), np.zeros(rows, dtype=bool), np.zeros(rows, dtype=bool)
+
+    # float() is faster than NumPy's string conversion and ignores surrounding spaces itself
+    numbers = []
+    failed = []
+    for row, value in enumerate(column):
+        try:
+            numbers.append(float(value))
+        except (TypeError, ValueError):
+            numbers.append(math.nan)
+            failed.append(row)
+
+    empty = np.zeros(rows, dtype=bool)
+    not_number = np.zeros(rows, dtype=bool)
+    for row in failed:
+        if column[row] is None or not str(column[row]).strip():
+            empty[row] = True
+        else:
+            not_number[row] = True
+    return np.array(numbers), empty, not_number
+
+
+def validate_columns(name, columns):
+    """
+    Check whole columns of inputs at once (e.g. a chunk of a batch file), with NumPy
+
+    Every rule is evaluated over the full columns; each row gets the message
+    validate_inputs() would give for it.
+
+    Args:
+        name: Calculator name or tab title
+        columns: dict of field name to a column of texts or numbers (empty or missing
+                 entries use the field's default when it has one)
+
+    Returns:
+        tuple: (dict of field name to float array, object array holding each row's
+               first error message, or None where the row is valid)
+    """
+    import numpy as np
+
+    definition = CALCULATORS[calculator_name(name)]
+    rows = max((len(column) for column in columns.values()), default=0)
+    errors = np.full(rows, None, dtype=object)
+    unchecked = np.ones(rows, dtype=bool)  # Rows without an error yet
+    values = {}
+
+    def add_errors(failed, message_for_row):
+        for row in np.flatnonzero(failed & unchecked):
+            errors[row] = message_for_row(row)
+        unchecked[failed] = False
+
+    for field in definition["schema"]:
+        label = field["label"]
+        numbers, empty, not_number = _parse_column(columns.get(field["name"]), rows)
+        if field["default"] is not None:
+            numbers[empty] = field["default"]
+        else:
+            add_errors(empty, lambda row: EMPTY_MESSAGE.format(field=label))
+        add_errors(not_number, lambda row: NUMBER_MESSAGE.format(field=label))
+
+        for test, limit, message in field["rules"]:
+            add_errors(FIELD_TESTS[test](numbers, limit),
+                       lambda row: _message(message, label, float(numbers[row])))
+        values[field["name"]] = numbers
+
+    for left, operator_name, right, message in definition["rules"]:
+        add_errors(~COMPARISONS[operator_name](values[left], values[right]),
+                   lambda row: message.format(**{left: _whole(values[left][row]), right: _whole(values[right][row])}))
+
+    return values, errors
+
+
+def calculate(name, values):
+    """
+    Run a calculator's calculation_finance function
+
+    Args:
+        name: Calculator name or tab title
+        values: Validated values from validate_inputs()
+
+    Returns:
+        The function's result (a tuple for loans, otherwise a dict)
+    """
+    return CALCULATORS[calculator_name(name)]["function"](*values)
+
+
+def result_text(name, values, details):
+    """
+    Format a calculation result for display
+
+    Args:
+        name: Calculator name or tab title
+        values: Input values
+        details: calculate() result
+
+    Returns:
+        str: Multi-line result text
+    """
+    return CALCULATORS[calculator_name(name)]["result"](values, details)
+
+
+def history_values(name, values, details):
+    """
+    Get the values saved in the calculation history
+
+    Args:
+        name: Calculator name or tab title
+        values: Input values
+        details: calculate() result
+
+    Returns:
+        tuple: (history record kind, values in history_records.RECORD_FIELDS order)
+    """
+    definition = CALCULATORS[calculator_name(name)]
+    return definition["kind"], definition["history"](values, details)
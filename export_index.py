@@ -0,0 +1,273 @@
+"""
+Export Index - New Zealand Edition
+Parses finance_*.txt history exports into a searchable SQLite index
+
+Every "[dd/mm/yyyy] Loan: ..." line in the exports (journal segments, archives and
+older finance_calculations files) becomes one indexed row, searchable by date,
+calculator and value ranges. Each file's modification time and size are stored,
+so updating the index only re-parses new or changed files.
+
+Usage:
+    python -m export_index . --kind Mortgage --from 01/07/2025 --to 30/09/2025 --min lvr=80
+"""
+
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+from history_records import RECORD_FIELDS, CalculationRecord
+
+DEFAULT_INDEX_NAME = "finance_index.sqlite3"
+DEFAULT_PATTERN = "finance_*.txt"
+
+# Every calculator's values, each once, in RECORD_FIELDS order
+VALUE_FIELDS = []
+for _fields in RECORD_FIELDS.values():
+    VALUE_FIELDS.extend(field for field in _fields if field not in VALUE_FIELDS)
+del _fields
+
+# Fields with their own index, for range searches across all dates
+KEY_FIELDS = ["principal", "monthly_payment", "home_price", "total_monthly_payment", "lvr", "final_value",
+              "projected_balance"]
+
+
+def parse_export(path):
+    """
+    Parse the history lines of an export file
+
+    Args:
+        path: Export file path
+
+    Yields:
+        tuple: (line number, CalculationRecord) for each history line (other lines are skipped)
+    """
+    with open(path, encoding="utf-8", errors="replace") as export_file:
+        for line_number, line in enumerate(export_file, start=1):
+            if line.startswith("["):
+                record = CalculationRecord.from_text(line)
+                if record is not None:
+                    yield line_number, record
+
+
+class ExportIndex:
+    """
+    Persistent index of the calculations in history export files
+    """
+
+    def __init__(self, index_path):
+        """
+        Open (or create) an index
+
+        Args:
+            index_path: SQLite database file
+        """
+        self.index_path = index_path
+        self.connection = sqlite3.connect(index_path)
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create the tables and indexes if they don't exist yet"""
+        value_columns = ", ".join(f"{field} REAL" for field in VALUE_FIELDS)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS files (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL,"
+                " mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, records INTEGER NOT NULL)")
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS records (file_id INTEGER NOT NULL, line INTEGER NOT NULL,"
+                f" kind TEXT NOT NULL, date_ordinal INTEGER NOT NULL, {value_columns})")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS records_file ON records (file_id)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS records_kind_date ON records (kind, date_ordinal)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS records_date ON records (date_ordinal)")
+            for field in KEY_FIELDS:
+                self.connection.execute(f"CREATE INDEX IF NOT EXISTS records_{field} ON records ({field})")
+
+    def update(self, directory=".", pattern=DEFAULT_PATTERN):
+        """
+        Bring the index up to date with the export files in a directory
+
+        Unchanged files (same modification time and size) are skipped; changed files
+        are re-parsed and files that no longer exist are removed from the index.
+
+        Args:
+            directory: Folder containing the exports
+            pattern: Export file name pattern
+
+        Returns:
+            dict: Counts of 'parsed', 'unchanged' and 'removed' files and 'records' added
+        """
+        stats = {'parsed': 0, 'unchanged': 0, 'removed': 0, 'records': 0}
+        known = {path: (file_id, mtime_ns, size) for file_id, path, mtime_ns, size in
+                 self.connection.execute("SELECT id, path, mtime_ns, size FROM files")}
+        value_placeholders = ", ".join("?" for _ in VALUE_FIELDS)
+        insert_sql = (f"INSERT INTO records (file_id, line, kind, date_ordinal, {', '.join(VALUE_FIELDS)})"
+                      f" VALUES (?, ?, ?, ?, {value_placeholders})")
+
+        found = set()
+        for path in sorted(glob.glob(os.path.join(glob.escape(directory), pattern))):
+            path = os.path.abspath(path)
+            found.add(path)
+            file_stat = os.stat(path)
+
+            previous = known.get(path)
+            if previous is not None and previous[1:] == (file_stat.st_mtime_ns, file_stat.st_size):
+                stats['unchanged'] += 1
+                continue
+
+            with self.connection:
+                if previous is None:
+                    file_id = self.connection.execute(
+                        "INSERT INTO files (path, mtime_ns, size, records) VALUES (?, ?, ?, 0)",
+                        (path, file_stat.st_mtime_ns, file_stat.st_size)).lastrowid
+                else:
+                    file_id = previous[0]
+                    self.connection.execute("DELETE FROM records WHERE file_id = ?", (file_id,))
+
+                rows = (self._record_row(file_id, line_number, record) for line_number, record in parse_export(path))
+                count = self.connection.executemany(insert_sql, rows).rowcount
+                self.connection.execute("UPDATE files SET mtime_ns = ?, size = ?, records = ? WHERE id = ?",
+                                        (file_stat.st_mtime_ns, file_stat.st_size, count, file_id))
+            stats['parsed'] += 1
+            stats['records'] += count
+
+        # Only forget files from the folder that was scanned
+        scanned = os.path.join(os.path.abspath(directory), "")
+        for path, (file_id, mtime_ns, size) in known.items():
+            if path.startswith(scanned) and path not in found:
+                with self.connection:
+                    self.connection.execute("DELETE FROM records WHERE file_id = ?", (file_id,))
+                    self.connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                stats['removed'] += 1
+
+        return stats
+
+    @staticmethod
+    def _record_row(file_id, line_number, record):
+        """Row for the records table (fields the calculator doesn't have are NULL)"""
+        values = record.as_dict()
+        return (file_id, line_number, record.kind, record.date_ordinal,
+                *[values.get(field) for field in VALUE_FIELDS])
+
+    def search(self, kind=None, start=None, end=None, minimum=None, maximum=None, limit=None):
+        """
+        Find indexed calculations
+
+        Args:
+            kind: Calculator ("Loan", "Mortgage", "Investment" or "Retirement"), or None for all
+            start: First date to include, or None
+            end: Last date to include, or None
+            minimum: dict of field name to lowest value to include
+            maximum: dict of field name to highest value to include
+            limit: Maximum number of results
+
+        Returns:
+            list: (CalculationRecord, file path, line number) tuples, oldest first
+        """
+        conditions = []
+        parameters = []
+        if kind is not None:
+            if kind not in RECORD_FIELDS:
+                raise ValueError(f"Unknown calculation type '{kind}'")
+            conditions.append("kind = ?")
+            parameters.append(kind)
+        if start is not None:
+            conditions.append("date_ordinal >= ?")
+            parameters.append(start.toordinal())
+        if end is not None:
+            conditions.append("date_ordinal <= ?")
+            parameters.append(end.toordinal())
+        for operator, bounds in ((">=", minimum), ("<=", maximum)):
+            for field, value in (bounds or {}).items():
+                if field not in VALUE_FIELDS:
+                    raise ValueError(f"Unknown field '{field}'")
+                conditions.append(f"{field} {operator} ?")
+                parameters.append(value)
+
+        sql = "SELECT records.*, files.path FROM records JOIN files ON files.id = records.file_id"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY date_ordinal, files.path, line"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(int(limit))
+
+        results = []
+        for row in self.connection.execute(sql, parameters):
+            file_id, line_number, record_kind, date_ordinal, *values, path = row
+            values = dict(zip(VALUE_FIELDS, values))
+            record = CalculationRecord(record_kind, [values[field] for field in RECORD_FIELDS[record_kind]],
+                                       date_ordinal)
+            results.append((record, path, line_number))
+        return results
+
+    def close(self):
+        """Close the index database"""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _parse_date(text):
+    """argparse type for dd/mm/yyyy dates"""
+    try:
+        return datetime.strptime(text, "%d/%m/%Y").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{text}' is not a dd/mm/yyyy date") from None
+
+
+def _parse_bound(text):
+    """argparse type for field=value bounds"""
+    field, separator, value = text.partition("=")
+    if not separator or field not in VALUE_FIELDS:
+        raise argparse.ArgumentTypeError(f"'{text}' should be field=value with a field from: {', '.join(VALUE_FIELDS)}")
+    try:
+        return field, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a number") from None
+
+
+def main(argv=None):
+    """
+    Command line entry point
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        int: Exit status
+    """
+    parser = argparse.ArgumentParser(prog="python -m export_index",
+                                     description="Index finance_*.txt exports and search them.")
+    parser.add_argument("directory", nargs="?", default=".", help="Folder containing the exports (default: .)")
+    parser.add_argument("--index", help=f"Index file (default: {DEFAULT_INDEX_NAME} in the folder)")
+    parser.add_argument("--kind", choices=sorted(RECORD_FIELDS), help="Only this calculator")
+    parser.add_argument("--from", dest="start", type=_parse_date, help="First date (dd/mm/yyyy)")
+    parser.add_argument("--to", dest="end", type=_parse_date, help="Last date (dd/mm/yyyy)")
+    parser.add_argument("--min", dest="minimum", type=_parse_bound, action="append", default=[],
+                        help="Lowest value, e.g. lvr=80 (repeatable)")
+    parser.add_argument("--max", dest="maximum", type=_parse_bound, action="append", default=[],
+                        help="Highest value, e.g. home_price=1000000 (repeatable)")
+    parser.add_argument("--limit", type=int, help="Maximum number of results")
+    args = parser.parse_args(argv)
+
+    index_path = args.index or os.path.join(args.directory, DEFAULT_INDEX_NAME)
+    with ExportIndex(index_path) as index:
+        stats = index.update(args.directory)
+        print(f"Indexed {stats['records']:,} calculations from {stats['parsed']} new or changed file(s)"
+              f" ({stats['unchanged']} unchanged, {stats['removed']} removed)", file=sys.stderr)
+
+        results = index.search(args.kind, args.start, args.end, dict(args.minimum), dict(args.maximum), args.limit)
+        for record, path, line_number in results:
+            print(f"{os.path.basename(path)}:{line_number}: {record.to_text()}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
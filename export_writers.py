@@ -0,0 +1,326 @@
+"""
+Export Writers - New Zealand Edition
+Streaming writers for calculation history and batch results
+
+Writers take rows one at a time (CalculationRecord objects or plain dicts), so
+exporting from a generator uses constant memory however many rows there are.
+Output goes through a large write buffer, optionally gzip or zstd compressed:
+    text   - "[dd/mm/yyyy] Loan: ..." lines, the same as the history journal
+    csv    - one column per field
+    jsonl  - one JSON object per line
+
+zstd compression needs the optional "zstandard" package.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+from datetime import date
+
+import all_constants as c
+from history_journal import JOURNAL_HEADER
+from history_records import RECORD_FIELDS, CalculationRecord
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024  # Bytes buffered between writes to the file
+
+# Columns for history records: date and calculator, then every calculator's values
+HISTORY_FIELDS = ["date", "calculator"]
+for _fields in RECORD_FIELDS.values():
+    HISTORY_FIELDS.extend(field for field in _fields if field not in HISTORY_FIELDS)
+del _fields
+
+
+def row_values(row):
+    """
+    Get a row's values as a dict
+
+    Args:
+        row: CalculationRecord or dict
+
+    Returns:
+        dict: Field name to value (records give "date", "calculator" and their values)
+    """
+    if isinstance(row, CalculationRecord):
+        values = {"date": row.date.strftime("%d/%m/%Y"), "calculator": row.kind}
+        values.update(row.as_dict())
+        return values
+    return row
+
+
+class ExportWriter:
+    """
+    Base class for export writers (use as a context manager, or call close())
+    """
+
+    extension = ""
+
+    def __init__(self, stream, fields=None, owns_stream=True):
+        """
+        Create a writer
+
+        Args:
+            stream: Open text stream to write to
+            fields: Column names (CSV needs these; other formats ignore them)
+            owns_stream: Whether close() should close the stream
+        """
+        self.stream = stream
+        self.fields = fields
+        self.owns_stream = owns_stream
+        self.count = 0
+        self.write_header()
+
+    def write_header(self):
+        """Write anything that goes before the first row"""
+
+    def write(self, row):
+        """
+        Write one row
+
+        Args:
+            row: CalculationRecord or dict
+        """
+        raise NotImplementedError
+
+    def write_all(self, rows):
+        """
+        Write every row from an iterable, one at a time
+
+        Args:
+            rows: Iterable (or generator) of rows
+
+        Returns:
+            int: Rows written by this writer so far
+        """
+        for row in rows:
+            self.write(row)
+        return self.count
+
+    def close(self):
+        """Flush buffered output and close the stream (if the writer opened it)"""
+        if self.owns_stream:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class TextExportWriter(ExportWriter):
+    """
+    History journal style text: a header then one "[dd/mm/yyyy] ..." line per row
+    """
+
+    extension = ".txt"
+
+    def write_header(self):
+        self.stream.write(JOURNAL_HEADER.format(day=date.today().strftime("%d/%m/%Y")))
+
+    def write(self, row):
+        if isinstance(row, CalculationRecord):
+            line = row.to_text()
+        else:
+            line = ", ".join(f"{field}: {value}" for field, value in row.items())
+        self.stream.write(line)
+        self.stream.write("\n")
+        self.count += 1
+
+
+class CsvExportWriter(ExportWriter):
+    """
+    CSV with a header row (fields default to HISTORY_FIELDS)
+    """
+
+    extension = ".csv"
+
+    def write_header(self):
+        self.fields = self.fields or HISTORY_FIELDS
+        self._writer = csv.DictWriter(self.stream, fieldnames=self.fields, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow(row_values(row))
+        self.count += 1
+
+
+class JsonlExportWriter(ExportWriter):
+    """
+    JSON Lines: one object per row
+    """
+
+    extension = ".jsonl"
+
+    def write(self, row):
+        self.stream.write(json.dumps(row_values(row)))
+        self.stream.write("\n")
+        self.count += 1
+
+
+EXPORT_WRITERS = {
+    "text": TextExportWriter,
+    "csv": CsvExportWriter,
+    "jsonl": JsonlExportWriter
+}
+
+# compression: file extension
+COMPRESSIONS = {
+    None: "",
+    "gzip": ".gz",
+    "zstd": ".zst"
+}
+
+
+def _open_binary(path, compression):
+    """Open a (possibly compressing) binary file for writing"""
+    if compression is None:
+        return io.FileIO(path, "w")
+    if compression == "gzip":
+        return gzip.GzipFile(path, "wb")
+
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("zstd export needs the 'zstandard' package (pip install zstandard)") from None
+    return zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+
+
+def open_writer(destination, export_format="csv", compression=None, fields=None,
+                buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Open an export writer on a file path or an already open text stream
+
+    Args:
+        destination: File path, or an open text stream (e.g. sys.stdout; not compressed)
+        export_format: Key of EXPORT_WRITERS
+        compression: Key of COMPRESSIONS
+        fields: Column names for CSV (defaults to HISTORY_FIELDS)
+        buffer_size: Write buffer size in bytes
+
+    Returns:
+        ExportWriter: Writer ready for write()/write_all()
+    """
+    if export_format not in EXPORT_WRITERS:
+        raise ValueError(f"Unknown export format '{export_format}'")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}'")
+    writer_class = EXPORT_WRITERS[export_format]
+
+    if not isinstance(destination, (str, os.PathLike)):
+        if compression is not None:
+            raise ValueError("Compression needs a file path, not an open stream")
+        return writer_class(destination, fields, owns_stream=False)
+
+    binary = io.BufferedWriter(_open_binary(destination, compression), buffer_size=buffer_size)
+    stream = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+    return writer_class(stream, fields)
+
+
+def format_from_name(file_name, default_format="csv"):
+    """
+    Work out the export format and compression from a file name
+
+    Args:
+        file_name: e.g. "results.jsonl.gz"
+        default_format: Format used when the extension isn't recognised
+
+    Returns:
+        tuple: (export format, compression)
+    """
+    name = file_name.lower()
+    compression = None
+    for option, extension in COMPRESSIONS.items():
+        if extension and name.endswith(extension):
+            compression = option
+            name = name[:-len(extension)]
+
+    for export_format, writer_class in EXPORT_WRITERS.items():
+        if name.endswith(writer_class.extension):
+            return export_format, compression
+    return default_format, compression
+
+
+def export_file_name(export_format="text", compression=None, day=None, prefix=c.EXPORT_FILE_PREFIX, number=1):
+    """
+    Build the default export file name
+
+    Numbers follow the history journal's segments: the first export of the day
+    has no number, later ones get "_2", "_3", ...
+
+    Args:
+        export_format: Key of EXPORT_WRITERS
+        compression: Key of COMPRESSIONS
+        day: Date in the name (defaults to today)
+        prefix: File name prefix
+        number: Export number for that day (1 is the unnumbered file)
+
+    Returns:
+        str: e.g. "finance_calculations_2025_05_28.csv.gz" or "finance_calculations_2025_05_28_2.csv.gz"
+    """
+    day = date.today() if day is None else day
+    suffix = "" if number == 1 else f"_{number}"
+    return (f"{prefix}_{day.strftime('%Y_%m_%d')}{suffix}{EXPORT_WRITERS[export_format].extension}"
+            f"{COMPRESSIONS[compression]}")
+
+
+def _reserve_path(directory, file_name, export_format, compression):
+    """Create the (empty) export file so no other export can take its name, and return its path"""
+    if file_name:
+        path = os.path.join(directory, file_name)
+        try:
+            open(path, "x").close()
+        except FileExistsError:
+            raise FileExistsError(f"{file_name} already exists") from None
+        return path
+
+    number = 1
+    while True:
+        path = os.path.join(directory, export_file_name(export_format, compression, number=number))
+        try:
+            open(path, "x").close()
+            return path
+        except FileExistsError:
+            number += 1
+
+
+def export_records(rows, directory=".", file_name=None, export_format="text", compression=None, fields=None):
+    """
+    Stream rows into a new export file
+
+    Existing files are never overwritten: the default name gets the next free
+    number for the day, and an explicit file_name that already exists raises
+    FileExistsError. The rows are written under a temporary name and renamed
+    when complete, so an interrupted export never leaves a half-written file
+    behind.
+
+    Args:
+        rows: Iterable (or generator) of CalculationRecord objects or dicts
+        directory: Folder for the export
+        file_name: File name (defaults to export_file_name())
+        export_format: Key of EXPORT_WRITERS
+        compression: Key of COMPRESSIONS
+        fields: Column names for CSV (defaults to HISTORY_FIELDS)
+
+    Returns:
+        tuple: (file path, number of rows written)
+    """
+    path = _reserve_path(directory, file_name, export_format, compression)
+    temp_path = path + ".tmp"
+    complete = False
+
+    try:
+        with open_writer(temp_path, export_format, compression, fields) as writer:
+            count = writer.write_all(rows)
+        os.replace(temp_path, path)
+        complete = True
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        if not complete:
+            os.remove(path)
+
+    return path, count
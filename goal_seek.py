@@ -0,0 +1,215 @@
+"""
+Goal-Seek Solvers - New Zealand Edition
+Work backwards from a target monthly repayment to the principal, term or rate
+
+These invert calculate_loan_payment and calculate_nz_mortgage_payment:
+    principal - closed form
+    term      - log form
+    rate      - safeguarded Newton (falls back to bisection inside a bracket that
+                always contains the answer, so it is guaranteed to converge)
+
+Vectorised versions for batches live in calculation_batch (solve_loan_*_batch).
+"""
+
+import math
+
+from calculation_finance import MORTGAGE_INSURANCE_RATE, calculate_loan_payment
+
+RATE_TOLERANCE = 1e-12  # Monthly rate tolerance (about 1e-9 percentage points a year)
+MAX_RATE_ITERATIONS = 200  # Bisection alone needs well under this to reach the tolerance
+ZERO_RATE_TOLERANCE = 1e-12  # Payments totalling the principal to this relative accuracy are a 0% loan
+
+
+def solve_loan_principal(monthly_payment, annual_rate, years):
+    """
+    Calculate how much can be borrowed for a monthly payment
+
+    Args:
+        monthly_payment: Target monthly payment in NZD
+        annual_rate: Annual interest rate as percentage
+        years: Loan term in years
+
+    Returns:
+        float: Loan principal in NZD
+    """
+    monthly_rate = annual_rate / 100 / 12
+    months = years * 12
+
+    if monthly_rate == 0:  # Handle 0% interest rate
+        return monthly_payment * months
+
+    growth = (1 + monthly_rate) ** months
+    return monthly_payment * (growth - 1) / (monthly_rate * growth)
+
+
+def solve_loan_term(principal, monthly_payment, annual_rate):
+    """
+    Calculate how long a loan takes to repay at a monthly payment
+
+    Args:
+        principal: Loan amount in NZD
+        monthly_payment: Monthly payment in NZD
+        annual_rate: Annual interest rate as percentage
+
+    Returns:
+        float: Loan term in years (fractional; round up for whole months)
+    """
+    monthly_rate = annual_rate / 100 / 12
+
+    if monthly_payment <= 0:
+        raise ValueError("Monthly payment must be greater than zero")
+    if monthly_rate == 0:  # Handle 0% interest rate
+        return principal / monthly_payment / 12
+    if monthly_payment <= principal * monthly_rate:
+        raise ValueError("Monthly payment doesn't cover the interest, so the loan is never repaid")
+
+    months = -math.log1p(-monthly_rate * principal / monthly_payment) / math.log1p(monthly_rate)
+    return months / 12
+
+
+def _payment_and_slope(principal, monthly_rate, months):
+    """
+    Monthly payment and its derivative with respect to the monthly rate
+
+    Args:
+        principal: Loan amount
+        monthly_rate: Monthly interest rate as a decimal (greater than 0)
+        months: Number of payments
+
+    Returns:
+        tuple: (payment, d payment / d rate)
+    """
+    growth = math.exp(months * math.log1p(monthly_rate))
+    growth_minus_one = math.expm1(months * math.log1p(monthly_rate))
+    payment = principal * monthly_rate * growth / growth_minus_one
+    slope = principal * (growth * growth_minus_one - monthly_rate * months * growth / (1 + monthly_rate)) / (
+        growth_minus_one ** 2)
+    return payment, slope
+
+
+def solve_loan_rate(principal, monthly_payment, years, tolerance=RATE_TOLERANCE,
+                    max_iterations=MAX_RATE_ITERATIONS):
+    """
+    Calculate the annual interest rate that gives a monthly payment
+
+    The payment rises with the rate, and the answer always lies between 0 and
+    monthly_payment / principal (where interest alone would use the whole payment).
+    Newton steps are taken while they stay inside that bracket; otherwise the bracket
+    is bisected.
+
+    Args:
+        principal: Loan amount in NZD
+        monthly_payment: Target monthly payment in NZD
+        years: Loan term in years
+        tolerance: Convergence tolerance on the monthly rate
+        max_iterations: Maximum number of iterations
+
+    Returns:
+        float: Annual interest rate as percentage
+    """
+    months = years * 12
+
+    if principal <= 0 or monthly_payment <= 0 or months <= 0:
+        raise ValueError("Principal, payment and term must be greater than zero")
+    # Compare with a tolerance: a 0% payment times the months can round either side of the principal
+    total_paid = monthly_payment * months
+    if math.isclose(total_paid, principal, rel_tol=ZERO_RATE_TOLERANCE):
+        return 0.0
+    if total_paid < principal:
+        raise ValueError("Monthly payment is too low to repay the loan at any positive rate")
+
+    low, high = 0.0, monthly_payment / principal
+    rate = min(2 * (monthly_payment * months - principal) / (principal * months), high / 2)
+
+    for _ in range(max_iterations):
+        payment, slope = _payment_and_slope(principal, rate, months)
+        difference = payment - monthly_payment
+
+        if difference > 0:
+            high = rate
+        else:
+            low = rate
+
+        next_rate = rate - difference / slope if slope > 0 else low - 1
+        if not low < next_rate < high:
+            next_rate = (low + high) / 2
+
+        if abs(next_rate - rate) <= tolerance or high - low <= tolerance:
+            return next_rate * 12 * 100
+        rate = next_rate
+
+    raise ValueError("Interest rate solver did not converge")
+
+
+def _mortgage_payment_target(total_monthly_payment, loan_amount, include_insurance):
+    """Loan repayment part of a total monthly mortgage payment (insurance removed)"""
+    insurance_monthly = loan_amount * MORTGAGE_INSURANCE_RATE / 12 if include_insurance else 0
+    return total_monthly_payment - insurance_monthly
+
+
+def solve_mortgage_home_price(total_monthly_payment, down_payment, annual_rate, years, include_insurance=True):
+    """
+    Calculate the most expensive home affordable at a total monthly mortgage payment
+
+    Args:
+        total_monthly_payment: Target monthly payment including insurance, in NZD
+        down_payment: Down payment amount in NZD
+        annual_rate: Annual interest rate as percentage
+        years: Loan term in years
+        include_insurance: Whether the payment includes mortgage protection insurance
+
+    Returns:
+        dict: 'loan_amount' and 'home_price' in NZD
+    """
+    # Payment is linear in the loan amount: loan * (repayment per dollar + insurance per dollar)
+    payment_per_dollar = calculate_loan_payment(1.0, annual_rate, years)[0]
+    if include_insurance:
+        payment_per_dollar += MORTGAGE_INSURANCE_RATE / 12
+
+    loan_amount = total_monthly_payment / payment_per_dollar
+    return {
+        'loan_amount': loan_amount,
+        'home_price': loan_amount + down_payment
+    }
+
+
+def solve_mortgage_term(home_price, down_payment, total_monthly_payment, annual_rate, include_insurance=True):
+    """
+    Calculate how long a mortgage takes to repay at a total monthly payment
+
+    Args:
+        home_price: Total price of the home in NZD
+        down_payment: Down payment amount in NZD
+        total_monthly_payment: Monthly payment including insurance, in NZD
+        annual_rate: Annual interest rate as percentage
+        include_insurance: Whether the payment includes mortgage protection insurance
+
+    Returns:
+        float: Mortgage term in years
+    """
+    loan_amount = home_price - down_payment
+    return solve_loan_term(loan_amount, _mortgage_payment_target(total_monthly_payment, loan_amount,
+                                                                 include_insurance), annual_rate)
+
+
+def solve_mortgage_rate(home_price, down_payment, total_monthly_payment, years, include_insurance=True,
+                        tolerance=RATE_TOLERANCE, max_iterations=MAX_RATE_ITERATIONS):
+    """
+    Calculate the interest rate that makes a mortgage cost a total monthly payment
+
+    Args:
+        home_price: Total price of the home in NZD
+        down_payment: Down payment amount in NZD
+        total_monthly_payment: Target monthly payment including insurance, in NZD
+        years: Mortgage term in years
+        include_insurance: Whether the payment includes mortgage protection insurance
+        tolerance: Convergence tolerance on the monthly rate
+        max_iterations: Maximum number of iterations
+
+    Returns:
+        float: Annual interest rate as percentage
+    """
+    loan_amount = home_price - down_payment
+    return solve_loan_rate(loan_amount, _mortgage_payment_target(total_monthly_payment, loan_amount,
+                                                                 include_insurance),
+                           years, tolerance, max_iterations)
@@ -0,0 +1,178 @@
+"""
+Calculation History Journal - New Zealand Edition
+Append-only journal of calculations, one text segment per day
+
+Each calculation is written once, as the same "[dd/mm/yyyy] ..." line the
+history export uses. Segments are named finance_YYYY_MM_DD.txt (then
+finance_YYYY_MM_DD_2.txt, _3, ... once a segment reaches the size limit), so
+earlier sessions from the same day are appended to, never overwritten.
+Writes are fsynced in batches; compact() merges old segments into one archive.
+"""
+
+import os
+import re
+from datetime import date
+
+import all_constants as c
+
+JOURNAL_HEADER = ("***** Personal Finance Calculations *****\n"
+                  "Generated: {day}\n\n"
+                  "Here is your calculation history (oldest to newest)...\n\n")
+
+
+class HistoryJournal:
+    """
+    Append-only, rotating journal of calculation history records
+    """
+
+    def __init__(self, directory=".", prefix=c.JOURNAL_FILE_PREFIX, max_bytes=c.JOURNAL_MAX_BYTES,
+                 fsync_batch=c.JOURNAL_FSYNC_BATCH, today=date.today):
+        """
+        Create a journal (no file is opened until the first record is written)
+
+        Args:
+            directory: Folder the segments are written to
+            prefix: Segment file name prefix
+            max_bytes: Segment size that triggers rotation to a new file
+            fsync_batch: Records written between fsyncs
+            today: Function returning today's date
+        """
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.fsync_batch = fsync_batch
+        self.today = today
+        self.path = None
+        self._file = None
+        self._segment_day = None
+        self._unsynced = 0
+        self._segment_pattern = re.compile(rf"^{re.escape(prefix)}_(\d{{4}})_(\d{{2}})_(\d{{2}})(?:_(\d+))?\.txt$")
+
+    def segment_path(self, day, number=1):
+        """
+        Get the file path of a segment
+
+        Args:
+            day: Date of the segment
+            number: Segment number for that day (1 is the unnumbered file)
+
+        Returns:
+            str: File path
+        """
+        suffix = "" if number == 1 else f"_{number}"
+        return os.path.join(self.directory, f"{self.prefix}_{day.strftime('%Y_%m_%d')}{suffix}.txt")
+
+    def _open_segment(self, day):
+        """Open the first segment for day that still has room, writing a header if it is new"""
+        self.close()
+
+        number = 1
+        path = self.segment_path(day, number)
+        while os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+            number += 1
+            path = self.segment_path(day, number)
+
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", encoding="utf-8")
+        self._segment_day = day
+        self.path = path
+
+        if is_new:
+            self._file.write(JOURNAL_HEADER.format(day=day.strftime("%d/%m/%Y")))
+
+    def append(self, record):
+        """
+        Write one history record to the journal
+
+        Args:
+            record: CalculationRecord (or anything with to_text())
+        """
+        day = self.today()
+        if self._file is None or day != self._segment_day or self._file.tell() >= self.max_bytes:
+            self._open_segment(day)
+
+        self._file.write(record.to_text())
+        self._file.write("\n")
+
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_batch:
+            self.sync()
+
+    def sync(self):
+        """Flush buffered records and fsync them to disk"""
+        if self._file is not None and self._unsynced:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        """Sync and close the current segment"""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+            self._segment_day = None
+
+    def segments(self):
+        """
+        List the journal segments in the directory, oldest first
+
+        Returns:
+            list: (day, number, path) tuples
+        """
+        found = []
+        for file_name in os.listdir(self.directory):
+            match = self._segment_pattern.match(file_name)
+            if match:
+                year, month, day, number = match.groups()
+                found.append((date(int(year), int(month), int(day)), int(number or 1),
+                              os.path.join(self.directory, file_name)))
+        return sorted(found)
+
+    def compact(self, archive_name=None, include_today=False):
+        """
+        Merge journal segments into one archive file and delete the merged segments
+
+        Calculation lines are appended to the archive in date order; segment headers are
+        dropped. The archive is rewritten through a temporary file so a failure part way
+        through leaves the segments untouched.
+
+        Args:
+            archive_name: Archive file name (defaults to <prefix>_archive.txt)
+            include_today: Whether to merge today's segments too (closes the current one)
+
+        Returns:
+            tuple: (archive path, number of segments merged)
+        """
+        archive_path = os.path.join(self.directory, archive_name or f"{self.prefix}_archive.txt")
+        today = self.today()
+
+        if include_today:
+            self.close()
+        merged = [path for day, number, path in self.segments() if include_today or day != today]
+        if not merged:
+            return archive_path, 0
+
+        temp_path = archive_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as archive_file:
+            if os.path.exists(archive_path):
+                with open(archive_path, encoding="utf-8") as old_archive:
+                    for line in old_archive:
+                        archive_file.write(line)
+            else:
+                archive_file.write(JOURNAL_HEADER.format(day=today.strftime("%d/%m/%Y")))
+
+            for path in merged:
+                with open(path, encoding="utf-8") as segment_file:
+                    for line in segment_file:
+                        if line.startswith("["):
+                            archive_file.write(line)
+
+            archive_file.flush()
+            os.fsync(archive_file.fileno())
+
+        os.replace(temp_path, archive_path)
+        for path in merged:
+            os.remove(path)
+
+        return archive_path, len(merged)
@@ -0,0 +1,312 @@
+"""
+Calculation History Records - New Zealand Edition
+Compact history records and a bounded ring buffer for the calculation history
+
+Records keep the raw numbers and the date as an ordinal; the display text
+("[dd/mm/yyyy] Loan: Amount: ... → Monthly: ...") is only built when a record
+is shown or exported.
+"""
+
+import csv
+import os
+import re
+import tempfile
+from collections import deque
+from datetime import date, datetime
+from itertools import islice
+
+from calculation_finance import format_nz_currency
+
+# Numeric values stored for each kind of calculation, in order
+RECORD_FIELDS = {
+    "Loan": ("principal", "annual_rate", "years", "monthly_payment"),
+    "Mortgage": ("home_price", "down_payment", "annual_rate", "total_monthly_payment", "lvr"),
+    "Investment": ("initial_investment", "annual_contribution", "annual_return_rate", "years", "final_value"),
+    "Retirement": ("current_age", "retirement_age", "current_balance", "annual_salary", "projected_balance")
+}
+
+
+def _format_loan(values):
+    principal, annual_rate, years, monthly_payment = values
+    return (f"Loan: Amount: {format_nz_currency(principal)}, Rate: {annual_rate}%, Term: {int(years)} years"
+            f" → Monthly: {format_nz_currency(monthly_payment)}")
+
+
+def _format_mortgage(values):
+    home_price, down_payment, annual_rate, total_monthly_payment, lvr = values
+    return (f"Mortgage: Home: {format_nz_currency(home_price)}, Down: {format_nz_currency(down_payment)},"
+            f" Rate: {annual_rate}% → Monthly: {format_nz_currency(total_monthly_payment)}, LVR: {lvr:.1f}%")
+
+
+def _format_investment(values):
+    initial_investment, annual_contribution, annual_return_rate, years, final_value = values
+    return (f"Investment: Initial: {format_nz_currency(initial_investment)},"
+            f" Annual: {format_nz_currency(annual_contribution)}, Return: {annual_return_rate}%,"
+            f" Period: {int(years)} years → Final: {format_nz_currency(final_value)}")
+
+
+def _format_retirement(values):
+    current_age, retirement_age, current_balance, annual_salary, projected_balance = values
+    return (f"Retirement: Age: {int(current_age)}→{int(retirement_age)},"
+            f" Balance: {format_nz_currency(current_balance)}, Salary: {format_nz_currency(annual_salary)}"
+            f" → Retirement Balance: {format_nz_currency(projected_balance)}")
+
+
+RECORD_FORMATTERS = {
+    "Loan": _format_loan,
+    "Mortgage": _format_mortgage,
+    "Investment": _format_investment,
+    "Retirement": _format_retirement
+}
+
+# Inverse of RECORD_FORMATTERS: group names are the RECORD_FIELDS names
+_MONEY = r"\$(?P<{}>\S+) NZD"
+_NUMBER = r"(?P<{}>\S+?)"
+RECORD_PATTERNS = {
+    "Loan": re.compile(
+        rf"Loan: Amount: {_MONEY.format('principal')}, Rate: {_NUMBER.format('annual_rate')}%,"
+        rf" Term: {_NUMBER.format('years')} years → Monthly: {_MONEY.format('monthly_payment')}$"),
+    "Mortgage": re.compile(
+        rf"Mortgage: Home: {_MONEY.format('home_price')}, Down: {_MONEY.format('down_payment')},"
+        rf" Rate: {_NUMBER.format('annual_rate')}% → Monthly: {_MONEY.format('total_monthly_payment')},"
+        rf" LVR: {_NUMBER.format('lvr')}%$"),
+    "Investment": re.compile(
+        rf"Investment: Initial: {_MONEY.format('initial_investment')},"
+        rf" Annual: {_MONEY.format('annual_contribution')}, Return: {_NUMBER.format('annual_return_rate')}%,"
+        rf" Period: {_NUMBER.format('years')} years → Final: {_MONEY.format('final_value')}$"),
+    "Retirement": re.compile(
+        rf"Retirement: Age: {_NUMBER.format('current_age')}→{_NUMBER.format('retirement_age')},"
+        rf" Balance: {_MONEY.format('current_balance')}, Salary: {_MONEY.format('annual_salary')}"
+        rf" → Retirement Balance: {_MONEY.format('projected_balance')}$")
+}
+_LINE_PATTERN = re.compile(r"^\[(\d{2}/\d{2}/\d{4})\] (\w+): ")
+
+
+class CalculationRecord:
+    """
+    One calculation in the history
+    """
+
+    __slots__ = ("kind", "date_ordinal", "values")
+
+    def __init__(self, kind, values, date_ordinal=None):
+        """
+        Create a history record
+
+        Args:
+            kind: "Loan", "Mortgage", "Investment" or "Retirement"
+            values: Numbers in RECORD_FIELDS[kind] order
+            date_ordinal: Date of the calculation as date.toordinal() (defaults to today)
+        """
+        if kind not in RECORD_FIELDS:
+            raise ValueError(f"Unknown calculation type '{kind}'")
+        if len(values) != len(RECORD_FIELDS[kind]):
+            raise ValueError(f"{kind} records need {len(RECORD_FIELDS[kind])} values")
+
+        self.kind = kind
+        self.values = tuple(float(value) for value in values)
+        self.date_ordinal = date.today().toordinal() if date_ordinal is None else int(date_ordinal)
+
+    @property
+    def date(self):
+        """Date of the calculation"""
+        return date.fromordinal(self.date_ordinal)
+
+    def as_dict(self):
+        """
+        Get the values keyed by field name
+
+        Returns:
+            dict: Field name to value
+        """
+        return dict(zip(RECORD_FIELDS[self.kind], self.values))
+
+    def to_text(self):
+        """
+        Format the record as a history line
+
+        Returns:
+            str: e.g. "[28/05/2025] Loan: Amount: $10.00 NZD, Rate: 40.0%, ..."
+        """
+        return f"[{self.date.strftime('%d/%m/%Y')}] {RECORD_FORMATTERS[self.kind](self.values)}"
+
+    def to_row(self):
+        """
+        Convert to a flat list for CSV storage
+
+        Returns:
+            list: [kind, date_ordinal, *values]
+        """
+        return [self.kind, self.date_ordinal, *[repr(value) for value in self.values]]
+
+    @classmethod
+    def from_text(cls, line):
+        """
+        Parse a history line written by to_text() (amounts come back rounded to the cent)
+
+        Args:
+            line: e.g. "[28/05/2025] Loan: Amount: $10.00 NZD, Rate: 40.0%, ..."
+
+        Returns:
+            CalculationRecord: The record, or None if the line isn't a history line
+        """
+        line = line.rstrip("\r\n")
+        line_match = _LINE_PATTERN.match(line)
+        if line_match is None or line_match.group(2) not in RECORD_PATTERNS:
+            return None
+
+        kind = line_match.group(2)
+        match = RECORD_PATTERNS[kind].match(line, line_match.start(2))
+        if match is None:
+            return None
+
+        try:
+            day = datetime.strptime(line_match.group(1), "%d/%m/%Y").date()
+            values = [float(match.group(field).replace(",", "")) for field in RECORD_FIELDS[kind]]
+        except ValueError:
+            return None
+        return cls(kind, values, day.toordinal())
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Rebuild a record from to_row() output
+
+        Args:
+            row: [kind, date_ordinal, *values] (strings are fine)
+
+        Returns:
+            CalculationRecord: The record
+        """
+        return cls(row[0], [float(value) for value in row[2:]], int(row[1]))
+
+    def __eq__(self, other):
+        if not isinstance(other, CalculationRecord):
+            return NotImplemented
+        return (self.kind, self.date_ordinal, self.values) == (other.kind, other.date_ordinal, other.values)
+
+    def __repr__(self):
+        return f"CalculationRecord({self.kind!r}, {self.values!r}, {self.date_ordinal})"
+
+
+class CalculationHistory:
+    """
+    Bounded calculation history
+
+    Keeps the newest max_records records in memory. Older records are appended to a
+    spill file on disk (or dropped when spilling is off), so memory use stays flat in
+    long-running sessions while exports still see the whole history.
+    """
+
+    def __init__(self, max_records, spill_to_disk=True, spill_path=None):
+        """
+        Create an empty history
+
+        Args:
+            max_records: Number of records kept in memory
+            spill_to_disk: Whether to keep records pushed out of memory in a file
+            spill_path: Spill file (defaults to a temporary file created on first spill)
+        """
+        if max_records < 1:
+            raise ValueError("History size must be at least 1")
+
+        self.max_records = max_records
+        self.spill_to_disk = spill_to_disk
+        self.spill_path = spill_path
+        self._owns_spill_file = False
+        self._records = deque(maxlen=max_records)
+        self.added = 0
+        self.spilled = 0
+        self.dropped = 0
+
+    def add(self, kind, values, date_ordinal=None):
+        """
+        Add a calculation to the history
+
+        Args:
+            kind: "Loan", "Mortgage", "Investment" or "Retirement"
+            values: Numbers in RECORD_FIELDS[kind] order
+            date_ordinal: Date as date.toordinal() (defaults to today)
+
+        Returns:
+            CalculationRecord: The new record
+        """
+        record = CalculationRecord(kind, values, date_ordinal)
+        if len(self._records) == self.max_records:
+            self._spill(self._records[0])
+        self._records.append(record)
+        self.added += 1
+        return record
+
+    def _spill(self, record):
+        """Write the record about to be pushed out of memory to the spill file"""
+        if not self.spill_to_disk:
+            self.dropped += 1
+            return
+
+        if self.spill_path is None:
+            spill_fd, self.spill_path = tempfile.mkstemp(prefix="finance_history_", suffix=".csv")
+            os.close(spill_fd)
+            self._owns_spill_file = True
+
+        with open(self.spill_path, "a", newline="", encoding="utf-8") as spill_file:
+            csv.writer(spill_file).writerow(record.to_row())
+        self.spilled += 1
+
+    def newest(self, count):
+        """
+        Get the most recent records, newest first
+
+        Args:
+            count: Maximum number of records
+
+        Returns:
+            list: Up to count records from memory
+        """
+        return list(islice(reversed(self._records), count))
+
+    def records_from(self, start):
+        """
+        Iterate over the records added at or after a position, oldest to newest
+
+        Args:
+            start: Position in the order records were added (0 is the first record ever added)
+
+        Yields:
+            CalculationRecord: Each record still available (dropped records are skipped)
+        """
+        first_in_memory = self.added - len(self._records)
+
+        if start < first_in_memory and self.spilled and self.spill_path and os.path.exists(self.spill_path):
+            with open(self.spill_path, newline="", encoding="utf-8") as spill_file:
+                for row in islice(csv.reader(spill_file), start, None):
+                    yield CalculationRecord.from_row(row)
+
+        yield from list(islice(self._records, max(start - first_in_memory, 0), None))
+
+    def __iter__(self):
+        """Iterate over every record, oldest to newest (spilled records first)"""
+        return self.records_from(0)
+
+    def __len__(self):
+        """Number of records available, including spilled ones"""
+        return len(self._records) + self.spilled
+
+    def clear(self):
+        """Remove every record, including the spill file"""
+        self._records.clear()
+        self.added = 0
+        if self._owns_spill_file:
+            self.close()
+        elif self.spill_path and os.path.exists(self.spill_path):
+            open(self.spill_path, "w").close()
+        self.spilled = 0
+        self.dropped = 0
+
+    def close(self):
+        """Delete the spill file if this history created it"""
+        if self._owns_spill_file and self.spill_path and os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+        if self._owns_spill_file:
+            self.spill_path = None
+            self._owns_spill_file = False
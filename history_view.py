@@ -0,0 +1,274 @@
+"""
+History Viewer - New Zealand Edition
+Virtualised, sortable and searchable list of the calculation history
+
+The Treeview only ever holds one screen of rows. Scrolling moves a window over the
+sorted (and filtered) record order and refills those rows, so only the records on
+screen are formatted, however long the history is. Searches run a chunk of records
+at a time between Tk events, so typing never blocks the window.
+"""
+
+from functools import partial
+from tkinter import *
+from tkinter import ttk
+
+import all_constants as c
+from calculation_finance import format_nz_currency
+from history_records import RECORD_FIELDS, RECORD_FORMATTERS
+
+# Value shown in the Result column for each calculator
+RESULT_FIELDS = {
+    "Loan": "monthly_payment",
+    "Mortgage": "total_monthly_payment",
+    "Investment": "final_value",
+    "Retirement": "projected_balance"
+}
+_RESULT_INDEX = {kind: RECORD_FIELDS[kind].index(field) for kind, field in RESULT_FIELDS.items()}
+
+# column: (heading, width, sort key)
+COLUMNS = {
+    "date": ("Date", 90, lambda record: record.date_ordinal),
+    "calculator": ("Calculator", 90, lambda record: record.kind),
+    "result": ("Result", 130, lambda record: record.values[_RESULT_INDEX[record.kind]]),
+    "details": ("Details", 470, lambda record: (record.kind, record.values))
+}
+
+
+def row_text(record):
+    """
+    Format a record for the viewer's columns
+
+    Args:
+        record: CalculationRecord
+
+    Returns:
+        tuple: (date, calculator, result, details) text
+    """
+    details = RECORD_FORMATTERS[record.kind](record.values).partition(": ")[2]
+    return (record.date.strftime("%d/%m/%Y"), record.kind,
+            format_nz_currency(record.values[_RESULT_INDEX[record.kind]]), details)
+
+
+class HistoryRows:
+    """
+    Sort order and search results over a snapshot of the history (no Tk needed)
+    """
+
+    def __init__(self, records):
+        """
+        Create the model
+
+        Args:
+            records: Iterable of CalculationRecord, oldest first (e.g. a CalculationHistory)
+        """
+        self.records = list(records)
+        self.sort_column = "date"
+        self.descending = True
+        self.order = list(range(len(self.records) - 1, -1, -1))  # Every position, in sort order
+        self.visible = self.order  # Positions matching the search, in sort order
+        self.query = ""
+        self._texts = [None] * len(self.records)  # Lower-case search text, built when first searched
+        self._candidates = []
+        self._searched = 0
+
+    @property
+    def searching(self):
+        """Whether a search still has records to check"""
+        return self._searched < len(self._candidates)
+
+    def sort(self, column, descending):
+        """
+        Re-sort every record (ties keep newest first)
+
+        Args:
+            column: Key of COLUMNS
+            descending: Whether to sort largest first
+        """
+        sort_key = COLUMNS[column][2]
+        records = self.records
+        position_sign = 1 if descending else -1
+        self.order.sort(key=lambda position: (sort_key(records[position]), position_sign * position),
+                        reverse=descending)
+        self.sort_column = column
+        self.descending = descending
+        self.start_search(self.query, narrow=False)
+
+    def search_text(self, position):
+        """Lower-case history line of a record, cached for later searches"""
+        text = self._texts[position]
+        if text is None:
+            text = self._texts[position] = self.records[position].to_text().lower()
+        return text
+
+    def start_search(self, query, narrow=True):
+        """
+        Start filtering for records containing some text (call search_step() to run it)
+
+        Args:
+            query: Text to look for (case is ignored; empty shows every record)
+            narrow: Only check the current matches when the query extends the last one
+        """
+        query = query.strip().lower()
+        if narrow and self.query and query.startswith(self.query) and not self.searching:
+            candidates = self.visible
+        else:
+            candidates = self.order
+
+        self.query = query
+        if query:
+            self._candidates = candidates
+            self._searched = 0
+            self.visible = []
+        else:
+            self._candidates = []
+            self._searched = 0
+            self.visible = self.order
+
+    def search_step(self, count=c.HISTORY_SEARCH_CHUNK):
+        """
+        Check the next chunk of records against the search
+
+        Args:
+            count: Number of records to check
+
+        Returns:
+            bool: Whether the search has finished
+        """
+        query = self.query
+        stop = min(self._searched + count, len(self._candidates))
+        self.visible.extend(position for position in self._candidates[self._searched:stop]
+                            if query in self.search_text(position))
+        self._searched = stop
+        return not self.searching
+
+
+class HistoryView:
+    """
+    Search box, sortable Treeview and scrollbar showing a calculation history
+    """
+
+    def __init__(self, parent, records, rows=c.HISTORY_VIEW_ROWS):
+        """
+        Create the viewer (grid or pack self.frame to show it)
+
+        Args:
+            parent: Parent widget
+            records: Iterable of CalculationRecord, oldest first
+            rows: Number of rows on screen
+        """
+        self.rows = rows
+        self.model = HistoryRows(records)
+        self.first = 0  # Position in model.visible of the top row
+        self._search_job = None
+
+        self.frame = Frame(parent)
+
+        Label(self.frame, text="Search:", font=("Arial", 11)).grid(row=0, column=0, sticky="w")
+        self.search_var = StringVar()
+        self.search_entry = Entry(self.frame, textvariable=self.search_var, font=("Arial", 11), width=30)
+        self.search_entry.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+        self.count_label = Label(self.frame, font=("Arial", 10), fg="#666666")
+        self.count_label.grid(row=0, column=2, sticky="e")
+
+        self.tree = ttk.Treeview(self.frame, columns=list(COLUMNS), show="headings", height=rows,
+                                 selectmode="browse")
+        for column, (heading, width, sort_key) in COLUMNS.items():
+            self.tree.heading(column, text=heading, command=partial(self.sort_by, column))
+            self.tree.column(column, width=width, anchor="e" if column == "result" else "w",
+                             stretch=column == "details")
+        self.tree.grid(row=1, column=0, columnspan=3, sticky="nsew")
+
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=VERTICAL, command=self.on_scroll)
+        self.scrollbar.grid(row=1, column=3, sticky="ns")
+
+        # The Treeview never holds more rows than fit, so scrolling is handled here
+        for sequence, step in (("<Button-4>", -3), ("<Button-5>", 3), ("<Prior>", -rows), ("<Next>", rows)):
+            self.tree.bind(sequence, partial(self.scroll_event, step))
+        self.tree.bind("<MouseWheel>", self.wheel_event)
+        self.tree.bind("<Home>", lambda event: self.scroll_to(0))
+        self.tree.bind("<End>", lambda event: self.scroll_to(len(self.model.visible)))
+
+        self.search_var.trace_add("write", self.on_search)
+        self.frame.bind("<Destroy>", self.stop_search)
+        self.show_sort_arrow()
+        self.refresh()
+
+    def refresh(self):
+        """Fill the on-screen rows from the current window onto the records"""
+        visible = self.model.visible
+        self.first = max(min(self.first, len(visible) - self.rows), 0)
+
+        self.tree.delete(*self.tree.get_children())
+        for position in visible[self.first:self.first + self.rows]:
+            self.tree.insert("", END, values=row_text(self.model.records[position]))
+
+        if visible:
+            self.scrollbar.set(self.first / len(visible), min((self.first + self.rows) / len(visible), 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        total = len(self.model.records)
+        if self.model.searching:
+            count_text = f"Searching... {len(visible):,} found"
+        elif self.model.query:
+            count_text = f"{len(visible):,} of {total:,} calculations match"
+        else:
+            count_text = f"{total:,} calculations"
+        self.count_label.config(text=count_text)
+
+    def scroll_to(self, first):
+        """Show the rows starting at a position"""
+        self.first = first
+        self.refresh()
+
+    def on_scroll(self, action, amount, unit=None):
+        """Scrollbar command ("moveto" a fraction, or "scroll" by units or pages)"""
+        if action == "moveto":
+            self.scroll_to(int(round(float(amount) * len(self.model.visible))))
+        elif action == "scroll":
+            self.scroll_to(self.first + int(amount) * (self.rows if unit == "pages" else 1))
+
+    def scroll_event(self, step, event):
+        """Scroll by a fixed number of rows (X11 mouse wheel, Page Up/Down)"""
+        self.scroll_to(self.first + step)
+        return "break"
+
+    def wheel_event(self, event):
+        """Scroll for a Windows or macOS mouse wheel"""
+        self.scroll_to(self.first + (-3 if event.delta > 0 else 3))
+        return "break"
+
+    def sort_by(self, column):
+        """Sort by a column (clicking the sorted column again reverses it)"""
+        descending = not self.model.descending if column == self.model.sort_column else False
+        self.model.sort(column, descending)
+        self.show_sort_arrow()
+        self.first = 0
+        self.run_search()
+
+    def show_sort_arrow(self):
+        """Mark the sorted column's heading"""
+        for column, (heading, width, sort_key) in COLUMNS.items():
+            if column == self.model.sort_column:
+                heading += " ▼" if self.model.descending else " ▲"
+            self.tree.heading(column, text=heading)
+
+    def on_search(self, *args):
+        """Restart the search whenever the search box changes"""
+        self.model.start_search(self.search_var.get())
+        self.first = 0
+        self.run_search()
+
+    def stop_search(self, event=None):
+        """Cancel the next scheduled search step (e.g. when the window closes)"""
+        if self._search_job is not None:
+            self.frame.after_cancel(self._search_job)
+            self._search_job = None
+
+    def run_search(self):
+        """Check a chunk of records, show the results so far and schedule the next chunk"""
+        self.stop_search()
+        finished = self.model.search_step()
+        self.refresh()
+        if not finished:
+            self._search_job = self.frame.after(1, self.run_search)
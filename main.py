@@ -1,9 +1,15 @@
 from tkinter import *
 from functools import partial
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import calculation_finance as calc
 import all_constants as c
-from datetime import date
+import calculators
+import os
+import time
+from calculation_worker import CalculationWorker
+from history_journal import HistoryJournal
+from history_records import CalculationHistory
+from history_view import HistoryView
 
 
 class PersonalFinanceCalculator:
@@ -16,7 +22,13 @@ class PersonalFinanceCalculator:
         Initialize Finance Calculator GUI
         """
         self.root = root
-        self.calculation_history = []
+        self.calculation_history = CalculationHistory(c.MAX_HISTORY_RECORDS)
+        self.journal = HistoryJournal()
+        self.exported_count = 0  # Calculations already written to the journal
+        self.export_directory = "."
+        self.export_choice = list(c.EXPORT_CHOICES)[0]
+        self.worker = CalculationWorker(root, on_busy_change=self.set_busy)
+        self.root.protocol('WM_DELETE_WINDOW', self.close_calculator)
         self.setup_main_frame()
         self.create_header()
         self.create_notebook()
@@ -36,7 +48,7 @@ class PersonalFinanceCalculator:
         self.finance_heading.pack(pady=(0, 10))
 
         instructions = ("Use the tabs below to access different financial calculators. "
-                        "Enter the required information and press the calculate button.")
+                        "Results update as you type; press the calculate button to save a calculation to your history.")
         self.finance_instructions = Label(self.finance_frame,
                                           text=instructions,
                                           wraplength=400,
@@ -48,84 +60,100 @@ class PersonalFinanceCalculator:
         self.notebook = ttk.Notebook(self.finance_frame)
         self.notebook.pack(expand=True, fill="both", padx=15, pady=(20, 10))
 
-        self.tabs = {
-            "Loan Calculator": ttk.Frame(self.notebook),
-            "Mortgage Calculator": ttk.Frame(self.notebook),
-            "Investment Projector": ttk.Frame(self.notebook),
-            "Retirement Planner": ttk.Frame(self.notebook)
-        }
+        self.tabs = {definition["title"]: ttk.Frame(self.notebook) for definition in calculators.CALCULATORS.values()}
 
         for tab_name, tab_frame in self.tabs.items():
             self.notebook.add(tab_frame, text=tab_name)
 
     def setup_tab_content(self):
-        """Setup content for each tab"""
-        tab_configs = {
-            "Loan Calculator": {
-                "fields": ["Loan Amount (NZD)", "Annual Interest Rate (%)", "Loan Term (Years)"],
-                "button_text": "Calculate Loan",
-                "command": self.calculate_loan
-            },
-            "Mortgage Calculator": {
-                "fields": ["Home Price (NZD)", "Down Payment (NZD)", "Annual Interest Rate (%)",
-                           "Mortgage Term (Years)"],
-                "button_text": "Calculate Mortgage",
-                "command": self.calculate_mortgage
-            },
-            "Investment Projector": {
-                "fields": ["Initial Investment (NZD)", "Annual Contribution (NZD)", "Annual Return Rate (%)",
-                           "Investment Period (Years)"],
-                "button_text": "Calculate Investment",
-                "command": self.calculate_investment
-            },
-            "Retirement Planner": {
-                "fields": ["Current Age", "Retirement Age", "Current KiwiSaver Balance (NZD)", "Annual Salary (NZD)",
-                           "Employee Contribution Rate (%)", "Expected Annual Return (%)"],
-                "button_text": "Calculate Retirement",
-                "command": self.calculate_retirement
+        """Setup tab content; each tab's widgets are built the first time it is selected"""
+        self.tab_configs = {}
+        for definition in calculators.CALCULATORS.values():
+            self.tab_configs[definition["title"]] = {
+                "fields": definition["fields"],
+                "button_text": definition["button_text"],
+                "command": partial(self.calculate, definition["title"])
             }
-        }
+        self.tab_configs["Mortgage Calculator"]["extra_button"] = ["Rate × Term Grid", self.to_mortgage_grid]
 
         self.entries = {}
+        self.entry_vars = {}
         self.result_labels = {}
-
-        for tab_name, config in tab_configs.items():
-            tab_frame = self.tabs[tab_name]
-            self.entries[tab_name] = {}
-
-            input_frame = Frame(tab_frame)
-            input_frame.pack(expand=True, pady=20)
-
-            for i, field_name in enumerate(config["fields"]):
-                Label(input_frame, text=field_name, font=("Arial", 10)).grid(row=i, column=0, sticky="w", padx=5,
-                                                                             pady=5)
-                entry = Entry(input_frame, width=20, font=("Arial", 10))
-                entry.grid(row=i, column=1, padx=5, pady=5)
-                self.entries[tab_name][field_name] = entry
-
-            calc_button = Button(input_frame,
-                                 text=config["button_text"],
-                                 bg="#990099", fg="white",
-                                 font=("Arial", 12, "bold"),
-                                 command=config["command"],
-                                 width=20)
-            calc_button.grid(row=len(config["fields"]), column=0, columnspan=2, pady=20)
-
-            result_frame = Frame(input_frame, height=80)
-            result_frame.grid(row=len(config["fields"]) + 1, column=0, columnspan=2, pady=10,
-                              sticky="ew")
-            result_frame.grid_propagate(False)
-
-            # Configure the grid to center the content
-            result_frame.grid_rowconfigure(0, weight=1)
-            result_frame.grid_columnconfigure(0, weight=1)
-
-            self.result_labels[tab_name] = Label(result_frame,
-                                                 text="",
-                                                 font=("Arial", 8, "bold"),
-                                                 fg="#0066CC",
-                                                 wraplength=300)
-            self.result_labels[tab_name].grid(row=0, column=0)
+        self.extra_buttons = {}
+        self.tab_build_times = {}  # Tab name: seconds taken to build its widgets
+        self.live_jobs = {}  # Tab name: after() id of its pending live update
+        self.live_values = {}  # Tab name: inputs of the latest live calculation
+        self.live_waiting = set()  # Tabs edited while their live calculation was running
+        self.field_values = {}  # Tab name: each field's value, or its error message, checked as it is edited
+
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.build_tab(self.get_current_tab_name())
+
+    def on_tab_changed(self, event):
+        """Build the newly selected tab if it hasn't been shown before"""
+        self.build_tab(self.get_current_tab_name())
+
+    def build_tab(self, tab_name):
+        """Create a tab's entries, buttons and result label (only once)"""
+        if tab_name in self.entries:
+            return
+        start = time.perf_counter()
+
+        config = self.tab_configs[tab_name]
+        tab_frame = self.tabs[tab_name]
+        self.entries[tab_name] = {}
+        self.entry_vars[tab_name] = {}
+        self.field_values[tab_name] = [calculators.EMPTY_MESSAGE.format(field=field_name)
+                                       for field_name in config["fields"]]
+
+        input_frame = Frame(tab_frame)
+        input_frame.pack(expand=True, pady=20)
+
+        for i, field_name in enumerate(config["fields"]):
+            Label(input_frame, text=field_name, font=("Arial", 10)).grid(row=i, column=0, sticky="w", padx=5, pady=5)
+            entry_var = StringVar()
+            entry = Entry(input_frame, width=20, font=("Arial", 10), textvariable=entry_var)
+            entry.grid(row=i, column=1, padx=5, pady=5)
+            self.entries[tab_name][field_name] = entry
+            self.entry_vars[tab_name][field_name] = entry_var
+            entry_var.trace_add("write", partial(self.on_entry_changed, tab_name, i))
+
+        calc_button = Button(input_frame,
+                             text=config["button_text"],
+                             bg="#990099", fg="white",
+                             font=("Arial", 12, "bold"),
+                             command=config["command"],
+                             width=20)
+        calc_button.grid(row=len(config["fields"]), column=0, columnspan=2, pady=20)
+
+        result_frame = Frame(input_frame, height=80)
+        result_frame.grid(row=len(config["fields"]) + 1, column=0, columnspan=2, pady=10,
+                          sticky="ew")
+        result_frame.grid_propagate(False)
+
+        # Configure the grid to center the content
+        result_frame.grid_rowconfigure(0, weight=1)
+        result_frame.grid_columnconfigure(0, weight=1)
+
+        self.result_labels[tab_name] = Label(result_frame,
+                                             text="",
+                                             font=("Arial", 8, "bold"),
+                                             fg="#0066CC",
+                                             wraplength=300)
+        self.result_labels[tab_name].grid(row=0, column=0)
+
+        if "extra_button" in config:
+            extra_text, extra_command = config["extra_button"]
+            self.extra_buttons[tab_name] = Button(input_frame,
+                                                  text=extra_text,
+                                                  bg="#006666", fg="white",
+                                                  font=("Arial", 10, "bold"),
+                                                  command=extra_command,
+                                                  width=20)
+            self.extra_buttons[tab_name].grid(row=len(config["fields"]) + 2, column=0, columnspan=2,
+                                              pady=(0, 10))
+
+        self.tab_build_times[tab_name] = time.perf_counter() - start
 
     def create_buttons(self):
         """Create main action buttons"""
@@ -147,229 +175,135 @@ class PersonalFinanceCalculator:
             button.grid(row=item[3], column=item[4], padx=10, pady=5)
             self.button_ref_list.append(button)
 
-    def add_to_history(self, calculation_string):
-        """Add a calculation to the history"""
-        today = date.today().strftime("%d/%m/%Y")
-        history_entry = f"[{today}] {calculation_string}"
-        self.calculation_history.append(history_entry)
+    def add_to_history(self, kind, values):
+        """Add a calculation to the history (formatted only when shown or exported)"""
+        self.calculation_history.add(kind, values)
 
     def get_current_tab_name(self):
         """Get the name of currently selected tab"""
         current_tab = self.notebook.index(self.notebook.select())
         return self.notebook.tab(current_tab, option="text")
 
-    def validate_inputs(self, tab_name, required_fields, field_types=None):
-        """Validate input fields for calculations with user-friendly error messages"""
-        values = []
-
-        for i, field in enumerate(required_fields):
-            field_value = self.entries[tab_name][field].get().strip()
-
-            # Check if field is empty
-            if not field_value:
-                error_msg = f"❌ Please enter a value for {field}"
-                self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
-                return None
-
-            try:
-                # Convert to float for validation
-                value = float(field_value)
-
-                # Check for negative values
-                if value < 0:
-                    error_msg = f"❌ {field} cannot be negative. Please enter a positive number."
-                    self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
-                    return None
-
-                # Validate percentage fields
-                if "%" in field:
-                    if value > 100:
-                        error_msg = f"❌ {field} seems too high ({value}%). Please check your percentage."
-                        self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
-                        return None
-                    # Check for unusually high interest rates
-                    if "Interest Rate" in field and value > 50:
-                        error_msg = f"❌ Interest rate of {value}% seems unusually high. Please verify."
-                        self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
-                        return None
-
-                # Validate age fields
-                if "Age" in field:
-                    if value < 16 or value > 120:
-                        error_msg = f"❌ {field} of {int(value)} seems unrealistic. Please enter a valid age."
-                        self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
-                        return None
-
-                # Validate term/period fields
-                if "Term" in field or "Period" in field:
-                    if value > 50:
-                        error_msg = f"❌ {field} of {int(value)} years seems too long. Please check your input."
-                        self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
-                        return None
-
-                values.append(value)
-
-            except ValueError:
-                # Handle non-numeric input
-                error_msg = f"❌ Please enter numbers only for {field}. Remove any letters or symbols."
-                self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
-                return None
-
-        return values
+    def on_entry_changed(self, tab_name, index, *args):
+        """Check just the edited field against its schema, then schedule a live update"""
+        field = calculators.field_schema(tab_name)[index]
+        try:
+            value = calculators.parse_field(field, self.entry_vars[tab_name][field["label"]].get())
+        except ValueError as e:
+            value = str(e)
+        self.field_values[tab_name][index] = value
+        self.schedule_live_update(tab_name)
+
+    def checked_values(self, tab_name):
+        """Get a tab's values from the per-field checks and check its cross-field rules (raises ValueError)"""
+        values = self.field_values[tab_name]
+        for value in values:
+            if isinstance(value, str):
+                raise ValueError(value)
+
+        error_msg = calculators.check_rules(tab_name, values)
+        if error_msg:
+            raise ValueError(error_msg)
+        return list(values)
+
+    def validate_inputs(self, tab_name):
+        """Validate a tab's input fields, showing a user-friendly message for the first problem"""
+        try:
+            return self.checked_values(tab_name)
+        except ValueError as e:
+            self.result_labels[tab_name].config(text=str(e), fg="#CC0000")
+            return None
+
+    def run_calculation(self, tab_name, function, args, show_result, details_name):
+        """Run a calculation on the worker pool; the tab's result label shows the latest result"""
+        self.result_labels[tab_name].config(text="⏳ Calculating...", fg="#666666")
+        self.worker.submit(tab_name, function, args, show_result,
+                           partial(self.show_calculation_error, tab_name, details_name))
+
+    def show_calculation_error(self, tab_name, details_name, error):
+        """Handle calculation errors"""
+        error_msg = f"❌ Calculation error: Unable to process your {details_name} details. Please check your inputs."
+        self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
+        self.resume_live_update(tab_name)
+
+    def set_busy(self, busy):
+        """Show a busy cursor while calculations are running"""
+        self.root.config(cursor="watch" if busy else "")
+
+    def calculate(self, tab_name):
+        """Validate a tab's inputs and run its calculation using NZ-specific calculations"""
+        values = self.validate_inputs(tab_name)
+
+        if values is not None:
+            definition = calculators.CALCULATORS[calculators.TITLES[tab_name]]
+            self.run_calculation(tab_name, definition["function"], values,
+                                 partial(self.show_result, tab_name, values), definition["details_name"])
+
+    def show_result(self, tab_name, values, details):
+        """Display a finished calculation and add it to the history"""
+        self.result_labels[tab_name].config(text=calculators.result_text(tab_name, values, details), fg="#0066CC")
+        self.add_to_history(*calculators.history_values(tab_name, values, details))
+        self.live_values[tab_name] = values
+        self.resume_live_update(tab_name)
+
+    def schedule_live_update(self, tab_name, *args):
+        """Recalculate a tab once typing pauses (every edit restarts the wait)"""
+        job = self.live_jobs.pop(tab_name, None)
+        if job is not None:
+            self.root.after_cancel(job)
+        self.live_jobs[tab_name] = self.root.after(c.LIVE_UPDATE_DELAY_MS, partial(self.live_update, tab_name))
+
+    def live_update(self, tab_name):
+        """Recalculate a tab's result from its current inputs if they are valid and have changed"""
+        self.live_jobs.pop(tab_name, None)
+        if self.worker.is_busy(tab_name):
+            # One calculation per tab at a time; this runs again once the current result is shown
+            self.live_waiting.add(tab_name)
+            return
+        self.live_waiting.discard(tab_name)
+
+        try:
+            values = self.checked_values(tab_name)
+        except ValueError:
+            # Half-typed input: grey out the old result rather than showing an error mid-edit
+            self.result_labels[tab_name].config(fg="#999999")
+            self.live_values.pop(tab_name, None)
+            return
+
+        if values == self.live_values.get(tab_name):
+            return
+        self.live_values[tab_name] = values
+
+        definition = calculators.CALCULATORS[calculators.TITLES[tab_name]]
+        self.worker.submit(tab_name, definition["function"], values,
+                           partial(self.show_live_result, tab_name, values),
+                           partial(self.show_calculation_error, tab_name, definition["details_name"]))
+
+    def show_live_result(self, tab_name, values, details):
+        """Display a live result (only Calculate adds to the history)"""
+        self.result_labels[tab_name].config(text=calculators.result_text(tab_name, values, details), fg="#0066CC")
+        self.resume_live_update(tab_name)
+
+    def resume_live_update(self, tab_name):
+        """Recalculate inputs edited while the tab's last calculation (live or Calculate) was running"""
+        if tab_name in self.live_waiting and tab_name not in self.live_jobs:
+            # Let Tk draw the finished result before calculating the newer inputs
+            self.live_jobs[tab_name] = self.root.after(c.LIVE_FRAME_MS, partial(self.live_update, tab_name))
+
+    def close_calculator(self):
+        """
+        Stop the calculation workers, close the history journal and spill file and close the window
 
-    def calculate_loan(self):
-        """Calculate loan payment using NZ-specific calculations"""
-        tab_name = "Loan Calculator"
-        fields = ["Loan Amount (NZD)", "Annual Interest Rate (%)", "Loan Term (Years)"]
-        values = self.validate_inputs(tab_name, fields)
-
-        if values:
-            principal, annual_rate, years = values
-
-            try:
-                # Calculate loan payment details
-                monthly_payment, total_interest, total_amount = calc.calculate_loan_payment(
-                    principal, annual_rate, years
-                )
-
-                # Format results for display
-                result_text = (f"Monthly Payment: {calc.format_nz_currency(monthly_payment)}\n"
-                               f"Total Interest: {calc.format_nz_currency(total_interest)}\n"
-                               f"Total Amount: {calc.format_nz_currency(total_amount)}")
-
-                self.result_labels[tab_name].config(text=result_text, fg="#0066CC")
-
-                # Add calculation to history
-                history_entry = f"Loan: Amount: {calc.format_nz_currency(principal)}, Rate: {annual_rate}%, Term: {int(years)} years → Monthly: {calc.format_nz_currency(monthly_payment)}"
-                self.add_to_history(history_entry)
-
-            except Exception as e:
-                # Handle calculation errors
-                error_msg = f"❌ Calculation error: Unable to process your loan details. Please check your inputs."
-                self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
-
-    def calculate_mortgage(self):
-        """Calculate mortgage payment using NZ-specific calculations"""
-        tab_name = "Mortgage Calculator"
-        fields = ["Home Price (NZD)", "Down Payment (NZD)", "Annual Interest Rate (%)", "Mortgage Term (Years)"]
-        values = self.validate_inputs(tab_name, fields)
-
-        if values:
-            home_price, down_payment, annual_rate, years = values
-
-            # Validate down payment amount
-            if down_payment >= home_price:
-                error_msg = "❌ Down payment cannot be equal to or greater than the home price."
-                self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
-                return
-
-            try:
-                # Calculate mortgage details
-                mortgage_details = calc.calculate_nz_mortgage_payment(
-                    home_price, down_payment, annual_rate, years
-                )
-
-                # Check if LMI is required
-                lvr_warning = " (LMI Required)" if mortgage_details['requires_lmi'] else ""
-
-                # Format results for display
-                result_text = (f"Monthly Payment: {calc.format_nz_currency(mortgage_details['monthly_payment'])}\n"
-                               f"+ Insurance: {calc.format_nz_currency(mortgage_details['insurance_monthly'])}\n"
-                               f"Total Monthly: {calc.format_nz_currency(mortgage_details['total_monthly_payment'])}\n"
-                               f"LVR: {mortgage_details['lvr']:.1f}%{lvr_warning}\n"
-                               f"Total Interest: {calc.format_nz_currency(mortgage_details['total_interest'])}")
-
-                self.result_labels[tab_name].config(text=result_text, fg="#0066CC")
-
-                # Add calculation to history
-                history_entry = f"Mortgage: Home: {calc.format_nz_currency(home_price)}, Down: {calc.format_nz_currency(down_payment)}, Rate: {annual_rate}% → Monthly: {calc.format_nz_currency(mortgage_details['total_monthly_payment'])}, LVR: {mortgage_details['lvr']:.1f}%"
-                self.add_to_history(history_entry)
-
-            except Exception as e:
-                # Handle calculation errors
-                error_msg = f"❌ Calculation error: Unable to process your mortgage details. Please check your inputs."
-                self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
-
-    def calculate_investment(self):
-        """Calculate investment growth using NZ-specific calculations with tax considerations"""
-        tab_name = "Investment Projector"
-        fields = ["Initial Investment (NZD)", "Annual Contribution (NZD)", "Annual Return Rate (%)",
-                  "Investment Period (Years)"]
-        values = self.validate_inputs(tab_name, fields)
-
-        if values:
-            initial_investment, annual_contribution, annual_return_rate, years = values
-
-            try:
-                investment_details = calc.calculate_investment_growth_nz(
-                    initial_investment, annual_contribution, annual_return_rate, years, include_tax=True
-                )
-
-                result_text = (f"Final Value: {calc.format_nz_currency(investment_details['final_value'])}\n"
-                               f"Total Contributions: {calc.format_nz_currency(investment_details['total_contributions'])}\n"
-                               f"Growth (After PIE Tax): {calc.format_nz_currency(investment_details['total_growth'])}\n"
-                               f"Effective Return: {investment_details['effective_annual_return']:.2f}%\n"
-                               f"Est. Tax Paid: {calc.format_nz_currency(investment_details['tax_paid_estimate'])}")
-
-                self.result_labels[tab_name].config(text=result_text, fg="#0066CC")
-
-                history_entry = f"Investment: Initial: {calc.format_nz_currency(initial_investment)}, Annual: {calc.format_nz_currency(annual_contribution)}, Return: {annual_return_rate}%, Period: {int(years)} years → Final: {calc.format_nz_currency(investment_details['final_value'])}"
-                self.add_to_history(history_entry)
-
-            except Exception as e:
-                error_msg = f"❌ Calculation error: Unable to process your investment details. Please check your inputs."
-                self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
-
-    def calculate_retirement(self):
-        """Calculate KiwiSaver retirement projection"""
-        tab_name = "Retirement Planner"
-        fields = ["Current Age", "Retirement Age", "Current KiwiSaver Balance (NZD)", "Annual Salary (NZD)",
-                  "Employee Contribution Rate (%)", "Expected Annual Return (%)"]
-        values = self.validate_inputs(tab_name, fields)
-
-        if values:
-            current_age, retirement_age, current_balance, annual_salary, employee_rate, expected_return = values
-
-            # Validate retirement age is greater than current age
-            if retirement_age <= current_age:
-                error_msg = f"❌ Retirement age ({int(retirement_age)}) must be greater than current age ({int(current_age)})."
-                self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
-                return
-
-            # Check for early retirement warning
-            warning_text = ""
-            if retirement_age < 65:
-                warning_text = "\n⚠️ Note: NZ Super is available from age 65"
-
-            try:
-                # Calculate retirement projections
-                retirement_details = calc.calculate_kiwisaver_retirement(
-                    current_age, retirement_age, current_balance, annual_salary,
-                    employee_rate, expected_return, salary_growth=2
-                )
-
-                # Calculate total annual retirement income
-                total_annual_income = retirement_details['annual_nz_super'] + retirement_details[
-                    'sustainable_annual_withdrawal']
-
-                # Format results for display
-                result_text = (
-                    f"KiwiSaver at Retirement: {calc.format_nz_currency(retirement_details['projected_balance'])}\n"
-                    f"Annual NZ Super: {calc.format_nz_currency(retirement_details['annual_nz_super'])}\n"
-                    f"Sustainable Withdrawal: {calc.format_nz_currency(retirement_details['sustainable_annual_withdrawal'])}\n"
-                    f"Total Annual Income: {calc.format_nz_currency(total_annual_income)}\n"
-                    f"Years to Retirement: {retirement_details['years_to_retirement']}{warning_text}")
-
-                self.result_labels[tab_name].config(text=result_text, fg="#0066CC")
-
-                # Add calculation to history
-                history_entry = f"Retirement: Age: {int(current_age)}→{int(retirement_age)}, Balance: {calc.format_nz_currency(current_balance)}, Salary: {calc.format_nz_currency(annual_salary)} → Retirement Balance: {calc.format_nz_currency(retirement_details['projected_balance'])}"
-                self.add_to_history(history_entry)
-
-            except Exception as e:
-                # Handle calculation errors
-                error_msg = f"❌ Calculation error: Unable to process your retirement details. Please check your inputs."
-                self.result_labels[tab_name].config(text=error_msg, fg="#CC0000")
+        Journal segments from earlier days are merged into the journal archive on the way out.
+        """
+        self.worker.shutdown()
+        self.journal.close()
+        try:
+            self.journal.compact()
+        except OSError:
+            pass  # The segments are left as they are and merged next time
+        self.calculation_history.close()
+        self.root.destroy()
 
     def to_help(self):
         """Open help dialogue box"""
@@ -390,7 +324,8 @@ class PersonalFinanceCalculator:
                 "• Enter your down payment amount (NZD)\n"
                 "• Enter the annual interest rate (in %)\n"
                 "• Enter the mortgage term in years\n"
-                "• Click 'Calculate Mortgage' to see detailed breakdown\n\n"
+                "• Click 'Calculate Mortgage' to see detailed breakdown\n"
+                "• Click 'Rate × Term Grid' to compare monthly payments across rates and terms\n\n"
                 "Results include LVR calculation, insurance estimates, and LMI requirements for NZ mortgages."
             ),
             "Investment Projector": (
@@ -418,6 +353,10 @@ class PersonalFinanceCalculator:
         selected_help_text = help_texts.get(tab_name, "No help available for this tab.")
         DisplayHelp(self, selected_help_text)
 
+    def to_mortgage_grid(self):
+        """Open the mortgage rate × term payment grid"""
+        MortgageGridView(self)
+
     def to_history(self):
         """Handle history/export functionality"""
         if not self.calculation_history:
@@ -475,6 +414,149 @@ class DisplayHelp:
         self.help_box.destroy()
 
 
+class MortgageGridView:
+    """
+    Heatmap of total monthly mortgage payments across interest rates and terms
+
+    The whole grid is computed in one broadcast pass and redrawn in place whenever the
+    home price or down payment on the Mortgage tab changes.
+    """
+
+    cell_width = 95
+    cell_height = 20
+    label_width = 60
+
+    def __init__(self, partner):
+        import calculation_batch  # NumPy is only loaded once the grid is opened
+        self.calculation_batch = calculation_batch
+
+        self.partner = partner
+        self.tab_name = "Mortgage Calculator"
+        self.rates = [round(c.GRID_MIN_RATE + i * c.GRID_RATE_STEP, 2)
+                      for i in range(int(round((c.GRID_MAX_RATE - c.GRID_MIN_RATE) / c.GRID_RATE_STEP)) + 1)]
+        self.terms = c.GRID_TERMS
+        self.refresh_pending = False
+
+        self.grid_box = Toplevel()
+        self.grid_box.protocol('WM_DELETE_WINDOW', self.close_grid)
+        self.grid_box.title("Mortgage Rate × Term Grid")
+
+        partner.extra_buttons[self.tab_name].config(state=DISABLED)
+
+        self.grid_frame = Frame(self.grid_box)
+        self.grid_frame.pack(expand=True, fill="both", padx=10, pady=10)
+
+        Label(self.grid_frame, text="Total Monthly Payment by Rate and Term",
+              font=("Arial", 14, "bold")).grid(row=0, column=0, columnspan=2, pady=(0, 5))
+
+        self.grid_message = Label(self.grid_frame, text="", font=("Arial", 10), wraplength=500)
+        self.grid_message.grid(row=1, column=0, columnspan=2, pady=(0, 5))
+
+        canvas_width = self.label_width + self.cell_width * len(self.terms)
+        self.canvas = Canvas(self.grid_frame, width=canvas_width, height=self.cell_height * 20,
+                             highlightthickness=0)
+        scrollbar = Scrollbar(self.grid_frame, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=scrollbar.set,
+                              scrollregion=(0, 0, canvas_width, self.cell_height * (len(self.rates) + 1)))
+        self.canvas.grid(row=2, column=0, sticky="nsew")
+        scrollbar.grid(row=2, column=1, sticky="ns")
+        self.grid_frame.grid_rowconfigure(2, weight=1)
+
+        self.create_cells()
+
+        Button(self.grid_frame, font=("Arial", 12, "bold"), text="Close", bg="#666666", fg="#FFFFFF",
+               width=12, command=self.close_grid).grid(row=3, column=0, columnspan=2, pady=10)
+
+        # Redraw whenever the home price or down payment changes
+        self.traces = []
+        for field in ["Home Price (NZD)", "Down Payment (NZD)"]:
+            entry_var = partner.entry_vars[self.tab_name][field]
+            self.traces.append((entry_var, entry_var.trace_add("write", self.schedule_refresh)))
+
+        self.refresh()
+
+    def create_cells(self):
+        """Create the heatmap cells once; refresh() only changes their colour and text"""
+        self.cells = []
+        for column, term in enumerate(self.terms):
+            x = self.label_width + column * self.cell_width
+            self.canvas.create_text(x + self.cell_width / 2, self.cell_height / 2, text=f"{term} years",
+                                    font=("Arial", 9, "bold"))
+
+        for row, rate in enumerate(self.rates):
+            y = (row + 1) * self.cell_height
+            self.canvas.create_text(self.label_width / 2, y + self.cell_height / 2, text=f"{rate:.2f}%",
+                                    font=("Arial", 9, "bold"))
+            row_cells = []
+            for column in range(len(self.terms)):
+                x = self.label_width + column * self.cell_width
+                rectangle = self.canvas.create_rectangle(x, y, x + self.cell_width, y + self.cell_height,
+                                                         fill="#EEEEEE", outline="#FFFFFF")
+                text = self.canvas.create_text(x + self.cell_width / 2, y + self.cell_height / 2, text="",
+                                               font=("Arial", 8))
+                row_cells.append((rectangle, text))
+            self.cells.append(row_cells)
+
+    def schedule_refresh(self, *args):
+        """Coalesce bursts of edits into one redraw"""
+        if not self.refresh_pending:
+            self.refresh_pending = True
+            self.grid_box.after_idle(self.refresh)
+
+    def grid_inputs(self):
+        """Home price and down payment from the Mortgage tab, checked as the tab checks them (raises ValueError)"""
+        entry_vars = self.partner.entry_vars[self.tab_name]
+        values = [calculators.parse_field(field, entry_vars[field["label"]].get())
+                  for field in calculators.field_schema(self.tab_name)[:2]]
+
+        error_msg = calculators.check_rules(self.tab_name, values)
+        if error_msg:
+            raise ValueError(error_msg)
+        return values
+
+    def refresh(self):
+        """Recalculate the grid from the current home price and down payment"""
+        self.refresh_pending = False
+        try:
+            home_price, down_payment = self.grid_inputs()
+        except ValueError as e:
+            self.grid_message.config(text=str(e), fg="#CC0000")
+            for row_cells in self.cells:
+                for rectangle, text in row_cells:
+                    self.canvas.itemconfig(rectangle, fill="#EEEEEE")
+                    self.canvas.itemconfig(text, text="")
+            return
+
+        payments = self.calculation_batch.mortgage_payment_grid(home_price, down_payment, self.rates, self.terms)
+        lowest, highest = payments.min(), payments.max()
+        spread = highest - lowest or 1
+
+        self.grid_message.config(text=f"Loan: {calc.format_nz_currency(home_price - down_payment)} "
+                                      f"(includes insurance estimate)", fg="#0066CC")
+        for row_cells, row_payments in zip(self.cells, payments.tolist()):
+            for (rectangle, text), payment in zip(row_cells, row_payments):
+                self.canvas.itemconfig(rectangle, fill=heatmap_colour((payment - lowest) / spread))
+                self.canvas.itemconfig(text, text=f"${payment:,.0f}")
+
+    def close_grid(self):
+        """Close the grid, stop watching the entries and re-enable the grid button"""
+        for entry_var, trace_id in self.traces:
+            entry_var.trace_remove("write", trace_id)
+        self.partner.extra_buttons[self.tab_name].config(state=NORMAL)
+        self.grid_box.destroy()
+
+
+def heatmap_colour(position):
+    """Green (0) to yellow (0.5) to red (1) colour for a position in a heatmap"""
+    low, middle, high = (99, 190, 123), (255, 235, 132), (248, 105, 107)
+    if position < 0.5:
+        start, end, fraction = low, middle, position * 2
+    else:
+        start, end, fraction = middle, high, (position - 0.5) * 2
+    red, green, blue = (round(a + (b - a) * fraction) for a, b in zip(start, end))
+    return f"#{red:02X}{green:02X}{blue:02X}"
+
+
 class HistoryExport:
     """
     Displays history dialog box and export button for finance calculations
@@ -491,47 +573,59 @@ class HistoryExport:
         self.history_frame = Frame(self.history_box)
         self.history_frame.grid()
 
-        # Determine background color based on number of calculations
-        calc_back = "#D5E8D4" if len(calculations) <= c.MAX_FINANCE_CALCS else "#ffe6cc"
-        calc_amount = "all your" if len(
-            calculations) <= c.MAX_FINANCE_CALCS else f"your recent calculations - showing {c.MAX_FINANCE_CALCS} / {len(calculations)}"
-
-        recent_intro_txt = f"Below are {calc_amount} financial calculations"
-
-        # Show most recent calculations first
-        newest_first_list = list(reversed(calculations))
-        newest_first_string = "\n".join(newest_first_list[:c.MAX_FINANCE_CALCS])
+        recent_intro_txt = ("Below are all your financial calculations, newest first. "
+                            "Click a heading to sort, or type in the search box to find a calculation.")
 
         export_instruction_txt = (
-            "Please push <Export> to save your calculations in a file. "
-            "If the filename already exists, it will be overwritten."
+            "Please choose a format and folder, then push <Export> to save your calculations. "
+            "Text exports add new calculations to today's file; other formats save the whole history."
         )
 
-        # Create all labels for the dialog
+        # Create all labels for the dialog (row 2 is the history list)
         history_labels_list = [
-            ["Finance History / Export", ("Arial", 16, "bold"), None],
-            [recent_intro_txt, ("Arial", 11), None],
-            [newest_first_string, ("Arial", 11), calc_back],
-            [export_instruction_txt, ("Arial", 11), None],
+            ["Finance History / Export", ("Arial", 16, "bold"), 0],
+            [recent_intro_txt, ("Arial", 11), 1],
+            [export_instruction_txt, ("Arial", 11), 3],
         ]
 
         history_labels_ref = []
-        for count, item in enumerate(history_labels_list):
+        for item in history_labels_list:
             make_label = Label(
                 self.history_frame, text=item[0], font=item[1],
-                bg=item[2], wraplength=400, justify="left", padx=15, pady=8
+                wraplength=600, justify="left", padx=15, pady=8
             )
-            make_label.grid(row=count, padx=10, pady=5)
+            make_label.grid(row=item[2], padx=10, pady=5)
             history_labels_ref.append(make_label)
 
-        self.export_filename_label = history_labels_ref[3]
+        self.export_filename_label = history_labels_ref[2]
+
+        # Only the rows on screen are formatted, so long histories scroll smoothly
+        self.history_view = HistoryView(self.history_frame, calculations)
+        self.history_view.frame.grid(row=2, padx=10, pady=5)
+
+        # Export format and folder
+        self.export_options_frame = Frame(self.history_box)
+        self.export_options_frame.grid(row=4, padx=10)
+
+        Label(self.export_options_frame, text="Format:", font=("Arial", 11)).grid(row=0, column=0, sticky="w")
+        self.format_var = StringVar(value=partner.export_choice)
+        self.format_combo = ttk.Combobox(self.export_options_frame, textvariable=self.format_var,
+                                         values=list(c.EXPORT_CHOICES), state="readonly", width=26)
+        self.format_combo.grid(row=0, column=1, padx=5, pady=3, sticky="w")
+
+        Label(self.export_options_frame, text="Folder:", font=("Arial", 11)).grid(row=1, column=0, sticky="w")
+        self.folder_label = Label(self.export_options_frame, text=os.path.abspath(partner.export_directory),
+                                  font=("Arial", 10), wraplength=260, justify="left")
+        self.folder_label.grid(row=1, column=1, padx=5, pady=3, sticky="w")
+        Button(self.export_options_frame, text="Change...", font=("Arial", 10),
+               command=partial(self.choose_folder, partner)).grid(row=1, column=2, padx=5)
 
         # Create button frame
         self.history_button_frame = Frame(self.history_box)
-        self.history_button_frame.grid(row=4)
+        self.history_button_frame.grid(row=5)
 
         button_details_list = [
-            ["Export", "#004C99", lambda: self.export_data(calculations), 0, 0],
+            ["Export", "#004C99", partial(self.export_data, partner), 0, 0],
             ["Close", "#666666", partial(self.close_history, partner), 0, 1]
         ]
 
@@ -544,36 +638,56 @@ class HistoryExport:
             )
             make_button.grid(row=btn[3], column=btn[4], padx=20, pady=10)
 
-    def export_data(self, calculations):
-        """Export calculation data to a text file"""
-        today = date.today()
-
-        # Extract date components for filename
-        day = today.strftime("%d")
-        month = today.strftime("%m")
-        year = today.strftime("%Y")
-
-        file_name = f"finance_{year}_{month}_{day}"
+    def choose_folder(self, partner):
+        """Ask for the folder exports are saved in"""
+        directory = filedialog.askdirectory(parent=self.history_box, initialdir=partner.export_directory,
+                                            title="Choose export folder")
+        if not directory or os.path.abspath(directory) == os.path.abspath(partner.export_directory):
+            return
+
+        partner.export_directory = directory
+        # The new folder's journal starts empty, so the next text export writes everything
+        partner.journal.close()
+        partner.journal.directory = directory
+        partner.exported_count = 0
+        self.folder_label.config(text=os.path.abspath(directory))
+
+    def export_data(self, partner):
+        """Save the calculations in the chosen format and folder"""
+        calculations = partner.calculation_history
+        partner.export_choice = self.format_var.get()
+        export_format, compression = c.EXPORT_CHOICES[partner.export_choice]
+
+        try:
+            if export_format == "text" and compression is None:
+                # Each calculation is written once; earlier exports (and sessions) stay in the file
+                new_count = 0
+                for record in calculations.records_from(partner.exported_count):
+                    partner.journal.append(record)
+                    new_count += 1
+                partner.journal.sync()
+                partner.exported_count = calculations.added
+                file_name = os.path.basename(partner.journal.path) if partner.journal.path else "today's file"
+            else:
+                # Records are streamed from the history (including any spilled to disk)
+                import export_writers  # Only loaded when exporting, to keep startup quick
+                path, new_count = export_writers.export_records(iter(calculations), partner.export_directory,
+                                                                export_format=export_format,
+                                                                compression=compression)
+                file_name = os.path.basename(path)
+        except (OSError, ValueError) as e:
+            self.export_filename_label.config(fg="#CC0000", text=f"Export failed: {e}",
+                                              font=("Arial", "12", "bold"))
+            return
 
         # Display success message
-        success_string = ("Export successful. The file is called" 
-                          f" {file_name}.txt")
+        if new_count or export_format != "text":
+            success_string = f"Export successful. {new_count} calculation(s) saved to {file_name}"
+        else:
+            success_string = f"Already up to date. Your calculations are saved in {file_name}"
         self.export_filename_label.config(fg="#009900", text=success_string,
                                           font=("Arial", "12", "bold"))
 
-        write_to = f"{file_name}.txt"
-
-        # Write calculations to file
-        with open(write_to, "w", encoding='utf-8') as text_file:
-            text_file.write("***** Personal Finance Calculations *****\n")
-            text_file.write(f"Generated: {day}/{month}/{year}\n\n")
-            text_file.write("Here is your calculation history (oldest to newest)...\n\n")
-
-            # Write each calculation entry
-            for item in calculations:
-                text_file.write(item)
-                text_file.write("\n")
-
     def close_history(self, partner):
         """Close history dialog and re-enable history button"""
         partner.button_ref_list[1].config(state=NORMAL)
@@ -0,0 +1,180 @@
+"""
+Monte Carlo Retirement Module - New Zealand Edition
+Simulates KiwiSaver balances under stochastic annual returns
+Gives percentile outcomes and the chance of reaching a target instead of one fixed-return answer
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from calculation_finance import MAX_YEARS_TO_RETIREMENT, calculate_kiwisaver_contributions
+
+RETURN_DISTRIBUTIONS = ("normal", "lognormal")
+DEFAULT_PERCENTILES = (10, 50, 90)
+DEFAULT_CHUNK_SIZE = 25000  # Paths simulated per chunk (keeps the returns array around 10 MB)
+
+
+def contribution_schedule(annual_salary, years, employee_rate=3, salary_growth=2):
+    """
+    Calculate the total KiwiSaver contribution paid in each year to retirement
+
+    Args:
+        annual_salary: Current annual salary
+        years: Number of years to retirement
+        employee_rate: Employee contribution rate (3, 4, 6, 8, or 10)
+        salary_growth: Annual salary growth percentage
+
+    Returns:
+        ndarray: One total annual contribution per year
+    """
+    contributions = np.empty(years)
+    current_salary = float(annual_salary)
+
+    for year in range(years):
+        contributions[year] = calculate_kiwisaver_contributions(
+            current_salary, employee_rate / 100)['total_annual_contribution']
+        current_salary *= (1 + salary_growth / 100)
+
+    return contributions
+
+
+def simulate_returns(rng, n_paths, years, expected_return, volatility, distribution="normal"):
+    """
+    Draw gross annual return multipliers for every path and year in one array
+
+    Both distributions have mean return expected_return and standard deviation volatility.
+    Normal returns are floored at -100% so a balance can't go negative.
+
+    Args:
+        rng: numpy Generator
+        n_paths: Number of simulated paths
+        years: Number of years per path
+        expected_return: Mean annual return percentage
+        volatility: Standard deviation of annual return percentage
+        distribution: "normal" or "lognormal"
+
+    Returns:
+        ndarray: (n_paths, years) array of (1 + return) multipliers
+    """
+    mean = expected_return / 100
+    std = volatility / 100
+
+    if distribution == "normal":
+        multipliers = rng.standard_normal((n_paths, years))
+        multipliers *= std
+        multipliers += 1 + mean
+        np.maximum(multipliers, 0, out=multipliers)
+    elif distribution == "lognormal":
+        if mean <= -1:
+            raise ValueError("Lognormal returns need an expected return above -100%")
+        sigma_squared = np.log1p((std / (1 + mean)) ** 2)
+        multipliers = rng.standard_normal((n_paths, years))
+        multipliers *= np.sqrt(sigma_squared)
+        multipliers += np.log1p(mean) - sigma_squared / 2
+        np.exp(multipliers, out=multipliers)
+    else:
+        raise ValueError(f"Return distribution must be one of {', '.join(RETURN_DISTRIBUTIONS)}")
+
+    return multipliers
+
+
+def _simulate_chunk(seed_sequence, n_paths, current_balance, contributions, expected_return, volatility,
+                    distribution):
+    """
+    Simulate final balances for one chunk of paths (runs in a worker process when pooled)
+
+    Args:
+        seed_sequence: numpy SeedSequence for this chunk
+        n_paths: Number of paths in this chunk
+        current_balance: Starting KiwiSaver balance
+        contributions: Contribution paid at the end of each year
+        expected_return: Mean annual return percentage
+        volatility: Standard deviation of annual return percentage
+        distribution: "normal" or "lognormal"
+
+    Returns:
+        ndarray: Final balance of each path
+    """
+    rng = np.random.default_rng(seed_sequence)
+    multipliers = simulate_returns(rng, n_paths, len(contributions), expected_return, volatility,
+                                   distribution)
+
+    balances = np.full(n_paths, float(current_balance))
+    for year, contribution in enumerate(contributions):
+        balances *= multipliers[:, year]
+        balances += contribution
+
+    return balances
+
+
+def simulate_kiwisaver_retirement(current_age, retirement_age, current_balance, annual_salary,
+                                  employee_rate=3, expected_return=5, volatility=15, salary_growth=2,
+                                  n_paths=10000, distribution="normal", target_balance=None, seed=None,
+                                  percentiles=DEFAULT_PERCENTILES, chunk_size=DEFAULT_CHUNK_SIZE,
+                                  workers=1):
+    """
+    Monte Carlo KiwiSaver retirement projection
+
+    Paths are split into chunks seeded from one SeedSequence, so the result for a given seed
+    is the same whether the chunks run in this process or across a process pool.
+
+    Args:
+        current_age: Current age
+        retirement_age: Planned retirement age
+        current_balance: Current KiwiSaver balance
+        annual_salary: Current annual salary
+        employee_rate: Employee contribution rate (3, 4, 6, 8, or 10)
+        expected_return: Mean annual return percentage
+        volatility: Standard deviation of annual return percentage
+        salary_growth: Annual salary growth percentage
+        n_paths: Number of simulated return paths
+        distribution: "normal" or "lognormal"
+        target_balance: Balance to beat (optional)
+        seed: Seed for reproducible results (optional)
+        percentiles: Percentiles of the final balance to report
+        chunk_size: Paths simulated per chunk
+        workers: Number of worker processes (1 runs everything in this process)
+
+    Returns:
+        dict: Percentile balances, mean balance and probability of beating the target
+    """
+    years_to_retirement = int(float(retirement_age) - float(current_age))
+
+    if years_to_retirement <= 0:
+        raise ValueError("Retirement age must be greater than current age")
+    if years_to_retirement > MAX_YEARS_TO_RETIREMENT:
+        raise ValueError("Years to retirement exceeds reasonable limit")
+    if current_balance < 0 or annual_salary < 0:
+        raise ValueError("Negative values not allowed")
+    if volatility < 0:
+        raise ValueError("Volatility cannot be negative")
+    if n_paths < 1:
+        raise ValueError("Number of paths must be at least 1")
+    if distribution not in RETURN_DISTRIBUTIONS:
+        raise ValueError(f"Return distribution must be one of {', '.join(RETURN_DISTRIBUTIONS)}")
+
+    contributions = contribution_schedule(annual_salary, years_to_retirement, employee_rate, salary_growth)
+
+    chunk_sizes = [min(chunk_size, n_paths - start) for start in range(0, n_paths, chunk_size)]
+    chunk_seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    chunk_args = [(chunk_seed, size, current_balance, contributions, expected_return, volatility,
+                   distribution) for chunk_seed, size in zip(chunk_seeds, chunk_sizes)]
+
+    if workers > 1 and len(chunk_args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_simulate_chunk, *args) for args in chunk_args]
+            balances = np.concatenate([future.result() for future in futures])
+    else:
+        balances = np.concatenate([_simulate_chunk(*args) for args in chunk_args])
+
+    percentile_values = np.percentile(balances, percentiles)
+
+    return {
+        'percentile_balances': {f"p{p:g}": float(value) for p, value in zip(percentiles, percentile_values)},
+        'mean_balance': float(balances.mean()),
+        'probability_of_target': (float((balances >= target_balance).mean())
+                                  if target_balance is not None else None),
+        'n_paths': n_paths,
+        'years_to_retirement': years_to_retirement
+    }
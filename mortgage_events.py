@@ -0,0 +1,192 @@
+"""
+Mortgage Event Simulator - New Zealand Edition
+Simulates a mortgage month by month with lump-sum repayments, payment changes,
+offset account balances and revolving credit (redraw) events
+
+Events are sorted by month once and applied one month's batch at a time, so a
+30-year mortgage with thousands of events still runs in a few milliseconds.
+"""
+
+import calendar
+from collections import namedtuple
+from datetime import date
+
+from calculation_finance import calculate_loan_payment
+
+# Event kinds:
+#   lump_sum        - extra repayment off the balance (amount in NZD)
+#   payment_change  - new regular monthly payment (amount in NZD)
+#   offset_change   - deposit to (+) or withdrawal from (-) the offset account
+#   redraw          - draw amount back out of the loan (revolving credit), up to the redraw limit
+# Only offset changes can be negative.
+EVENT_KINDS = ("lump_sum", "payment_change", "offset_change", "redraw")
+MAX_SIMULATION_MONTHS = 100 * 12  # Stop projecting a loan that is never repaid
+
+# month is the payment number (1 = first payment); events apply before that month's interest
+MortgageEvent = namedtuple("MortgageEvent", ["month", "kind", "amount"])
+
+
+def add_months(start_date, months):
+    """
+    Move a date forward by whole months (clamped to the end of shorter months)
+
+    Args:
+        start_date: Starting date
+        months: Number of months to add
+
+    Returns:
+        date: The later date
+    """
+    month_index = start_date.month - 1 + months
+    year = start_date.year + month_index // 12
+    month = month_index % 12 + 1
+    return date(year, month, min(start_date.day, calendar.monthrange(year, month)[1]))
+
+
+def _sorted_event_batches(events):
+    """
+    Sort events by month and combine each month's events into one batch
+
+    Args:
+        events: Iterable of MortgageEvent or (month, kind, amount) tuples
+
+    Returns:
+        list: (month, lump_sum total, new payment or None, offset change total, redraw total,
+              number of events), in month order
+    """
+    batches = []
+    for month, kind, amount in sorted((MortgageEvent(*event) for event in events), key=lambda event: event[0]):
+        if kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown mortgage event '{kind}'")
+        if month != int(month):
+            raise ValueError(f"Event month {month} is not a whole number of months")
+        month = int(month)
+        if month < 1:
+            raise ValueError("Event months start at 1")
+        if amount < 0 and kind != "offset_change":
+            raise ValueError(f"The {kind.replace('_', ' ')} amount in month {month} cannot be negative")
+
+        if not batches or batches[-1][0] != month:
+            batches.append([month, 0.0, None, 0.0, 0.0, 0])
+        batch = batches[-1]
+        batch[5] += 1
+
+        if kind == "lump_sum":
+            batch[1] += amount
+        elif kind == "payment_change":
+            batch[2] = amount  # Later changes in the same month win
+        elif kind == "offset_change":
+            batch[3] += amount
+        else:
+            batch[4] += amount
+
+    return batches
+
+
+def simulate_mortgage(loan_amount, annual_rate, years, events=(), start_date=None, redraw_limit=None,
+                      offset_balance=0.0):
+    """
+    Simulate a mortgage with extra repayments, payment changes, an offset account and redraws
+
+    Interest each month is charged on the balance less the offset account balance. Redraws
+    can't take the balance above redraw_limit (the original loan amount by default).
+
+    Args:
+        loan_amount: Amount borrowed in NZD
+        annual_rate: Annual interest rate as percentage
+        years: Loan term in years
+        events: Iterable of MortgageEvent or (month, kind, amount) tuples, in any order
+        start_date: Date of the loan (defaults to today); first payment is one month later
+        redraw_limit: Highest balance redraws may reach (defaults to loan_amount)
+        offset_balance: Offset account balance at the start
+
+    Returns:
+        dict: Payoff month and date, interest paid, interest and months saved, and the
+              number of events applied and skipped (those after the loan was repaid)
+    """
+    scheduled_payment, scheduled_interest, _ = calculate_loan_payment(loan_amount, annual_rate, years)
+    scheduled_months = int(round(years * 12))
+    monthly_rate = annual_rate / 100 / 12
+    start_date = date.today() if start_date is None else start_date
+    redraw_limit = loan_amount if redraw_limit is None else redraw_limit
+
+    batches = _sorted_event_batches(events)
+    next_batch = 0
+    events_applied = 0
+
+    balance = float(loan_amount)
+    payment = scheduled_payment
+    offset = float(offset_balance)
+    total_interest = 0.0
+    total_paid = 0.0
+    total_redrawn = 0.0
+    month = 0
+
+    while balance > 0.005 and month < MAX_SIMULATION_MONTHS:
+        month += 1
+
+        # Apply this month's batch of events
+        if next_batch < len(batches) and batches[next_batch][0] == month:
+            _, lump_sum, new_payment, offset_change, redraw, event_count = batches[next_batch]
+            next_batch += 1
+            events_applied += event_count
+
+            if new_payment is not None:
+                payment = new_payment
+            offset = max(offset + offset_change, 0.0)
+            if redraw:
+                redraw = min(redraw, max(redraw_limit - balance, 0.0))
+                balance += redraw
+                total_redrawn += redraw
+            if lump_sum:
+                lump_sum = min(lump_sum, balance)
+                balance -= lump_sum
+                total_paid += lump_sum
+                if balance <= 0.005:
+                    break
+
+        interest = max(balance - offset, 0.0) * monthly_rate
+        month_payment = min(payment, balance + interest)
+        balance += interest - month_payment
+        total_interest += interest
+        total_paid += month_payment
+
+    paid_off = balance <= 0.005
+
+    return {
+        'paid_off': paid_off,
+        'months_to_payoff': month if paid_off else None,
+        'payoff_date': add_months(start_date, month) if paid_off else None,
+        'scheduled_payoff_date': add_months(start_date, scheduled_months),
+        'months_saved': scheduled_months - month if paid_off else None,
+        'total_interest': total_interest,
+        'scheduled_total_interest': scheduled_interest,
+        'interest_saved': scheduled_interest - total_interest,
+        'total_paid': total_paid,
+        'total_redrawn': total_redrawn,
+        'remaining_balance': max(balance, 0.0),
+        'events_applied': events_applied,
+        'events_skipped': sum(batch[5] for batch in batches) - events_applied
+    }
+
+
+def simulate_nz_mortgage(home_price, down_payment, annual_rate, years, events=(), start_date=None,
+                         redraw_limit=None, offset_balance=0.0):
+    """
+    Simulate an NZ mortgage with events (see simulate_mortgage)
+
+    Args:
+        home_price: Total price of the home in NZD
+        down_payment: Down payment amount in NZD
+        annual_rate: Annual interest rate as percentage
+        years: Mortgage term in years
+        events: Iterable of MortgageEvent or (month, kind, amount) tuples
+        start_date: Date of the loan (defaults to today)
+        redraw_limit: Highest balance redraws may reach (defaults to the loan amount)
+        offset_balance: Offset account balance at the start
+
+    Returns:
+        dict: Payoff month and date, interest paid, interest and months saved
+    """
+    return simulate_mortgage(home_price - down_payment, annual_rate, years, events, start_date,
+                             redraw_limit, offset_balance)
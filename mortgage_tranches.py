@@ -0,0 +1,253 @@
+"""
+Split Mortgage Engine - New Zealand Edition
+Models a home loan split into tranches, each fixed for a period and then floating
+
+Each tranche has its own rate path: a list of (month, annual rate %) changes, the
+first at month 1. Whenever a tranche's rate changes (the fixed period ends or it is
+re-fixed) its payment is recalculated over the remaining term, as NZ banks do.
+
+Tranche schedules are cached. Changing one tranche only recomputes that tranche;
+the consolidated cashflow is then re-summed from the cached schedules.
+"""
+
+from calculation_finance import AmortizationRow, calculate_loan_payment
+
+
+def fixed_then_floating(fixed_rate, fixed_years, floating_rate):
+    """
+    Build the rate path for a tranche fixed for a period that then reverts to floating
+
+    Args:
+        fixed_rate: Fixed annual interest rate as percentage
+        fixed_years: Length of the fixed period in years
+        floating_rate: Floating annual interest rate as percentage
+
+    Returns:
+        list: [(1, fixed_rate), (first floating month, floating_rate)]
+    """
+    return [(1, fixed_rate), (_fixed_months(fixed_years) + 1, floating_rate)]
+
+
+def _fixed_months(fixed_years):
+    """Length of a fixed period in whole months (at least one)"""
+    fixed_months = int(round(fixed_years * 12))
+    if fixed_months < 1:
+        raise ValueError("Fixed period must be at least one month")
+    return fixed_months
+
+
+class Tranche:
+    """
+    One part of a split mortgage
+    """
+
+    __slots__ = ("name", "amount", "months", "rate_path", "schedule")
+
+    def __init__(self, name, amount, years, rate_path):
+        """
+        Create a tranche
+
+        Args:
+            name: Tranche name (e.g. "2 year fixed")
+            amount: Amount borrowed in this tranche, in NZD
+            years: Loan term in years
+            rate_path: (month, annual rate %) changes, the first at month 1
+        """
+        if amount <= 0:
+            raise ValueError("Tranche amount must be greater than zero")
+        if years <= 0:
+            raise ValueError("Tranche term must be greater than zero")
+
+        self.name = name
+        self.amount = amount
+        self.months = int(round(years * 12))
+        self.rate_path = _checked_rate_path(rate_path)
+        self.schedule = None  # Cached list of AmortizationRow
+
+    def calculate_schedule(self):
+        """
+        Calculate the month-by-month schedule for the tranche
+
+        Returns:
+            list: AmortizationRow (month, payment, interest, principal, balance) for each month
+        """
+        changes = dict(self.rate_path)
+        balance = self.amount
+        monthly_rate = 0.0
+        monthly_payment = 0.0
+        schedule = []
+
+        for month in range(1, self.months + 1):
+            if month in changes:
+                annual_rate = changes[month]
+                monthly_rate = annual_rate / 100 / 12
+                remaining_years = (self.months - month + 1) / 12
+                monthly_payment = calculate_loan_payment(balance, annual_rate, remaining_years)[0]
+
+            interest = balance * monthly_rate
+            principal_paid = monthly_payment - interest
+            balance -= principal_paid
+            schedule.append(AmortizationRow(month, monthly_payment, interest, principal_paid, balance))
+
+        return schedule
+
+
+def _checked_rate_path(rate_path):
+    """Sort a rate path and check it starts at month 1"""
+    rate_path = sorted((int(month), rate) for month, rate in rate_path)
+    if not rate_path or rate_path[0][0] != 1:
+        raise ValueError("Rate path must start at month 1")
+    if len({month for month, rate in rate_path}) != len(rate_path):
+        raise ValueError("Rate path has more than one rate for the same month")
+    return rate_path
+
+
+class SplitMortgage:
+    """
+    Mortgage made up of several tranches with a consolidated monthly cashflow
+    """
+
+    def __init__(self):
+        """Create a mortgage with no tranches"""
+        self.tranches = {}
+        self.recalculations = {}  # Tranche name: number of times its schedule was computed
+        self._cashflow = None
+
+    def add_tranche(self, name, amount, years, rate_path):
+        """
+        Add a tranche
+
+        Args:
+            name: Tranche name (must be unique)
+            amount: Amount borrowed in this tranche, in NZD
+            years: Loan term in years
+            rate_path: (month, annual rate %) changes, the first at month 1
+                       (see fixed_then_floating)
+        """
+        if name in self.tranches:
+            raise ValueError(f"There is already a tranche called '{name}'")
+        self.tranches[name] = Tranche(name, amount, years, rate_path)
+        self.recalculations[name] = 0
+        self._cashflow = None
+
+    def remove_tranche(self, name):
+        """
+        Remove a tranche (e.g. once it has been repaid or rolled into another)
+
+        Args:
+            name: Tranche name
+        """
+        self._tranche(name)
+        del self.tranches[name]
+        del self.recalculations[name]
+        self._cashflow = None
+
+    def set_rate_path(self, name, rate_path):
+        """
+        Replace a tranche's rate path
+
+        Args:
+            name: Tranche name
+            rate_path: (month, annual rate %) changes, the first at month 1
+        """
+        tranche = self._tranche(name)
+        tranche.rate_path = _checked_rate_path(rate_path)
+        self._invalidate(tranche)
+
+    def refix(self, name, month, annual_rate, fixed_years=None, floating_rate=None):
+        """
+        Re-fix a tranche's rate from a month, replacing the rest of its rate path
+
+        Args:
+            name: Tranche name
+            month: First month at the new rate
+            annual_rate: New annual interest rate as percentage
+            fixed_years: Length of the new fixed period (None floats at annual_rate until the end)
+            floating_rate: Rate after the fixed period (defaults to the tranche's last rate)
+        """
+        tranche = self._tranche(name)
+        if not 1 <= month <= tranche.months:
+            raise ValueError(f"Re-fix month must be between 1 and {tranche.months}")
+        fixed_months = None if fixed_years is None else _fixed_months(fixed_years)
+
+        if floating_rate is None:
+            floating_rate = tranche.rate_path[-1][1]
+        rate_path = [(change_month, rate) for change_month, rate in tranche.rate_path if change_month < month]
+        rate_path.append((month, annual_rate))
+        if fixed_months is not None:
+            rate_path.append((month + fixed_months, floating_rate))
+
+        tranche.rate_path = _checked_rate_path(rate_path)
+        self._invalidate(tranche)
+
+    def tranche_schedule(self, name):
+        """
+        Get a tranche's schedule, recomputing it only if the tranche has changed
+
+        Args:
+            name: Tranche name
+
+        Returns:
+            list: AmortizationRow for each month of the tranche
+        """
+        tranche = self._tranche(name)
+        if tranche.schedule is None:
+            tranche.schedule = tranche.calculate_schedule()
+            self.recalculations[name] += 1
+        return tranche.schedule
+
+    def cashflow(self):
+        """
+        Get the consolidated monthly cashflow across all tranches
+
+        Returns:
+            list: AmortizationRow with each month's totals over every tranche still running
+        """
+        if self._cashflow is None:
+            schedules = [self.tranche_schedule(name) for name in self.tranches]
+            months = max((len(schedule) for schedule in schedules), default=0)
+            payment = [0.0] * months
+            interest = [0.0] * months
+            principal = [0.0] * months
+            balance = [0.0] * months
+
+            for schedule in schedules:
+                for row in schedule:
+                    index = row.month - 1
+                    payment[index] += row.payment
+                    interest[index] += row.interest
+                    principal[index] += row.principal
+                    balance[index] += row.balance
+
+            self._cashflow = [AmortizationRow(index + 1, payment[index], interest[index], principal[index],
+                                              balance[index]) for index in range(months)]
+        return self._cashflow
+
+    def summary(self):
+        """
+        Summarise the consolidated cashflow
+
+        Returns:
+            dict: First monthly payment, highest monthly payment, totals and payoff month
+        """
+        cashflow = self.cashflow()
+        return {
+            'loan_amount': sum(tranche.amount for tranche in self.tranches.values()),
+            'first_monthly_payment': cashflow[0].payment if cashflow else 0.0,
+            'highest_monthly_payment': max((row.payment for row in cashflow), default=0.0),
+            'total_interest': sum(row.interest for row in cashflow),
+            'total_paid': sum(row.payment for row in cashflow),
+            'payoff_month': len(cashflow),
+            'tranches': len(self.tranches)
+        }
+
+    def _tranche(self, name):
+        """Look up a tranche by name"""
+        if name not in self.tranches:
+            raise ValueError(f"No tranche called '{name}'")
+        return self.tranches[name]
+
+    def _invalidate(self, tranche):
+        """Drop the cached schedules that depend on a changed tranche"""
+        tranche.schedule = None
+        self._cashflow = None
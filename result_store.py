@@ -0,0 +1,350 @@
+"""
+Columnar Result Store - New Zealand Edition
+Binary files of calculation results with one contiguous typed array per field
+
+Layout: an 8-byte magic number, the header length (uint64, little endian), a JSON
+header (row count, and each column's name, NumPy dtype and offset), then each
+column's values back to back, every column starting on a 64-byte boundary.
+Columns are opened with numpy.memmap, so a 10M-row file opens instantly and
+filtering only reads the columns it touches.
+
+Category columns (e.g. calculator name) are stored as uint8 codes with their
+labels in the header. History records use RECORD_FIELDS names, so stores written
+by write_history_store() turn back into CalculationRecord objects.
+"""
+
+import json
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from history_records import RECORD_FIELDS, CalculationRecord
+
+MAGIC = b"PFCSTOR1"
+EXTENSION = ".pfcs"
+ALIGNMENT = 64  # Column start alignment in bytes
+DEFAULT_CHUNK_ROWS = 65536  # Rows buffered by ResultStoreWriter.write() before they go to disk
+CATEGORY = "category"  # Column type for text values from a small set (stored as uint8 codes)
+
+# Columns of a history store: calculator and date, then every calculator's values
+HISTORY_COLUMNS = {"kind": CATEGORY, "date_ordinal": np.int32}
+for _fields in RECORD_FIELDS.values():
+    HISTORY_COLUMNS.update((field, np.float64) for field in _fields)
+del _fields
+
+
+def _aligned(offset):
+    """Round an offset up to the next column boundary"""
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class ResultStoreWriter:
+    """
+    Writes a result store a chunk at a time (use as a context manager, or call close())
+
+    Each column is spooled to its own temporary file, so memory use stays constant
+    however many rows are written. close() joins them into the final file; leaving
+    the with block with an exception discards them instead, so a failed run never
+    leaves a partial store.
+    """
+
+    def __init__(self, path, columns, kind=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        Create a writer
+
+        Args:
+            path: Output file path
+            columns: dict of column name to NumPy dtype (or CATEGORY)
+            kind: Optional description stored in the header (e.g. "loan")
+            chunk_rows: Rows buffered by write() before they are spooled
+        """
+        self.path = path
+        self.kind = kind
+        self.chunk_rows = chunk_rows
+        self.dtypes = {name: np.dtype(np.uint8 if dtype == CATEGORY else dtype) for name, dtype in columns.items()}
+        self.labels = {name: [] for name, dtype in columns.items() if dtype == CATEGORY}
+        self.rows = 0
+        self.count = 0  # Matches the export_writers writers
+        self._buffer = {name: [] for name in columns}
+        self._spools = {name: tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(path)))
+                        for name in columns}
+
+    def _code(self, name, label):
+        """Category code for a label, adding it if new"""
+        labels = self.labels[name]
+        if label not in labels:
+            if len(labels) == 256:
+                raise ValueError(f"Column '{name}' has more than 256 different values")
+            labels.append(label)
+        return labels.index(label)
+
+    def _convert(self, name, value):
+        """Convert one row value to its column type (missing values become NaN, 0 or False)"""
+        if name in self.labels:
+            return self._code(name, "" if value is None else str(value))
+
+        kind = self.dtypes[name].kind
+        if kind == "b":
+            return value not in (None, "", 0, "0", "false", "False")
+        if value is None or value == "":
+            return np.nan if kind == "f" else 0
+        return float(value) if kind == "f" else int(value)
+
+    def write(self, row):
+        """
+        Add one row
+
+        Args:
+            row: dict of column name to value (missing columns are NaN, 0 or False)
+        """
+        for name, values in self._buffer.items():
+            values.append(self._convert(name, row.get(name)))
+        self.count += 1
+        if len(self._buffer[next(iter(self._buffer))]) >= self.chunk_rows:
+            self._flush()
+
+    def write_all(self, rows):
+        """
+        Add every row from an iterable
+
+        Args:
+            rows: Iterable (or generator) of row dicts
+
+        Returns:
+            int: Rows added by write() so far
+        """
+        for row in rows:
+            self.write(row)
+        return self.count
+
+    def append_arrays(self, columns):
+        """
+        Add a chunk of rows given as whole columns (e.g. calculation_batch results)
+
+        Args:
+            columns: dict of column name to array (every column, all the same length;
+                     category columns take label arrays)
+        """
+        self._flush()
+        lengths = {len(np.atleast_1d(columns[name])) for name in self.dtypes}
+        if len(lengths) != 1:
+            raise ValueError("Every column must have the same number of rows")
+
+        for name, dtype in self.dtypes.items():
+            values = np.atleast_1d(columns[name])
+            if name in self.labels:
+                values = [self._code(name, str(label)) for label in values]
+            np.asarray(values, dtype=dtype).tofile(self._spools[name])
+        self.rows += lengths.pop()
+
+    def _flush(self):
+        """Spool buffered rows to the column files"""
+        rows = len(self._buffer[next(iter(self._buffer))]) if self._buffer else 0
+        if not rows:
+            return
+        for name, values in self._buffer.items():
+            np.asarray(values, dtype=self.dtypes[name]).tofile(self._spools[name])
+            values.clear()
+        self.rows += rows
+
+    def close(self):
+        """Write the finished store (through a temporary file) and remove the spool files"""
+        if self._spools is None:
+            return
+        self._flush()
+
+        columns = []
+        offset = 0
+        for name, dtype in self.dtypes.items():
+            column = {"name": name, "dtype": dtype.str, "offset": offset}
+            if name in self.labels:
+                column["labels"] = self.labels[name]
+            columns.append(column)
+            offset = _aligned(offset + self.rows * dtype.itemsize)
+        header = json.dumps({"rows": self.rows, "kind": self.kind, "columns": columns}).encode("utf-8")
+        data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "wb") as store_file:
+                store_file.write(MAGIC + struct.pack("<Q", len(header)) + header)
+                for column in columns:
+                    store_file.write(b"\0" * (data_start + column["offset"] - store_file.tell()))
+                    spool = self._spools[column["name"]]
+                    spool.seek(0)
+                    while True:
+                        block = spool.read(DEFAULT_CHUNK_ROWS * 8)
+                        if not block:
+                            break
+                        store_file.write(block)
+            os.replace(temp_path, self.path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            for spool in self._spools.values():
+                spool.close()
+            self._spools = None
+
+    def discard(self):
+        """Remove the spool files without writing the store (e.g. after a failed run)"""
+        if self._spools is None:
+            return
+        for spool in self._spools.values():
+            spool.close()
+        self._spools = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+class ResultStore:
+    """
+    Read-only, memory-mapped view of a result store
+    """
+
+    def __init__(self, path):
+        """
+        Open a result store (only the header is read)
+
+        Args:
+            path: Store file path
+        """
+        with open(path, "rb") as store_file:
+            if store_file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{os.path.basename(path)} is not a result store")
+            header_length, = struct.unpack("<Q", store_file.read(8))
+            header = json.loads(store_file.read(header_length).decode("utf-8"))
+
+        self.path = path
+        self.rows = header["rows"]
+        self.kind = header["kind"]
+        self.labels = {}
+        self.columns = {}
+
+        data_start = _aligned(len(MAGIC) + 8 + header_length)
+        for column in header["columns"]:
+            dtype = np.dtype(column["dtype"])
+            if self.rows:
+                self.columns[column["name"]] = np.memmap(path, dtype=dtype, mode="r",
+                                                         offset=data_start + column["offset"], shape=(self.rows,))
+            else:
+                self.columns[column["name"]] = np.empty(0, dtype=dtype)  # mmap can't map zero bytes
+            if "labels" in column:
+                self.labels[column["name"]] = column["labels"]
+
+    def __getitem__(self, name):
+        """Memory-mapped array of a column"""
+        return self.columns[name]
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def names(self):
+        """Column names in file order"""
+        return list(self.columns)
+
+    def code(self, name, label):
+        """
+        Get the stored code of a category label, for filtering (e.g. store["kind"] == code)
+
+        Args:
+            name: Category column name
+            label: Label text
+
+        Returns:
+            int: Code (-1 if the label never appears, which matches no rows)
+        """
+        labels = self.labels[name]
+        return labels.index(label) if label in labels else -1
+
+    def decode(self, name, codes):
+        """
+        Turn category codes back into labels
+
+        Args:
+            name: Category column name
+            codes: Array of codes
+
+        Returns:
+            list: Labels
+        """
+        labels = self.labels[name]
+        return [labels[code] for code in np.asarray(codes)]
+
+    def records(self, rows=None):
+        """
+        Rebuild history records from a store written by write_history_store
+
+        Args:
+            rows: Row indices or a boolean mask (None for every row)
+
+        Yields:
+            CalculationRecord: One record per selected row
+        """
+        indices = np.arange(self.rows) if rows is None else np.asarray(rows)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+
+        kinds = self.labels["kind"]
+        kind_codes = self.columns["kind"][indices]
+        date_ordinals = self.columns["date_ordinal"][indices]
+        values = {name: self.columns[name][indices] for name in HISTORY_COLUMNS
+                  if name not in ("kind", "date_ordinal")}
+
+        for position, code in enumerate(kind_codes):
+            kind = kinds[code]
+            yield CalculationRecord(kind, [values[field][position] for field in RECORD_FIELDS[kind]],
+                                    int(date_ordinals[position]))
+
+
+def write_result_store(path, columns, kind=None):
+    """
+    Write whole columns (e.g. calculation_batch results) to a new result store
+
+    Args:
+        path: Output file path
+        columns: dict of column name to array. Columns of text (NumPy string arrays,
+                 or lists of str) are stored as CATEGORY columns of at most 256
+                 different labels; every other column keeps its dtype.
+        kind: Optional description stored in the header
+
+    Returns:
+        int: Number of rows written
+    """
+    dtypes = {}
+    for name, values in columns.items():
+        values = np.asarray(values)
+        dtypes[name] = CATEGORY if values.dtype.kind in "US" else values.dtype
+
+    with ResultStoreWriter(path, dtypes, kind) as writer:
+        writer.append_arrays(columns)
+    return writer.rows
+
+
+def write_history_store(path, records):
+    """
+    Write calculation history records to a new result store
+
+    Args:
+        path: Output file path
+        records: Iterable of CalculationRecord (e.g. a CalculationHistory)
+
+    Returns:
+        int: Number of records written
+    """
+    with ResultStoreWriter(path, HISTORY_COLUMNS, kind="history") as writer:
+        for record in records:
+            row = record.as_dict()
+            row["kind"] = record.kind
+            row["date_ordinal"] = record.date_ordinal
+            writer.write(row)
+    return writer.rows
@@ -0,0 +1,189 @@
+"""
+Startup Check - New Zealand Edition
+Times how long the calculator takes to open and checks it against a budget
+
+Run it in a fresh interpreter so imports are timed cold. Time to first window is
+split into:
+    imports      - importing main (tkinter and everything main imports)
+    widgets      - creating the Tk root and building PersonalFinanceCalculator
+    first paint  - until the window is mapped and drawn
+Exits with status 1 when time to first window is over the budget, so it can gate
+a CI job (which needs a display, e.g. xvfb-run).
+
+With --worker it instead times starting a batch_finance worker process (spawn plus
+imports, no display needed) and fails if that is over budget or the worker loaded
+tkinter or NumPy.
+
+Usage:
+    python -m startup_check --budget 1.5
+    python -m startup_check --worker
+"""
+
+import argparse
+import sys
+import time
+
+import all_constants as c
+
+HEAVY_MODULES = ("tkinter", "numpy")  # Calculation workers shouldn't load these
+
+
+def measure_startup():
+    """
+    Open the calculator window, time each startup stage, then close it
+    (raises ValueError if the window can't be opened, e.g. without a display)
+
+    Returns:
+        dict: Seconds for 'imports', 'widgets', 'first_paint' and 'total',
+              plus 'tabs' (tab name: seconds to build each tab built so far)
+    """
+    start = time.perf_counter()
+    import main
+    imported = time.perf_counter()
+
+    try:
+        root = main.Tk()
+    except main.TclError as e:
+        raise ValueError(f"Could not open the calculator window: {e}") from None
+    root.title("Personal Finance Calculator")
+    app = main.PersonalFinanceCalculator(root)
+    built = time.perf_counter()
+
+    root.wait_visibility(root)
+    root.update()
+    painted = time.perf_counter()
+
+    tab_times = dict(app.tab_build_times)
+    app.worker.shutdown()
+    root.destroy()
+
+    return {
+        'imports': imported - start,
+        'widgets': built - imported,
+        'first_paint': painted - built,
+        'total': painted - start,
+        'tabs': tab_times
+    }
+
+
+def loaded_modules(names):
+    """
+    Check which modules have been imported (runs in the worker process)
+
+    Args:
+        names: Module names
+
+    Returns:
+        list: The names that are in sys.modules
+    """
+    return [name for name in names if name in sys.modules]
+
+
+def measure_worker_startup(runs=3):
+    """
+    Time starting a fresh batch_finance worker process until it has run its first chunk
+
+    Workers are started with "spawn" (a new interpreter, as on Windows and macOS), so
+    the time includes interpreter startup and every import the worker needs.
+
+    Args:
+        runs: Number of workers to start one after another
+
+    Returns:
+        dict: 'runs' (seconds for each), 'best' (fastest) and 'heavy_modules'
+              (HEAVY_MODULES the worker loaded)
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    import batch_finance
+
+    context = multiprocessing.get_context("spawn")
+    times = []
+    heavy_modules = []
+    for run in range(runs):
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            executor.submit(batch_finance.run_chunk, 1, []).result()
+            times.append(time.perf_counter() - start)
+            heavy_modules = executor.submit(loaded_modules, HEAVY_MODULES).result()
+
+    return {'runs': times, 'best': min(times), 'heavy_modules': heavy_modules}
+
+
+def format_report(timings, budget=None):
+    """
+    Format startup timings as a text report
+
+    Args:
+        timings: measure_startup() result
+        budget: Time to first window budget in seconds (None to leave it out)
+
+    Returns:
+        str: One line per stage, then the total
+    """
+    lines = [f"{'Imports':<22}{timings['imports'] * 1000:9.1f} ms",
+             f"{'Widget construction':<22}{timings['widgets'] * 1000:9.1f} ms"]
+    for tab_name, seconds in timings['tabs'].items():
+        lines.append(f"{'  ' + tab_name:<22}{seconds * 1000:9.1f} ms")
+    lines.append(f"{'First paint':<22}{timings['first_paint'] * 1000:9.1f} ms")
+
+    total = f"{'Time to first window':<22}{timings['total'] * 1000:9.1f} ms"
+    if budget is not None:
+        total += f" (budget {budget * 1000:.0f} ms)"
+    lines.append(total)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """
+    Command line entry point
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
+
+    Returns:
+        int: 0 within budget, 1 over budget (or a worker loaded a heavy module),
+             2 if the window couldn't be opened
+    """
+    parser = argparse.ArgumentParser(prog="python -m startup_check",
+                                     description="Time the calculator's startup and check it against a budget.")
+    parser.add_argument("--budget", type=float,
+                        help=f"Budget in seconds (default: {c.STARTUP_BUDGET_SECONDS} for the window,"
+                             f" {c.WORKER_STARTUP_BUDGET_SECONDS} for a worker)")
+    parser.add_argument("--worker", action="store_true", help="Time a batch worker process instead of the window")
+    parser.add_argument("--runs", type=int, default=3, help="Workers to start for --worker (default: 3)")
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        budget = c.WORKER_STARTUP_BUDGET_SECONDS if args.budget is None else args.budget
+        timings = measure_worker_startup(args.runs)
+        runs = ", ".join(f"{seconds * 1000:.1f}" for seconds in timings['runs'])
+        print(f"Worker spawn + import: best {timings['best'] * 1000:.1f} ms of {runs} ms"
+              f" (budget {budget * 1000:.0f} ms)")
+        status = 0
+        if timings['heavy_modules']:
+            print(f"Worker loaded {', '.join(timings['heavy_modules'])}", file=sys.stderr)
+            status = 1
+        if timings['best'] > budget:
+            print(f"Worker startup is over budget by {(timings['best'] - budget) * 1000:.1f} ms", file=sys.stderr)
+            status = 1
+        return status
+
+    budget = c.STARTUP_BUDGET_SECONDS if args.budget is None else args.budget
+
+    try:
+        timings = measure_startup()
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    print(format_report(timings, budget))
+    if timings['total'] > budget:
+        print(f"Startup is over budget by {(timings['total'] - budget) * 1000:.1f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
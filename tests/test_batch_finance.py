@@ -0,0 +1,165 @@
+"""
+Batch runner (batch_finance): calculator definitions, scenarios and worker startup
+"""
+
+import csv
+import io
+
+import pytest
+
+import all_constants as c
+import batch_finance
+import calculation_finance
+import calculators
+import startup_check
+
+
+def test_batch_calculators_take_the_schema_fields():
+    for name, config in batch_finance.CALCULATORS.items():
+        schema = [field["name"] for field in calculators.field_schema(config["schema"])]
+        assert schema == (config["fields"] + config["optional"])[:len(schema)]
+        if name in calculators.CALCULATORS:
+            assert config["function"] is calculators.CALCULATORS[name]["function"]
+
+
+def test_run_scenario_matches_calculators():
+    scenario = {"current_age": "30", "retirement_age": "65", "current_balance": "20000",
+                "annual_salary": "80000", "employee_rate": "4"}
+    result = batch_finance.run_scenario(scenario, "retirement")
+
+    expected = calculators.calculate("retirement", [30.0, 65.0, 20000.0, 80000.0, 4.0, 5.0])
+    assert "error" not in result
+    assert result["projected_balance"] == expected["projected_balance"]
+
+
+def test_worker_skips_heavy_modules_and_starts_within_budget():
+    timings = startup_check.measure_worker_startup(runs=3)
+
+    assert timings["heavy_modules"] == []
+    assert timings["best"] <= c.WORKER_STARTUP_BUDGET_SECONDS
+
+
+def test_output_fields_echo_inputs_before_results():
+    fields = batch_finance.output_fields("mortgage")
+
+    assert fields[:7] == ["row", "calculator", "home_price", "down_payment", "annual_rate", "years",
+                          "include_insurance"]
+    assert fields[-1] == "error"
+    assert fields.index("include_insurance") < fields.index("loan_amount")
+
+
+def test_results_echo_parsed_inputs():
+    result = batch_finance.run_scenario({"home_price": "800000", "down_payment": "160000", "annual_rate": "6",
+                                         "years": "30", "include_insurance": "no"}, "mortgage")
+    assert (result["home_price"], result["down_payment"], result["include_insurance"]) == (800000.0, 160000.0,
+                                                                                          False)
+
+    failed = batch_finance.run_scenario({"principal": "5000", "annual_rate": "abc", "years": "5"}, "loan")
+    assert failed["principal"] == 5000.0
+    assert "annual_rate" not in failed
+    assert failed["error"]
+
+
+def test_store_output_lines_up_with_inputs(tmp_path):
+    np = pytest.importorskip("numpy")
+    import result_store
+
+    input_path = tmp_path / "scenarios.csv"
+    input_path.write_text("calculator,principal,annual_rate,years,home_price,down_payment\n"
+                          "loan,10000,5,2,,\n"
+                          "mortgage,,6,30,700000,140000\n"
+                          "loan,bad,5,2,,\n"
+                          "loan,20000,0,4,,\n", encoding="utf-8")
+    output_path = str(tmp_path / "results.pfcs")
+
+    assert batch_finance.main([str(input_path), output_path]) == 0
+
+    store = result_store.ResultStore(output_path)
+    assert store["row"].tolist() == [1, 2, 3, 4]
+    assert store.decode("calculator", store["calculator"]) == ["loan", "mortgage", "loan", "loan"]
+    assert store["error"].tolist() == [False, False, True, False]
+    np.testing.assert_array_equal(store["principal"], [10000.0, np.nan, np.nan, 20000.0])
+    np.testing.assert_array_equal(store["home_price"], [np.nan, 700000.0, np.nan, np.nan])
+    assert store["monthly_payment"][3] == pytest.approx(20000.0 / 48)
+
+
+def _write_loans(path, count):
+    lines = ["principal,annual_rate,years"] + [f"{10000 + 100 * row},{5 + row % 7},{1 + row % 30}"
+                                                for row in range(count)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_csv_in_csv_out_in_input_order(tmp_path):
+    input_path = tmp_path / "loans.csv"
+    _write_loans(input_path, 23)
+    output_path = tmp_path / "results.csv"
+
+    assert batch_finance.main([str(input_path), str(output_path), "--calculator", "loan", "--chunk-size", "5"]) == 0
+
+    with open(output_path, newline="", encoding="utf-8") as output_file:
+        rows = list(csv.DictReader(output_file))
+    assert [int(row["row"]) for row in rows] == list(range(1, 24))
+    assert list(rows[0]) == batch_finance.output_fields("loan")
+    for row in rows:
+        payment = calculation_finance.calculate_loan_payment(float(row["principal"]), float(row["annual_rate"]),
+                                                             float(row["years"]))[0]
+        assert float(row["monthly_payment"]) == pytest.approx(payment)
+        assert row["error"] == ""
+
+
+def test_worker_processes_give_the_same_output(tmp_path):
+    input_path = tmp_path / "loans.csv"
+    _write_loans(input_path, 40)
+    outputs = []
+    for workers in ("1", "2"):
+        output_path = tmp_path / f"results_{workers}.jsonl"
+        batch_finance.main([str(input_path), str(output_path), "--calculator", "loan_cents", "--workers", workers,
+                            "--chunk-size", "7"])
+        outputs.append(output_path.read_text(encoding="utf-8"))
+
+    assert outputs[0] == outputs[1]
+    assert len(outputs[0].splitlines()) == 40
+
+
+def test_bad_rows_get_error_results():
+    lines = ['{"calculator": "loan", "principal": 5000, "annual_rate": 5, "years": 2}',
+             'not json',
+             '[1, 2]',
+             '',
+             '{"calculator": "lease", "principal": 5000}',
+             '{"calculator": "loan", "principal": 5000, "years": 2}']
+    scenarios = list(batch_finance.read_scenarios(io.StringIO("\n".join(lines)), "jsonl"))
+
+    results = batch_finance.run_chunk(1, scenarios)
+
+    assert [result["row"] for result in results] == [1, 2, 3, 4, 5]
+    assert "error" not in results[0]
+    assert results[1]["error"].startswith("Line 2 is not valid JSON")
+    assert results[2]["error"] == "Line 3 is not a JSON object"
+    assert results[3]["error"] == "Unknown calculator 'lease'"
+    assert results[4]["error"] == "Missing value for annual_rate"
+
+
+def test_validate_gives_the_gui_messages():
+    pytest.importorskip("numpy")
+    scenarios = [{"principal": "5000", "annual_rate": "75", "years": "2"},
+                 {"principal": "5000", "annual_rate": "5", "years": "2"}]
+
+    results = batch_finance.run_chunk(1, scenarios, "loan", validate=True)
+
+    with pytest.raises(ValueError) as gui_error:
+        calculators.validate_inputs("loan", ["5000", "75", "2"])
+    assert results[0]["error"] == str(gui_error.value)
+    assert "error" not in results[1]
+
+
+@pytest.mark.parametrize("chunk_size", ["0", "-3"])
+def test_chunk_size_below_one_is_rejected(tmp_path, chunk_size, capsys):
+    input_path = tmp_path / "loans.csv"
+    _write_loans(input_path, 3)
+
+    with pytest.raises(SystemExit) as exit_info:
+        batch_finance.main([str(input_path), str(tmp_path / "out.csv"), "--chunk-size", chunk_size])
+
+    assert exit_info.value.code == 2
+    assert "--chunk-size must be at least 1" in capsys.readouterr().err
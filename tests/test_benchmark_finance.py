@@ -0,0 +1,52 @@
+"""
+Benchmark suite (benchmark_finance): coverage, options and baseline comparison
+"""
+
+import inspect
+
+import pytest
+
+import benchmark_finance
+import calculation_cents
+import calculation_finance
+import goal_seek
+import mortgage_events
+
+
+@pytest.mark.parametrize("module", [calculation_finance, goal_seek, calculation_cents, mortgage_events])
+def test_every_scalar_entry_point_is_benchmarked(module):
+    timed = {function.__name__ for function, _ in benchmark_finance.SCALAR_BENCHMARKS.values()}
+    entry_points = {name for name, function in inspect.getmembers(module, inspect.isfunction)
+                    if function.__module__ == module.__name__ and not name.startswith("_")}
+    helpers = {"to_cents", "to_rate_units", "round_divide", "regular_payment_cents",  # Parts of the cents kernels
+               "add_months", "simulate_nz_mortgage"}  # Parts of / a thin wrapper round simulate_mortgage
+
+    assert entry_points - helpers <= timed
+
+
+def test_every_benchmark_runs():
+    results = benchmark_finance.run_benchmarks(calls=3, repeats=1)
+
+    assert set(benchmark_finance.SCALAR_BENCHMARKS) <= set(results)
+    for result in results.values():
+        assert result['calls'] == 3
+        assert result['ns_per_call'] > 0
+
+
+@pytest.mark.parametrize("option", ["--calls", "--repeats"])
+def test_counts_below_one_are_rejected(option, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        benchmark_finance.main([option, "0"])
+
+    assert exit_info.value.code == 2
+    assert f"{option} must be at least 1" in capsys.readouterr().err
+
+
+def test_compare_to_baseline_reports_only_slowdowns_over_threshold():
+    baseline = {"fast": {'ns_per_call': 100.0}, "slow": {'ns_per_call': 100.0}, "same": {'ns_per_call': 100.0}}
+    results = {"fast": {'ns_per_call': 80.0}, "slow": {'ns_per_call': 125.0}, "same": {'ns_per_call': 105.0},
+               "new": {'ns_per_call': 50.0}}
+
+    regressions = benchmark_finance.compare_to_baseline(results, baseline, threshold=10)
+
+    assert [(name, change) for name, _, _, change in regressions] == [("slow", pytest.approx(25.0))]
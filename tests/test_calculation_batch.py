@@ -0,0 +1,242 @@
+"""
+Vectorised calculations (calculation_batch) against their scalar versions
+"""
+
+import random
+import types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import calculation_batch
+import calculation_cents
+import calculation_finance
+
+
+def test_loan_payment_batch_matches_scalar_to_the_cent():
+    rng = random.Random(1)
+    loans = [(round(rng.uniform(1000, 2000000), 2), rng.choice([0, round(rng.uniform(0, 25), 2)]),
+              rng.choice([rng.randint(1, 40), rng.randint(1, 480) / 12])) for _ in range(5000)]
+
+    batch = calculation_batch.calculate_loan_payment_batch(*zip(*loans))
+
+    scalar = np.array([calculation_finance.calculate_loan_payment(*loan) for loan in loans]).T
+    for batch_column, scalar_column in zip(batch, scalar):
+        np.testing.assert_allclose(batch_column, scalar_column, rtol=0, atol=0.005)
+
+
+def test_loan_payment_batch_keeps_scalar_accuracy():
+    rng = random.Random(7)
+    loans = [(round(rng.uniform(1000, 2000000), 2), round(rng.uniform(0.5, 25), 2), rng.randint(1, 40))
+             for _ in range(2000)]
+    loans += [(500000, 0.0, 30), (500000, 0.01, 30), (250000, 50, 50)]
+
+    batch = calculation_batch.calculate_loan_payment_batch(*zip(*loans))
+
+    scalar = np.array([calculation_finance.calculate_loan_payment(*loan) for loan in loans]).T
+    np.testing.assert_allclose(batch[0], scalar[0], rtol=1e-10)
+    np.testing.assert_allclose(batch[2], scalar[2], rtol=1e-10)
+    assert batch[1][-3] == 0 and batch[2][-3] == 500000  # 0% rows: exactly the principal, no interest
+
+
+def test_loan_payment_batch_broadcasts():
+    monthly_payment, total_interest, total_amount = calculation_batch.calculate_loan_payment_batch(
+        500000, np.array([[0.0], [6.5]]), [15, 30])
+
+    assert monthly_payment.shape == (2, 2)
+    assert monthly_payment[0, 0] == pytest.approx(500000 / 180)
+    assert total_interest[0, 1] == 0
+    assert monthly_payment[1, 1] == pytest.approx(calculation_finance.calculate_loan_payment(500000, 6.5, 30)[0])
+
+
+@pytest.mark.parametrize("rounding", calculation_cents.ROUNDING_MODES)
+def test_loan_payment_cents_batch_matches_scalar(rounding):
+    rng = random.Random(16)
+    loans = [(round(rng.uniform(0, 1000000), rng.choice([0, 1, 2])), round(rng.uniform(0, 20), 2),
+              rng.randint(1, 360) / 12) for _ in range(300)]
+    loans.append((803624.5, 12, 1 / 12))  # One-month loan: the regular payment isn't the final one
+    principal, annual_rate, years = zip(*loans)
+
+    batch = calculation_batch.calculate_loan_payment_cents_batch(principal, annual_rate, years, rounding)
+
+    for row, loan in enumerate(loans):
+        scalar = calculation_cents.calculate_loan_payment_cents(*loan, rounding=rounding)
+        for field, value in scalar.items():
+            assert batch[field][row] == value, (loan, field)
+
+
+def _currency_amounts():
+    """Random amounts across every digit count, plus half cents, signs, zeros and non-finite values"""
+    rng = np.random.default_rng(17)
+    magnitudes = 10.0 ** rng.uniform(-3, 14, 20000)
+    amounts = magnitudes * rng.choice([-1, 1], magnitudes.size)
+    rounded = np.round(amounts[:5000], 2)
+    half_cents = np.floor(amounts[5000:8000] * 100) / 100 + 0.005
+    specials = [0.0, -0.0, 0.004, -0.004, 0.005, -0.005, 999999.995, 1e6, -1e6, 9999999999.99, 1e10, 1e12,
+                float("nan"), float("inf"), float("-inf")]
+    return np.concatenate([amounts, rounded, half_cents, specials])
+
+
+@pytest.mark.parametrize("currency", calculation_batch.CURRENCY_FORMATS)
+@pytest.mark.parametrize("line_end", ["\n", "\r\n", "$", "0", ","])
+def test_format_currency_bytes_batch_matches_format_currency(currency, line_end):
+    amounts = _currency_amounts()
+
+    expected = "".join(calculation_batch.format_currency(float(amount), currency) + line_end
+                       for amount in amounts)
+
+    assert calculation_batch.format_currency_bytes_batch(amounts, currency, line_end) == expected.encode("utf-8")
+
+
+def test_format_currency_batch_matches_format_currency():
+    amounts = _currency_amounts()
+    expected = [calculation_batch.format_currency(float(amount)) for amount in amounts]
+    assert calculation_batch.format_currency_batch(amounts) == expected
+
+
+@pytest.mark.parametrize("include_tax", [True, False])
+def test_investment_growth_batch_matches_scalar(include_tax):
+    rng = random.Random(2)
+    scenarios = [(round(rng.uniform(0, 500000), 2), round(rng.uniform(0, 50000), 2),
+                  rng.choice([0, round(rng.uniform(-5, 15), 2)]), rng.choice([rng.randint(0, 60), rng.uniform(0, 60)]))
+                 for _ in range(5000)]
+
+    batch = calculation_batch.calculate_investment_growth_nz_batch(*zip(*scenarios), include_tax=include_tax)
+
+    for row, scenario in enumerate(scenarios):
+        scalar = calculation_finance.calculate_investment_growth_nz(*scenario, include_tax=include_tax)
+        for field, value in scalar.items():
+            assert batch[field][row] == pytest.approx(value, rel=1e-12, abs=1e-6), (scenario, field)
+
+
+def test_solve_loan_rate_batch_round_trip():
+    rng = random.Random(12)
+    loans = [(round(rng.uniform(1000, 1000000), 2), rng.choice([0, round(rng.uniform(0, 20), 2)]),
+              rng.choice([rng.randint(1, 40), rng.randint(1, 480) / 12])) for _ in range(20000)]
+    principal, annual_rate, years = [np.array(column) for column in zip(*loans)]
+    payment = calculation_batch.calculate_loan_payment_batch(principal, annual_rate, years)[0]
+
+    solved = calculation_batch.solve_loan_rate_batch(principal, payment, years)
+
+    assert not np.isnan(solved).any()
+    assert (solved[annual_rate == 0] == 0).all()
+    np.testing.assert_allclose(solved, annual_rate, rtol=0, atol=1e-6)
+
+
+def test_retirement_cohort_matches_scalar():
+    rng = random.Random(3)
+    members = [(rng.randint(18, 64), rng.choice([65, 67, 70]), round(rng.uniform(0, 300000), 2),
+                round(rng.uniform(0, 200000), -2), rng.choice([3, 4, 6, 8, 10]), round(rng.uniform(-5, 12), 1),
+                round(rng.uniform(0, 5), 1)) for _ in range(1000)]
+
+    cohort = calculation_batch.calculate_kiwisaver_retirement_cohort(*zip(*members))
+
+    assert cohort['valid'].all()
+    for position, member in enumerate(members):
+        scalar = calculation_finance.calculate_kiwisaver_retirement(*member)
+        assert cohort['years_to_retirement'][position] == scalar['years_to_retirement']
+        assert cohort['projected_balance'][position] == pytest.approx(scalar['projected_balance'], rel=1e-12)
+        assert cohort['sustainable_annual_withdrawal'][position] == pytest.approx(
+            scalar['sustainable_annual_withdrawal'], rel=1e-12)
+        assert cohort['annual_nz_super'][position] == scalar['annual_nz_super']
+
+
+@pytest.mark.parametrize("member", [
+    (65, 65, 1000, 50000),  # Retirement age not above current age
+    (20.5, 20.9, 1000, 50000),  # Less than a whole year to go
+    (0, 80, 1000, 50000),  # More than 70 years
+    (30, 65, -1, 50000),  # Negative balance
+    (30, 65, 1000, -1),  # Negative salary
+    (30, 65, 1000, 50000, 3, 150),  # Return over 100%
+    (20, 90, 1e14, 50000, 3, 100),  # Balance past the limit
+])
+def test_retirement_cohort_flags_rows_the_scalar_rejects(member):
+    with pytest.raises(ValueError):
+        calculation_finance.calculate_kiwisaver_retirement(*member)
+
+    good = (30, 65, 20000, 80000, 3, 5)[:len(member)]
+    cohort = calculation_batch.calculate_kiwisaver_retirement_cohort(*zip(member, good))
+
+    assert cohort['valid'].tolist() == [False, True]
+    assert np.isnan(cohort['projected_balance'][0]) and np.isnan(cohort['annual_nz_super'][0])
+    assert cohort['years_to_retirement'][0] == 0
+    assert cohort['projected_balance'][1] == pytest.approx(
+        calculation_finance.calculate_kiwisaver_retirement(*good)['projected_balance'])
+
+
+def test_amortization_schedule_batch_matches_scalar_schedules():
+    loans = [(250000, 6.5, 30), (15000, 12.9, 4), (80000, 0, 5), (10000, 7, 2.5)]
+
+    batch = calculation_batch.loan_amortization_schedule_batch(*zip(*loans))
+
+    assert batch['months'].tolist() == [360, 48, 60, 30]
+    assert batch['balance'].shape == (4, 360)
+    for position, loan in enumerate(loans):
+        schedule = list(calculation_finance.loan_amortization_schedule(*loan))
+        months = len(schedule)
+        for column in ("interest", "principal", "balance"):
+            expected = [getattr(row, column) for row in schedule]
+            np.testing.assert_allclose(batch[column][position, :months], expected, rtol=1e-9, atol=1e-6)
+            assert not batch[column][position, months:].any()  # Zero after the term
+
+
+def test_amortization_schedule_batch_float32():
+    batch = calculation_batch.loan_amortization_schedule_batch([300000, 20000], [6, 9], [25, 5], dtype=np.float32)
+
+    assert batch['interest'].dtype == batch['balance'].dtype == np.float32
+    assert batch['monthly_payment'].dtype == np.float64
+    assert batch['balance'][0, 299] == pytest.approx(0, abs=0.05)
+
+
+@pytest.mark.parametrize("include_insurance", [True, False])
+def test_mortgage_payment_grid_matches_scalar(include_insurance):
+    rates = [0, 4.0, 4.05, 6.5, 9.0]
+    terms = [5, 10, 15, 20, 25, 30]
+
+    grid = calculation_batch.mortgage_payment_grid(850000, 170000, rates, terms, include_insurance)
+
+    assert grid.shape == (len(rates), len(terms))
+    for row, rate in enumerate(rates):
+        for column, years in enumerate(terms):
+            expected = calculation_finance.calculate_nz_mortgage_payment(850000, 170000, rate, years,
+                                                                         include_insurance)
+            assert grid[row, column] == pytest.approx(expected['total_monthly_payment'], rel=1e-10)
+
+
+def test_heatmap_colour_runs_green_to_yellow_to_red():
+    main = pytest.importorskip("main")  # Needs tkinter
+
+    assert main.heatmap_colour(0) == "#63BE7B"
+    assert main.heatmap_colour(0.5) == "#FFEB84"
+    assert main.heatmap_colour(1) == "#F8696B"
+
+
+class _Entry:
+    def __init__(self, text):
+        self.text = text
+
+    def get(self):
+        return self.text
+
+
+@pytest.mark.parametrize("home_price, down_payment, message", [
+    ("800000", "160000", None),
+    ("800,000", "160000", "❌ Please enter numbers only for Home Price (NZD). Remove any letters or symbols."),
+    ("800000", "", "❌ Please enter a value for Down Payment (NZD)"),
+    ("800000", "-5", "❌ Down Payment (NZD) cannot be negative. Please enter a positive number."),
+    ("800000", "800000", "❌ Down payment cannot be equal to or greater than the home price."),
+])
+def test_mortgage_grid_checks_inputs_like_the_mortgage_tab(home_price, down_payment, message):
+    main = pytest.importorskip("main")  # Needs tkinter
+    grid = main.MortgageGridView.__new__(main.MortgageGridView)
+    grid.tab_name = "Mortgage Calculator"
+    grid.partner = types.SimpleNamespace(entry_vars={grid.tab_name: {
+        "Home Price (NZD)": _Entry(home_price), "Down Payment (NZD)": _Entry(down_payment)}})
+
+    if message is None:
+        assert grid.grid_inputs() == [800000.0, 160000.0]
+    else:
+        with pytest.raises(ValueError) as error:
+            grid.grid_inputs()
+        assert str(error.value) == message
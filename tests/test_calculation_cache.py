@@ -0,0 +1,146 @@
+"""
+Calculation cache (calculation_cache): LRU eviction, TTL expiry, key normalisation and stats
+"""
+
+import pytest
+
+import calculation_cache
+import calculation_finance
+from calculation_cache import CalculationCache
+
+
+class Clock:
+    """Settable monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _cache(maxsize=3, ttl=None):
+    """Cache a calculate_loan_payment that records its calls"""
+    calls = []
+
+    def loan_payment(principal, annual_rate, years=30):
+        calls.append((principal, annual_rate, years))
+        return calculation_finance.calculate_loan_payment(principal, annual_rate, years)
+
+    clock = Clock()
+    return CalculationCache(loan_payment, maxsize=maxsize, ttl=ttl, clock=clock), calls, clock
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache, calls, _ = _cache(maxsize=2)
+    cache(100000, 5)
+    cache(200000, 5)
+    cache(100000, 5)  # Now the most recently used
+    cache(300000, 5)  # Evicts 200000
+
+    cache(100000, 5)
+    cache(200000, 5)
+
+    assert len(calls) == 4
+    assert cache.stats() == {'hits': 2, 'misses': 4, 'evictions': 2, 'expirations': 0, 'size': 2, 'maxsize': 2,
+                             'hit_rate': pytest.approx(2 / 6)}
+
+
+def test_equivalent_calls_share_an_entry():
+    cache, calls, _ = _cache()
+    cache(100000, 5, 30)
+    cache(100000.0, 5.0)
+    cache(principal=100000, annual_rate=5, years=30.0)
+
+    assert len(calls) == 1
+    assert calculation_cache.normalize_argument(-0.0) == 0.0
+    assert calculation_cache.normalize_argument(True) is True
+
+
+def test_entries_expire_after_the_ttl():
+    cache, calls, clock = _cache(ttl=10)
+    cache(100000, 5)
+    clock.now = 10
+    cache(100000, 5)
+    clock.now = 10.5
+    cache(100000, 5)
+
+    assert len(calls) == 2
+    assert cache.stats()['expirations'] == 1
+
+
+def test_configure_without_a_ttl_keeps_the_ttl():
+    cache, calls, clock = _cache(maxsize=3, ttl=10)
+    for principal in (1, 2, 3):
+        cache(principal * 100000, 5)
+
+    cache.configure(maxsize=2)
+    assert cache.ttl == 10
+    assert cache.stats()['size'] == 2
+    assert cache.stats()['evictions'] == 1
+
+    clock.now = 11
+    cache(300000, 5)
+    assert len(calls) == 4  # Still expired
+
+    cache.configure(ttl=None)
+    clock.now = 1000
+    cache(300000, 5)
+    assert len(calls) == 4
+
+
+def test_configure_caches_keeps_each_ttl():
+    saved = {name: (cache.maxsize, cache.ttl) for name, cache in calculation_cache.CACHES.items()}
+    try:
+        calculation_cache.calculate_loan_payment.configure(ttl=60)
+        calculation_cache.configure_caches(maxsize=16)
+
+        assert calculation_cache.calculate_loan_payment.ttl == 60
+        assert calculation_cache.calculate_nz_mortgage_payment.ttl is None
+        assert {cache.maxsize for cache in calculation_cache.CACHES.values()} == {16}
+    finally:
+        for name, (maxsize, ttl) in saved.items():
+            calculation_cache.CACHES[name].configure(maxsize, ttl)
+
+
+def test_cached_dicts_cannot_be_changed_by_callers():
+    cache = CalculationCache(calculation_finance.calculate_nz_mortgage_payment)
+    first = cache(800000, 160000, 6, 30)
+    first['monthly_payment'] = 0
+
+    assert cache(800000, 160000, 6, 30)['monthly_payment'] > 0
+
+
+def test_exceptions_are_not_cached():
+    calls = []
+
+    def failing(value):
+        calls.append(value)
+        raise ValueError("bad input")
+
+    cache = CalculationCache(failing)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            cache(1)
+
+    assert calls == [1, 1]
+    assert cache.stats()['size'] == 0
+
+
+def test_clear_resets_entries_and_counters():
+    cache, calls, _ = _cache()
+    cache(100000, 5)
+    cache(100000, 5)
+
+    cache.clear()
+
+    assert cache.stats()['hits'] == cache.stats()['misses'] == cache.stats()['size'] == 0
+    cache(100000, 5)
+    assert len(calls) == 2
+
+
+def test_size_must_be_positive():
+    with pytest.raises(ValueError, match="at least 1"):
+        CalculationCache(calculation_finance.calculate_loan_payment, maxsize=0)
+    with pytest.raises(ValueError, match="at least 1"):
+        calculation_cache.calculate_loan_payment.configure(maxsize=0)
@@ -0,0 +1,101 @@
+"""
+Scalar calculations (calculation_finance): original-implementation baselines and amortization schedules
+"""
+
+import random
+
+import pytest
+
+import calculation_finance
+
+
+def _baseline_investment_growth(initial_investment, annual_contribution, annual_return_rate, years,
+                                include_tax=True):
+    """calculate_investment_growth_nz as first released, which later versions must match exactly"""
+    rate = annual_return_rate / 100
+    if include_tax:
+        effective_rate = rate * (1 - 0.28)
+    else:
+        effective_rate = rate
+
+    final_value = initial_investment * (1 + effective_rate) ** years
+    for year in range(int(years)):
+        final_value += annual_contribution * (1 + effective_rate) ** (years - year - 1)
+
+    total_contributions = initial_investment + (annual_contribution * years)
+    total_growth = final_value - total_contributions
+    if include_tax:
+        pre_tax_equivalent = total_growth / (1 - 0.28)
+        tax_paid_estimate = pre_tax_equivalent - total_growth
+    else:
+        pre_tax_equivalent = total_growth
+        tax_paid_estimate = 0
+
+    return {
+        'final_value': final_value,
+        'total_contributions': total_contributions,
+        'total_growth': total_growth,
+        'effective_annual_return': effective_rate * 100,
+        'tax_paid_estimate': tax_paid_estimate,
+        'pre_tax_growth': pre_tax_equivalent
+    }
+
+
+def _investment_inputs(count):
+    rng = random.Random(2)
+    for _ in range(count):
+        years = rng.choice([rng.randint(0, 60), round(rng.uniform(0, 60), 2), rng.uniform(-2, 1)])
+        yield (round(rng.uniform(0, 500000), 2), round(rng.uniform(0, 50000), 2),
+               rng.choice([0, round(rng.uniform(-5, 15), 2)]), years)
+
+
+@pytest.mark.parametrize("include_tax", [True, False])
+def test_investment_growth_identical_to_baseline(include_tax):
+    for inputs in _investment_inputs(20000):
+        assert (calculation_finance.calculate_investment_growth_nz(*inputs, include_tax=include_tax)
+                == _baseline_investment_growth(*inputs, include_tax=include_tax)), inputs
+
+
+@pytest.mark.parametrize("principal, annual_rate, years", [(250000, 6.5, 30), (15000, 12.9, 4), (80000, 0, 5),
+                                                           (10000, 7, 2.5)])
+def test_loan_schedule_repays_the_loan(principal, annual_rate, years):
+    schedule = list(calculation_finance.loan_amortization_schedule(principal, annual_rate, years))
+    monthly_payment, total_interest, _ = calculation_finance.calculate_loan_payment(principal, annual_rate, years)
+
+    assert [row.month for row in schedule] == list(range(1, int(round(years * 12)) + 1))
+    assert {row.payment for row in schedule} == {monthly_payment}
+    assert sum(row.interest for row in schedule) == pytest.approx(total_interest, abs=1e-6)
+    assert sum(row.principal for row in schedule) == pytest.approx(principal)
+    assert schedule[-1].balance == pytest.approx(0, abs=1e-6)
+    for row in schedule:
+        assert row.interest + row.principal == pytest.approx(row.payment)
+
+
+def test_schedule_is_generated_lazily():
+    schedule = calculation_finance.loan_amortization_schedule(500000, 6, 30)
+
+    first = next(schedule)
+    assert first.month == 1
+    assert first.interest == pytest.approx(500000 * 0.005)
+    assert first.balance == pytest.approx(500000 - first.principal)
+
+
+def test_mortgage_schedule_amortizes_the_loan_amount():
+    mortgage = list(calculation_finance.mortgage_amortization_schedule(850000, 170000, 6.2, 30))
+
+    assert mortgage == list(calculation_finance.loan_amortization_schedule(680000, 6.2, 30))
+    assert mortgage[0].payment == pytest.approx(
+        calculation_finance.calculate_nz_mortgage_payment(850000, 170000, 6.2, 30)['monthly_payment'])
+
+
+@pytest.mark.parametrize("rate", [0.005, 0.007, 0.01])
+def test_mortgage_insurance_follows_the_rate_constant(monkeypatch, rate):
+    monkeypatch.setattr(calculation_finance, "MORTGAGE_INSURANCE_RATE", rate)
+
+    details = calculation_finance.calculate_nz_mortgage_payment(800000, 160000, 6, 30)
+    uninsured = calculation_finance.calculate_nz_mortgage_payment(800000, 160000, 6, 30, include_insurance=False)
+
+    assert details['insurance_monthly'] == pytest.approx(640000 * rate / 12)
+    assert details['total_monthly_payment'] == pytest.approx(uninsured['total_monthly_payment']
+                                                             + 640000 * rate / 12)
+    assert uninsured['insurance_monthly'] == 0
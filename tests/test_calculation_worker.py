@@ -0,0 +1,112 @@
+"""
+Background calculations (calculation_worker): result delivery, superseded requests and callbacks
+"""
+
+import threading
+from concurrent.futures import wait
+
+import pytest
+
+from calculation_worker import CalculationWorker
+
+
+class FakeRoot:
+    """Stands in for the Tk root: after() callbacks are run by run_pending()"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def run_pending(self):
+        callbacks, self.scheduled = self.scheduled, []
+        for callback in callbacks:
+            callback()
+
+
+@pytest.fixture
+def worker():
+    busy = []
+    calculation_worker = CalculationWorker(FakeRoot(), on_busy_change=busy.append)
+    calculation_worker.busy_changes = busy
+    yield calculation_worker
+    calculation_worker.shutdown()
+
+
+def _finish(worker, *futures):
+    """Wait for the requests' futures and let the main loop deliver their results"""
+    wait(futures, timeout=5)
+    while worker.root.scheduled:
+        worker.root.run_pending()
+
+
+def test_results_are_delivered_on_poll(worker):
+    results = []
+    worker.submit("Loan", pow, (2, 10), results.append, pytest.fail)
+
+    assert worker.is_busy("Loan") and worker.busy_changes == [True]
+    _finish(worker, worker.pending["Loan"][1])
+
+    assert results == [1024]
+    assert not worker.is_busy()
+    assert worker.busy_changes == [True, False]
+
+
+def test_errors_go_to_on_error(worker):
+    errors = []
+    worker.submit("Loan", int, ("abc",), pytest.fail, errors.append)
+    _finish(worker, worker.pending["Loan"][1])
+
+    assert len(errors) == 1 and isinstance(errors[0], ValueError)
+
+
+def test_a_newer_request_supersedes_the_older_one(worker):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow(value):
+        started.set()
+        release.wait(5)
+        return value
+
+    results = []
+    worker.submit("Loan", slow, ("old",), results.append, pytest.fail)
+    old_future = worker.pending["Loan"][1]
+    started.wait(5)
+    worker.submit("Loan", str, ("new",), results.append, pytest.fail)
+    worker.submit("Mortgage", str, ("other tab",), results.append, pytest.fail)
+    new_futures = [future for _, future in worker.pending.values()]
+    release.set()
+
+    _finish(worker, old_future, *new_futures)
+
+    assert sorted(results) == ["new", "other tab"]
+
+
+def test_a_failing_callback_does_not_stop_other_results(worker, caplog):
+    results = []
+
+    def broken(result):
+        raise RuntimeError("widget gone")
+
+    worker.submit("Loan", str, ("loan",), broken, pytest.fail)
+    worker.submit("Mortgage", str, ("mortgage",), results.append, pytest.fail)
+    _finish(worker, *[future for _, future in worker.pending.values()])
+
+    assert results == ["mortgage"]
+    assert "Calculation callback for 'Loan' failed" in caplog.text
+    assert not worker.is_busy()
+
+
+def test_shutdown_drops_pending_requests(worker):
+    release = threading.Event()
+    worker.submit("Loan", release.wait, (5,), pytest.fail, pytest.fail)
+    future = worker.pending["Loan"][1]
+
+    worker.shutdown()
+    release.set()
+    wait([future], timeout=5)
+    worker.root.run_pending()
+
+    assert not worker.is_busy()
@@ -0,0 +1,96 @@
+"""
+Export index (export_index): parsing exports, incremental updates and searches
+"""
+
+import os
+from datetime import date
+
+import pytest
+
+import export_index
+from history_records import CalculationRecord
+
+LOAN = CalculationRecord("Loan", [25000.0, 6.5, 5.0, 489.15], date(2025, 7, 1).toordinal())
+MORTGAGE = CalculationRecord("Mortgage", [800000.0, 160000.0, 6.0, 3837.12, 80.0], date(2025, 8, 15).toordinal())
+INVESTMENT = CalculationRecord("Investment", [10000.0, 1200.0, 7.0, 10.0, 36250.5], date(2025, 10, 2).toordinal())
+
+
+def _write_export(path, records, header=True):
+    lines = ["Personal Finance Calculator - History Export", ""] if header else []
+    lines += [record.to_text() for record in records]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_parse_export_skips_other_lines(tmp_path):
+    path = tmp_path / "finance_calculations.txt"
+    path.write_text("Header\n" + LOAN.to_text() + "\n[not a record]\n\n" + MORTGAGE.to_text() + "\n",
+                    encoding="utf-8")
+
+    assert list(export_index.parse_export(str(path))) == [(2, LOAN), (5, MORTGAGE)]
+
+
+def test_update_indexes_and_searches_records(tmp_path):
+    _write_export(tmp_path / "finance_a.txt", [LOAN, MORTGAGE])
+    _write_export(tmp_path / "finance_b.txt", [INVESTMENT])
+    (tmp_path / "notes.txt").write_text(LOAN.to_text() + "\n", encoding="utf-8")
+
+    with export_index.ExportIndex(str(tmp_path / "index.sqlite3")) as index:
+        stats = index.update(str(tmp_path))
+        assert stats == {'parsed': 2, 'unchanged': 0, 'removed': 0, 'records': 3}
+
+        assert [record for record, _, _ in index.search()] == [LOAN, MORTGAGE, INVESTMENT]
+        assert [record for record, _, _ in index.search(kind="Mortgage")] == [MORTGAGE]
+        assert [record for record, _, _ in index.search(start=date(2025, 8, 1), end=date(2025, 9, 30))] == [MORTGAGE]
+        assert [record for record, _, _ in index.search(minimum={"lvr": 80})] == [MORTGAGE]
+        assert [record for record, _, _ in index.search(maximum={"principal": 20000})] == []
+        assert len(index.search(limit=2)) == 2
+
+        record, path, line_number = index.search(kind="Investment")[0]
+        assert (os.path.basename(path), line_number) == ("finance_b.txt", 3)
+
+
+def test_update_only_reparses_changed_files(tmp_path):
+    first = tmp_path / "finance_a.txt"
+    second = tmp_path / "finance_b.txt"
+    _write_export(first, [LOAN])
+    _write_export(second, [MORTGAGE])
+
+    with export_index.ExportIndex(str(tmp_path / "index.sqlite3")) as index:
+        index.update(str(tmp_path))
+        assert index.update(str(tmp_path)) == {'parsed': 0, 'unchanged': 2, 'removed': 0, 'records': 0}
+
+        _write_export(second, [MORTGAGE, INVESTMENT])
+        assert index.update(str(tmp_path)) == {'parsed': 1, 'unchanged': 1, 'removed': 0, 'records': 2}
+        assert [record for record, _, _ in index.search()] == [LOAN, MORTGAGE, INVESTMENT]
+
+        first.unlink()
+        assert index.update(str(tmp_path)) == {'parsed': 0, 'unchanged': 1, 'removed': 1, 'records': 0}
+        assert [record for record, _, _ in index.search()] == [MORTGAGE, INVESTMENT]
+
+
+def test_index_persists_between_opens(tmp_path):
+    _write_export(tmp_path / "finance_a.txt", [LOAN])
+    index_path = str(tmp_path / "index.sqlite3")
+    with export_index.ExportIndex(index_path) as index:
+        index.update(str(tmp_path))
+
+    with export_index.ExportIndex(index_path) as index:
+        assert index.update(str(tmp_path))['unchanged'] == 1
+        assert [record for record, _, _ in index.search()] == [LOAN]
+
+
+def test_unknown_kind_and_field_are_rejected(tmp_path):
+    with export_index.ExportIndex(str(tmp_path / "index.sqlite3")) as index:
+        with pytest.raises(ValueError, match="Unknown calculation type"):
+            index.search(kind="Lease")
+        with pytest.raises(ValueError, match="Unknown field"):
+            index.search(minimum={"deposit": 1})
+
+
+def test_main_prints_matching_lines(tmp_path, capsys):
+    _write_export(tmp_path / "finance_a.txt", [LOAN, MORTGAGE])
+
+    assert export_index.main([str(tmp_path), "--kind", "Loan"]) == 0
+
+    assert capsys.readouterr().out.splitlines() == [f"finance_a.txt:3: {LOAN.to_text()}"]
+    assert (tmp_path / export_index.DEFAULT_INDEX_NAME).exists()
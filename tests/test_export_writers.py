@@ -0,0 +1,121 @@
+"""
+Export writers (export_writers): formats, compression and export file names
+"""
+
+import builtins
+import csv
+import gzip
+import io
+import json
+import os
+
+import pytest
+
+import export_writers
+from history_records import CalculationRecord
+
+RECORDS = [
+    CalculationRecord("Loan", [25000.0, 6.5, 5.0, 489.15], 739000),
+    CalculationRecord("Investment", [10000.0, 1200.0, 7.0, 10.0, 36250.5], 739001),
+]
+
+
+def test_csv_writer_writes_header_and_rows():
+    stream = io.StringIO()
+    with export_writers.open_writer(stream, "csv") as writer:
+        assert writer.write_all(RECORDS) == 2
+
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert list(rows[0]) == export_writers.HISTORY_FIELDS
+    assert rows[0]["calculator"] == "Loan"
+    assert float(rows[0]["principal"]) == 25000.0
+    assert rows[1]["final_value"] == "36250.5"
+    assert rows[1]["principal"] == ""
+
+
+def test_jsonl_writer_writes_one_object_per_row():
+    stream = io.StringIO()
+    with export_writers.open_writer(stream, "jsonl") as writer:
+        writer.write_all(RECORDS)
+
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [export_writers.row_values(record) for record in RECORDS]
+
+
+def test_text_writer_matches_record_text():
+    stream = io.StringIO()
+    with export_writers.open_writer(stream, "text") as writer:
+        writer.write_all(RECORDS)
+
+    lines = stream.getvalue().splitlines()
+    assert lines[-2:] == [record.to_text() for record in RECORDS]
+    assert [CalculationRecord.from_text(line) for line in lines[-2:]] == RECORDS
+
+
+def test_gzip_export_round_trip(tmp_path):
+    path, count = export_writers.export_records(iter(RECORDS), tmp_path, export_format="jsonl",
+                                                compression="gzip")
+
+    assert count == 2
+    assert path.endswith(".jsonl.gz")
+    with gzip.open(path, "rt", encoding="utf-8") as export_file:
+        assert [json.loads(line) for line in export_file] == [export_writers.row_values(record)
+                                                              for record in RECORDS]
+
+
+def test_zstd_without_zstandard_raises_and_leaves_no_files(tmp_path, monkeypatch):
+    real_import = builtins.__import__
+
+    def import_without_zstandard(name, *args, **kwargs):
+        if name == "zstandard":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", import_without_zstandard)
+
+    with pytest.raises(ValueError, match="zstandard"):
+        export_writers.export_records(iter(RECORDS), tmp_path, export_format="csv", compression="zstd")
+    assert os.listdir(tmp_path) == []
+
+
+def test_repeat_exports_get_new_names(tmp_path):
+    first, _ = export_writers.export_records(iter(RECORDS[:1]), tmp_path, export_format="csv")
+    second, _ = export_writers.export_records(iter(RECORDS), tmp_path, export_format="csv")
+    third, _ = export_writers.export_records(iter(RECORDS), tmp_path, export_format="csv")
+
+    assert len({first, second, third}) == 3
+    assert os.path.basename(first) == export_writers.export_file_name("csv")
+    assert os.path.basename(second) == export_writers.export_file_name("csv", number=2)
+    assert os.path.basename(third) == export_writers.export_file_name("csv", number=3)
+    with open(first, encoding="utf-8") as export_file:
+        assert len(export_file.readlines()) == 2  # The first export is untouched
+
+
+def test_explicit_name_is_never_overwritten(tmp_path):
+    existing = tmp_path / "results.csv"
+    existing.write_text("keep me\n", encoding="utf-8")
+
+    with pytest.raises(FileExistsError):
+        export_writers.export_records(iter(RECORDS), tmp_path, file_name="results.csv", export_format="csv")
+    assert existing.read_text(encoding="utf-8") == "keep me\n"
+    assert sorted(os.listdir(tmp_path)) == ["results.csv"]
+
+
+def test_failed_export_releases_its_name(tmp_path):
+    def failing_rows():
+        yield RECORDS[0]
+        raise RuntimeError("interrupted")
+
+    with pytest.raises(RuntimeError):
+        export_writers.export_records(failing_rows(), tmp_path, export_format="csv")
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("file_name, expected", [
+    ("results.csv", ("csv", None)),
+    ("results.jsonl.gz", ("jsonl", "gzip")),
+    ("results.txt.zst", ("text", "zstd")),
+    ("results.dat", ("csv", None)),
+])
+def test_format_from_name(file_name, expected):
+    assert export_writers.format_from_name(file_name) == expected
@@ -0,0 +1,40 @@
+"""
+Goal-seek solvers (goal_seek) solving back from calculate_loan_payment
+"""
+
+import random
+
+import pytest
+
+import goal_seek
+from calculation_finance import calculate_loan_payment
+
+
+def _loans(count):
+    rng = random.Random(12)
+    return [(round(rng.uniform(1000, 1000000), 2), rng.choice([0, round(rng.uniform(0, 20), 2)]),
+             rng.choice([rng.randint(1, 40), rng.randint(1, 480) / 12])) for _ in range(count)]
+
+
+def test_solve_loan_rate_round_trip():
+    for principal, annual_rate, years in _loans(3000):
+        payment = calculate_loan_payment(principal, annual_rate, years)[0]
+        assert goal_seek.solve_loan_rate(principal, payment, years) == pytest.approx(annual_rate, abs=1e-6)
+
+
+def test_solve_loan_rate_zero_rate():
+    for principal, years in [(100000, 7), (250000, 30), (12345.67, 3.5), (99999.99, 25)]:
+        payment = calculate_loan_payment(principal, 0, years)[0]
+        assert goal_seek.solve_loan_rate(principal, payment, years) == 0.0
+
+
+def test_solve_loan_rate_payment_too_low():
+    with pytest.raises(ValueError):
+        goal_seek.solve_loan_rate(100000, 100000 / 84 * 0.99, 7)
+
+
+def test_solve_loan_principal_and_term_round_trip():
+    for principal, annual_rate, years in _loans(3000):
+        payment = calculate_loan_payment(principal, annual_rate, years)[0]
+        assert goal_seek.solve_loan_principal(payment, annual_rate, years) == pytest.approx(principal, rel=1e-9)
+        assert goal_seek.solve_loan_term(principal, payment, annual_rate) == pytest.approx(years, rel=1e-9)
@@ -0,0 +1,155 @@
+"""
+History journal (history_journal): daily segments, rotation, batched fsync and compaction
+"""
+
+import os
+from datetime import date
+
+import pytest
+
+import history_journal
+from history_journal import HistoryJournal
+from history_records import CalculationRecord
+
+DAY = date(2025, 5, 28)
+
+
+class Clock:
+    """Settable today() for the journal"""
+
+    def __init__(self, day=DAY):
+        self.day = day
+
+    def __call__(self):
+        return self.day
+
+
+def _record(number):
+    return CalculationRecord("Loan", [1000.0 + number, 5.0, 10.0, 10.61], DAY.toordinal())
+
+
+def _lines(path):
+    with open(path, encoding="utf-8") as journal_file:
+        return [line.rstrip("\n") for line in journal_file if line.startswith("[")]
+
+
+def test_records_are_written_once_under_a_header(tmp_path):
+    journal = HistoryJournal(str(tmp_path), today=Clock())
+    for number in range(3):
+        journal.append(_record(number))
+    journal.close()
+
+    assert os.path.basename(journal.path) == "finance_2025_05_28.txt"
+    with open(journal.path, encoding="utf-8") as journal_file:
+        assert journal_file.read().startswith("***** Personal Finance Calculations *****\nGenerated: 28/05/2025")
+    assert _lines(journal.path) == [_record(number).to_text() for number in range(3)]
+
+
+def test_a_later_session_appends_to_the_same_day(tmp_path):
+    for number in range(2):
+        journal = HistoryJournal(str(tmp_path), today=Clock())
+        journal.append(_record(number))
+        journal.close()
+
+    assert os.listdir(tmp_path) == ["finance_2025_05_28.txt"]
+    with open(journal.path, encoding="utf-8") as journal_file:
+        assert journal_file.read().count("Generated:") == 1
+    assert _lines(journal.path) == [_record(0).to_text(), _record(1).to_text()]
+
+
+def test_full_segments_rotate_to_numbered_files(tmp_path):
+    journal = HistoryJournal(str(tmp_path), max_bytes=300, today=Clock())
+    for number in range(12):
+        journal.append(_record(number))
+    journal.close()
+
+    segments = journal.segments()
+    assert [number for day, number, path in segments] == list(range(1, len(segments) + 1))
+    assert len(segments) > 1
+    assert os.path.basename(segments[1][2]) == "finance_2025_05_28_2.txt"
+    assert [line for _, _, path in segments for line in _lines(path)] == [_record(number).to_text()
+                                                                           for number in range(12)]
+
+
+def test_a_new_day_starts_a_new_segment(tmp_path):
+    clock = Clock()
+    journal = HistoryJournal(str(tmp_path), today=clock)
+    journal.append(_record(0))
+    clock.day = date(2025, 5, 29)
+    journal.append(_record(1))
+    journal.close()
+
+    assert [(day, number) for day, number, _ in journal.segments()] == [(DAY, 1), (date(2025, 5, 29), 1)]
+
+
+def test_fsync_is_batched(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr(history_journal.os, "fsync", synced.append)
+    journal = HistoryJournal(str(tmp_path), fsync_batch=4, today=Clock())
+
+    for number in range(10):
+        journal.append(_record(number))
+    assert len(synced) == 2
+
+    journal.close()
+    assert len(synced) == 3
+    journal.sync()
+    assert len(synced) == 3  # Nothing left to sync
+
+
+def test_compact_merges_earlier_days_and_keeps_today(tmp_path):
+    clock = Clock()
+    journal = HistoryJournal(str(tmp_path), max_bytes=300, today=clock)
+    texts = []
+    for day_number in range(3):
+        clock.day = date(2025, 5, 26 + day_number)
+        for number in range(6):
+            journal.append(_record(10 * day_number + number))
+            texts.append(_record(10 * day_number + number).to_text())
+    journal.close()
+    today_segments = [path for day, _, path in journal.segments() if day == clock.day]
+
+    archive_path, merged = journal.compact()
+
+    assert merged > 2
+    assert os.path.basename(archive_path) == "finance_archive.txt"
+    assert _lines(archive_path) == texts[:12]
+    assert [path for _, _, path in journal.segments()] == today_segments
+
+    # Compacting again appends to the archive, and include_today takes the rest
+    archive_path, merged = journal.compact(include_today=True)
+    assert merged == len(today_segments)
+    assert _lines(archive_path) == texts
+    with open(archive_path, encoding="utf-8") as archive_file:
+        assert archive_file.read().count("Generated:") == 1
+    assert journal.segments() == []
+
+
+def test_compact_with_nothing_to_merge(tmp_path):
+    journal = HistoryJournal(str(tmp_path), today=Clock())
+    journal.append(_record(0))
+
+    assert journal.compact() == (os.path.join(str(tmp_path), "finance_archive.txt"), 0)
+    assert sorted(os.listdir(tmp_path)) == ["finance_2025_05_28.txt"]
+    journal.close()
+
+
+def test_closing_the_calculator_compacts_the_journal(tmp_path):
+    main = pytest.importorskip("main")  # Needs tkinter
+
+    class Stub:
+        def __getattr__(self, name):
+            return lambda *args: None
+
+    clock = Clock(date(2025, 5, 27))
+    app = main.PersonalFinanceCalculator.__new__(main.PersonalFinanceCalculator)
+    app.worker, app.root, app.calculation_history = Stub(), Stub(), Stub()
+    app.journal = HistoryJournal(str(tmp_path), today=clock)
+    app.journal.append(_record(0))
+    clock.day = DAY
+    app.journal.append(_record(1))
+
+    app.close_calculator()
+
+    assert sorted(os.listdir(tmp_path)) == ["finance_2025_05_28.txt", "finance_archive.txt"]
+    assert _lines(str(tmp_path / "finance_archive.txt")) == [_record(0).to_text()]
@@ -0,0 +1,70 @@
+"""
+Calculation history (history_records): records, spilling to disk and cleanup
+"""
+
+import os
+
+import pytest
+
+from history_records import CalculationHistory
+
+
+def _fill(history, count):
+    for number in range(count):
+        history.add("Loan", [1000.0 + number, 5.0, 10.0, 10.61], 739000)
+
+
+def test_spilled_history_keeps_every_record():
+    history = CalculationHistory(3)
+    _fill(history, 10)
+    try:
+        assert history.spilled == 7
+        assert [record.values[0] for record in history] == [1000.0 + number for number in range(10)]
+    finally:
+        history.close()
+
+
+def test_close_removes_spill_file():
+    history = CalculationHistory(2)
+    _fill(history, 5)
+    spill_path = history.spill_path
+    assert os.path.exists(spill_path)
+
+    history.close()
+
+    assert not os.path.exists(spill_path)
+    assert history.spill_path is None
+
+
+def test_close_keeps_a_spill_file_it_did_not_create(tmp_path):
+    spill_path = tmp_path / "history.csv"
+    history = CalculationHistory(2, spill_path=str(spill_path))
+    _fill(history, 5)
+
+    history.close()
+
+    assert spill_path.exists()
+
+
+def test_closing_the_calculator_removes_the_spill_file():
+    main = pytest.importorskip("main")  # Needs tkinter
+
+    class Stub:
+        def __init__(self):
+            self.calls = []
+
+        def __getattr__(self, name):
+            return lambda *args: self.calls.append(name)
+
+    app = main.PersonalFinanceCalculator.__new__(main.PersonalFinanceCalculator)
+    app.worker, app.journal, app.root = Stub(), Stub(), Stub()
+    app.calculation_history = CalculationHistory(2)
+    _fill(app.calculation_history, 5)
+    spill_path = app.calculation_history.spill_path
+
+    app.close_calculator()
+
+    assert not os.path.exists(spill_path)
+    assert app.worker.calls == ["shutdown"]
+    assert app.journal.calls == ["close", "compact"]
+    assert app.root.calls == ["destroy"]
@@ -0,0 +1,86 @@
+"""
+History viewer model (history_view.HistoryRows): sorting and chunked searches
+"""
+
+import pytest
+
+from history_records import CalculationRecord
+
+history_view = pytest.importorskip("history_view")  # Needs tkinter
+
+RECORDS = [
+    CalculationRecord("Loan", [25000.0, 6.5, 5.0, 489.15], 739000),
+    CalculationRecord("Investment", [10000.0, 1200.0, 7.0, 10.0, 36250.5], 739002),
+    CalculationRecord("Loan", [8000.0, 9.0, 2.0, 365.48], 739001),
+    CalculationRecord("Mortgage", [800000.0, 160000.0, 6.0, 3837.12, 80.0], 739002),
+]
+
+
+def _search(rows, query, count=1, narrow=True):
+    rows.start_search(query, narrow)
+    steps = 0
+    while not rows.search_step(count):
+        steps += 1
+    return steps
+
+
+def test_starts_newest_first():
+    rows = history_view.HistoryRows(RECORDS)
+
+    assert rows.visible == [3, 2, 1, 0]
+    assert not rows.searching
+
+
+@pytest.mark.parametrize("column, descending, expected", [
+    ("date", False, [0, 2, 3, 1]),
+    ("date", True, [3, 1, 2, 0]),
+    ("result", True, [1, 3, 0, 2]),
+    ("calculator", False, [1, 2, 0, 3]),
+])
+def test_sort_orders_and_ties_keep_newest_first(column, descending, expected):
+    rows = history_view.HistoryRows(RECORDS)
+
+    rows.sort(column, descending)
+
+    assert rows.visible == expected
+    assert (rows.sort_column, rows.descending) == (column, descending)
+
+
+def test_search_runs_in_chunks_and_ignores_case():
+    rows = history_view.HistoryRows(RECORDS)
+
+    assert _search(rows, "  LOAN ") == 3  # One record per step
+    assert rows.visible == [2, 0]
+
+    rows.start_search("")
+    assert rows.visible == rows.order and not rows.searching
+
+
+def test_longer_query_only_checks_the_current_matches():
+    rows = history_view.HistoryRows(RECORDS)
+    _search(rows, "loan", count=10)
+
+    rows.start_search("loan: amount: $8")
+    assert rows._candidates == [2, 0]
+    rows.search_step()
+    assert rows.visible == [2]
+
+    _search(rows, "mortgage", count=10)
+    assert rows.visible == [3]
+
+
+def test_sort_keeps_the_search():
+    rows = history_view.HistoryRows(RECORDS)
+    _search(rows, "loan", count=10)
+
+    rows.sort("result", descending=False)
+    rows.search_step()
+
+    assert rows.visible == [2, 0]
+
+
+def test_row_text_formats_the_columns():
+    date_text, kind, result, details = history_view.row_text(RECORDS[0])
+
+    assert (date_text, kind, result) == ("24/04/2024", "Loan", "$489.15 NZD")
+    assert details == RECORDS[0].to_text().partition(": ")[2]
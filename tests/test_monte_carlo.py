@@ -0,0 +1,82 @@
+"""
+Monte Carlo retirement simulator (monte_carlo): seeding, reproducibility and return distributions
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import calculation_finance  # noqa: E402
+import monte_carlo  # noqa: E402  Needs NumPy
+
+MEMBER = (35, 65, 40000, 85000)
+
+
+def test_same_seed_gives_the_same_result():
+    first = monte_carlo.simulate_kiwisaver_retirement(*MEMBER, n_paths=5000, seed=42, target_balance=800000)
+    second = monte_carlo.simulate_kiwisaver_retirement(*MEMBER, n_paths=5000, seed=42, target_balance=800000)
+    other = monte_carlo.simulate_kiwisaver_retirement(*MEMBER, n_paths=5000, seed=43, target_balance=800000)
+
+    assert first == second
+    assert other['mean_balance'] != first['mean_balance']
+
+
+def test_result_does_not_depend_on_workers():
+    in_process = monte_carlo.simulate_kiwisaver_retirement(*MEMBER, n_paths=3000, seed=7, chunk_size=1000)
+    pooled = monte_carlo.simulate_kiwisaver_retirement(*MEMBER, n_paths=3000, seed=7, chunk_size=1000, workers=2)
+
+    assert pooled == in_process
+
+
+def test_zero_volatility_matches_the_fixed_return_projection():
+    for distribution in monte_carlo.RETURN_DISTRIBUTIONS:
+        result = monte_carlo.simulate_kiwisaver_retirement(*MEMBER, 4, 6, volatility=0, n_paths=10, seed=1,
+                                                           distribution=distribution)
+        expected = calculation_finance.calculate_kiwisaver_retirement(*MEMBER, 4, 6)['projected_balance']
+
+        for balance in result['percentile_balances'].values():
+            assert balance == pytest.approx(expected, rel=1e-9)
+        assert result['years_to_retirement'] == 30
+
+
+def test_percentiles_are_ordered_and_target_probability_is_a_fraction():
+    result = monte_carlo.simulate_kiwisaver_retirement(*MEMBER, n_paths=20000, seed=3, percentiles=(5, 50, 95),
+                                                       target_balance=600000)
+
+    balances = result['percentile_balances']
+    assert list(balances) == ["p5", "p50", "p95"]
+    assert balances["p5"] < balances["p50"] < balances["p95"]
+    assert 0 < result['probability_of_target'] < 1
+    assert monte_carlo.simulate_kiwisaver_retirement(*MEMBER, n_paths=10, seed=3)['probability_of_target'] is None
+
+
+@pytest.mark.parametrize("distribution", monte_carlo.RETURN_DISTRIBUTIONS)
+def test_returns_have_the_requested_mean_and_volatility(distribution):
+    rng = np.random.default_rng(11)
+    multipliers = monte_carlo.simulate_returns(rng, 200000, 5, 6, 12, distribution)
+
+    assert multipliers.shape == (200000, 5)
+    assert multipliers.min() >= 0
+    assert multipliers.mean() == pytest.approx(1.06, abs=0.002)
+    assert multipliers.std() == pytest.approx(0.12, abs=0.002)
+
+
+def test_normal_returns_are_floored_at_minus_100_percent():
+    multipliers = monte_carlo.simulate_returns(np.random.default_rng(5), 10000, 1, 0, 200, "normal")
+
+    assert multipliers.min() == 0
+
+
+@pytest.mark.parametrize("kwargs, message", [
+    ({"current_age": 65}, "greater than current age"),
+    ({"current_balance": -1}, "Negative values"),
+    ({"volatility": -1}, "Volatility"),
+    ({"n_paths": 0}, "at least 1"),
+    ({"distribution": "uniform"}, "normal, lognormal"),
+])
+def test_bad_inputs_are_rejected(kwargs, message):
+    arguments = dict(zip(("current_age", "retirement_age", "current_balance", "annual_salary"), MEMBER))
+    arguments.update(kwargs)
+
+    with pytest.raises(ValueError, match=message):
+        monte_carlo.simulate_kiwisaver_retirement(**arguments)
@@ -0,0 +1,115 @@
+"""
+Mortgage events (mortgage_events): event ordering, skipped events and shortened schedules
+"""
+
+from datetime import date
+
+import pytest
+
+import calculation_finance as calc
+from mortgage_events import MortgageEvent, add_months, simulate_mortgage, simulate_nz_mortgage
+
+START = date(2025, 1, 31)
+
+
+def test_no_events_follows_the_regular_schedule():
+    result = simulate_mortgage(500000, 6.0, 30, start_date=START)
+    payment, total_interest, _ = calc.calculate_loan_payment(500000, 6.0, 30)
+
+    assert result['months_to_payoff'] == 360
+    assert result['months_saved'] == 0
+    assert result['total_interest'] == pytest.approx(total_interest)
+    assert result['total_paid'] == pytest.approx(payment * 360)
+    assert result['payoff_date'] == result['scheduled_payoff_date'] == date(2055, 1, 31)
+
+
+def test_lump_sums_shorten_the_schedule():
+    plain = simulate_mortgage(500000, 6.0, 30, start_date=START)
+    result = simulate_mortgage(500000, 6.0, 30, [(month, "lump_sum", 10000) for month in range(12, 361, 12)],
+                               start_date=START)
+
+    assert result['paid_off']
+    assert result['months_to_payoff'] < 360
+    assert result['months_saved'] == 360 - result['months_to_payoff']
+    assert result['interest_saved'] == pytest.approx(plain['total_interest'] - result['total_interest'])
+    assert result['interest_saved'] > 0
+    assert result['payoff_date'] == add_months(START, result['months_to_payoff'])
+
+
+def test_event_order_does_not_matter():
+    events = [(24, "lump_sum", 20000), (6, "offset_change", 30000), (60, "payment_change", 4000),
+              (36, "redraw", 5000), (6, "lump_sum", 1000)]
+
+    in_order = simulate_mortgage(400000, 6.5, 30, sorted(events), start_date=START)
+    shuffled = simulate_mortgage(400000, 6.5, 30, [MortgageEvent(*event) for event in reversed(events)],
+                                 start_date=START)
+
+    assert shuffled == in_order
+    assert in_order['events_applied'] == 5
+
+
+def test_the_last_payment_change_in_a_month_wins():
+    first_then_second = simulate_mortgage(300000, 6.0, 25, [(12, "payment_change", 2500),
+                                                             (12, "payment_change", 3000)], start_date=START)
+    second_only = simulate_mortgage(300000, 6.0, 25, [(12, "payment_change", 3000)], start_date=START)
+
+    assert first_then_second['months_to_payoff'] == second_only['months_to_payoff']
+    assert first_then_second['total_interest'] == pytest.approx(second_only['total_interest'])
+
+
+def test_events_after_payoff_are_skipped():
+    result = simulate_mortgage(100000, 6.0, 10, [(12, "lump_sum", 200000), (13, "lump_sum", 500),
+                                                 (200, "redraw", 1000)], start_date=START)
+
+    assert result['months_to_payoff'] == 12
+    assert result['remaining_balance'] == 0
+    assert result['events_applied'] == 1
+    assert result['events_skipped'] == 2
+    assert result['total_redrawn'] == 0
+
+
+def test_offset_balance_cuts_interest_and_withdrawals_can_be_negative():
+    plain = simulate_mortgage(400000, 6.0, 30, start_date=START)
+    offset = simulate_mortgage(400000, 6.0, 30, [(1, "offset_change", 50000), (120, "offset_change", -20000)],
+                               start_date=START)
+
+    assert offset['total_interest'] < plain['total_interest']
+    assert offset['months_to_payoff'] < plain['months_to_payoff']
+
+
+def test_redraws_stop_at_the_limit():
+    result = simulate_mortgage(200000, 6.0, 30, [(24, "redraw", 1000000)], start_date=START)
+    schedule = list(calc.loan_amortization_schedule(200000, 6.0, 30))
+
+    assert result['total_redrawn'] == pytest.approx(200000 - schedule[22].balance)
+
+
+@pytest.mark.parametrize("kind", ["lump_sum", "payment_change", "redraw"])
+def test_negative_amounts_are_rejected(kind):
+    with pytest.raises(ValueError, match="cannot be negative"):
+        simulate_mortgage(300000, 6.0, 25, [(12, kind, -500)], start_date=START)
+
+
+@pytest.mark.parametrize("event, message", [
+    ((12.5, "lump_sum", 1000), "not a whole number of months"),
+    ((0, "lump_sum", 1000), "start at 1"),
+    ((12, "holiday", 0), "Unknown mortgage event"),
+])
+def test_bad_events_are_rejected(event, message):
+    with pytest.raises(ValueError, match=message):
+        simulate_mortgage(300000, 6.0, 25, [event], start_date=START)
+
+
+def test_nz_mortgage_borrows_the_price_less_the_deposit():
+    events = [(12, "lump_sum", 5000)]
+    assert (simulate_nz_mortgage(800000, 160000, 6.0, 30, events, START)
+            == simulate_mortgage(640000, 6.0, 30, events, START))
+
+
+@pytest.mark.parametrize("start, months, expected", [
+    (date(2025, 1, 31), 1, date(2025, 2, 28)),
+    (date(2024, 1, 31), 1, date(2024, 2, 29)),
+    (date(2025, 11, 15), 3, date(2026, 2, 15)),
+])
+def test_add_months_clamps_to_the_end_of_the_month(start, months, expected):
+    assert add_months(start, months) == expected
@@ -0,0 +1,107 @@
+"""
+Split mortgages (mortgage_tranches): tranche schedules, re-fixing and the consolidated cashflow
+"""
+
+import pytest
+
+import calculation_finance as calc
+from mortgage_tranches import SplitMortgage, Tranche, fixed_then_floating
+
+
+def _split():
+    mortgage = SplitMortgage()
+    mortgage.add_tranche("1 year fixed", 300000, 30, fixed_then_floating(5.5, 1, 7.0))
+    mortgage.add_tranche("floating", 100000, 25, [(1, 7.0)])
+    return mortgage
+
+
+def test_single_rate_tranche_matches_the_amortization_schedule():
+    schedule = Tranche("floating", 250000, 20, [(1, 6.5)]).calculate_schedule()
+    expected = list(calc.loan_amortization_schedule(250000, 6.5, 20))
+
+    assert len(schedule) == len(expected) == 240
+    for row, expected_row in zip(schedule, expected):
+        assert row == pytest.approx(expected_row)
+
+
+def test_payment_is_recalculated_when_the_fixed_period_ends():
+    schedule = Tranche("2 year fixed", 400000, 30, fixed_then_floating(5.0, 2, 8.0)).calculate_schedule()
+
+    fixed_payment = calc.calculate_loan_payment(400000, 5.0, 30)[0]
+    floating_payment = calc.calculate_loan_payment(schedule[23].balance, 8.0, 28)[0]
+    assert schedule[0].payment == pytest.approx(fixed_payment)
+    assert schedule[23].payment == pytest.approx(fixed_payment)
+    assert schedule[24].payment == pytest.approx(floating_payment)
+    assert schedule[-1].balance == pytest.approx(0, abs=1e-6)
+
+
+def test_cashflow_sums_every_tranche_month_by_month():
+    mortgage = _split()
+    fixed = mortgage.tranche_schedule("1 year fixed")
+    floating = mortgage.tranche_schedule("floating")
+    cashflow = mortgage.cashflow()
+
+    assert len(cashflow) == 360
+    assert cashflow[0].payment == pytest.approx(fixed[0].payment + floating[0].payment)
+    assert cashflow[0].balance == pytest.approx(fixed[0].balance + floating[0].balance)
+    assert cashflow[300].payment == pytest.approx(fixed[300].payment)  # The floating tranche has been repaid
+    summary = mortgage.summary()
+    assert summary['loan_amount'] == 400000
+    assert summary['payoff_month'] == 360
+    assert summary['total_paid'] - summary['total_interest'] == pytest.approx(400000)
+
+
+def test_changing_one_tranche_only_recalculates_that_tranche():
+    mortgage = _split()
+    mortgage.cashflow()
+    assert mortgage.recalculations == {"1 year fixed": 1, "floating": 1}
+
+    mortgage.refix("1 year fixed", 13, 6.0, fixed_years=2)
+    mortgage.cashflow()
+    mortgage.cashflow()
+
+    assert mortgage.recalculations == {"1 year fixed": 2, "floating": 1}
+
+
+def test_refix_replaces_the_rest_of_the_rate_path():
+    mortgage = _split()
+    mortgage.refix("1 year fixed", 13, 6.0, fixed_years=3)
+    assert mortgage.tranches["1 year fixed"].rate_path == [(1, 5.5), (13, 6.0), (49, 7.0)]
+
+    mortgage.refix("1 year fixed", 49, 6.25)
+    assert mortgage.tranches["1 year fixed"].rate_path == [(1, 5.5), (13, 6.0), (49, 6.25)]
+
+
+@pytest.mark.parametrize("fixed_years", [0, -1, 0.01])
+def test_refix_rejects_a_fixed_period_under_a_month(fixed_years):
+    mortgage = _split()
+    rate_path = list(mortgage.tranches["1 year fixed"].rate_path)
+
+    with pytest.raises(ValueError, match="Fixed period must be at least one month"):
+        mortgage.refix("1 year fixed", 13, 6.0, fixed_years=fixed_years)
+    assert mortgage.tranches["1 year fixed"].rate_path == rate_path
+
+
+def test_fixed_then_floating_rejects_a_fixed_period_under_a_month():
+    with pytest.raises(ValueError, match="Fixed period must be at least one month"):
+        fixed_then_floating(5.5, 0, 7.0)
+
+
+@pytest.mark.parametrize("rate_path, message", [
+    ([(2, 6.0)], "must start at month 1"),
+    ([(1, 6.0), (12, 6.5), (12, 7.0)], "more than one rate"),
+])
+def test_bad_rate_paths_are_rejected(rate_path, message):
+    with pytest.raises(ValueError, match=message):
+        Tranche("bad", 100000, 10, rate_path)
+
+
+def test_tranche_names_are_checked():
+    mortgage = _split()
+    with pytest.raises(ValueError, match="already a tranche"):
+        mortgage.add_tranche("floating", 1000, 1, [(1, 5.0)])
+
+    mortgage.remove_tranche("floating")
+    with pytest.raises(ValueError, match="No tranche called 'floating'"):
+        mortgage.tranche_schedule("floating")
+    assert mortgage.summary()['loan_amount'] == 300000
@@ -0,0 +1,95 @@
+"""
+Columnar result store (result_store): writing, memory-mapped reading and history records
+"""
+
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import result_store  # noqa: E402  Needs NumPy
+from history_records import CalculationRecord  # noqa: E402
+
+
+def test_round_trip_keeps_values_categories_and_alignment(tmp_path):
+    path = str(tmp_path / "results.pfcs")
+    columns = {
+        "calculator": np.array(["loan", "mortgage", "loan", "investment", "loan"]),
+        "principal": np.array([1000.0, 2500.5, 3000.0, 0.0, 1e9]),
+        "months": np.array([12, 360, 60, 1, 600], dtype=np.int64),
+        "requires_lmi": np.array([False, True, False, False, True]),
+    }
+
+    assert result_store.write_result_store(path, columns, kind="mixed") == 5
+    store = result_store.ResultStore(path)
+
+    assert len(store) == 5
+    assert store.kind == "mixed"
+    assert store.names == list(columns)
+    assert store.labels["calculator"] == ["loan", "mortgage", "investment"]
+    assert store["calculator"].dtype == np.uint8
+    assert store.decode("calculator", store["calculator"]) == list(columns["calculator"])
+    assert np.flatnonzero(store["calculator"] == store.code("calculator", "loan")).tolist() == [0, 2, 4]
+    assert store.code("calculator", "retirement") == -1
+    for name in ("principal", "months", "requires_lmi"):
+        assert isinstance(store[name], np.memmap)
+        assert store[name].dtype == columns[name].dtype
+        np.testing.assert_array_equal(store[name], columns[name])
+        assert store[name].offset % result_store.ALIGNMENT == 0
+
+
+def test_row_writes_fill_missing_values_and_span_chunks(tmp_path):
+    path = str(tmp_path / "rows.pfcs")
+    with result_store.ResultStoreWriter(path, {"kind": result_store.CATEGORY, "value": "float64",
+                                               "count": "int64", "ok": "bool"}, chunk_rows=3) as writer:
+        writer.write_all({"kind": "a" if row % 2 else "b", "value": row, "count": row, "ok": row % 3 == 0}
+                         for row in range(7))
+        writer.write({"kind": "a"})
+
+    store = result_store.ResultStore(path)
+    assert len(store) == 8
+    assert store.decode("kind", store["kind"]) == ["b", "a", "b", "a", "b", "a", "b", "a"]
+    np.testing.assert_array_equal(store["value"][:7], np.arange(7.0))
+    assert np.isnan(store["value"][7])
+    assert store["count"][7] == 0
+    assert store["ok"].tolist() == [True, False, False, True, False, False, True, False]
+
+
+def test_failed_write_discards_the_partial_store(tmp_path):
+    path = str(tmp_path / "failed.pfcs")
+    with pytest.raises(RuntimeError):
+        with result_store.ResultStoreWriter(path, {"value": "float64"}) as writer:
+            writer.write({"value": 1.0})
+            raise RuntimeError("interrupted")
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_too_many_categories_is_an_error(tmp_path):
+    with pytest.raises(ValueError, match="256"):
+        result_store.write_result_store(str(tmp_path / "wide.pfcs"),
+                                        {"label": np.array([f"label {number}" for number in range(257)])})
+    assert os.listdir(tmp_path) == []
+
+
+def test_history_store_gives_back_records(tmp_path):
+    path = str(tmp_path / "history.pfcs")
+    records = [CalculationRecord("Loan", [25000.0, 6.5, 5.0, 489.15], 739000),
+               CalculationRecord("Retirement", [30.0, 65.0, 20000.0, 80000.0, 912345.67], 739001),
+               CalculationRecord("Loan", [1000.0, 0.0, 1.0, 83.33], 739002)]
+
+    assert result_store.write_history_store(path, records) == 3
+    store = result_store.ResultStore(path)
+
+    assert list(store.records()) == records
+    assert list(store.records(store["kind"] == store.code("kind", "Loan"))) == [records[0], records[2]]
+
+
+def test_empty_store_opens(tmp_path):
+    path = str(tmp_path / "empty.pfcs")
+    result_store.write_result_store(path, {"value": np.array([], dtype=np.float64)})
+
+    store = result_store.ResultStore(path)
+    assert len(store) == 0
+    assert store["value"].dtype == np.float64
@@ -0,0 +1,30 @@
+"""
+Startup timing (startup_check): time to first window against the budget
+"""
+
+import pytest
+
+import all_constants as c
+import startup_check
+
+
+def test_window_opens_within_budget():
+    pytest.importorskip("tkinter")
+    try:
+        timings = startup_check.measure_startup()
+    except ValueError as e:  # No display to open the window on
+        pytest.skip(str(e))
+
+    assert timings["total"] <= c.STARTUP_BUDGET_SECONDS
+    assert timings["imports"] + timings["widgets"] + timings["first_paint"] == pytest.approx(timings["total"])
+
+
+def test_format_report_shows_each_stage_and_budget():
+    timings = {"imports": 0.2, "widgets": 0.1, "first_paint": 0.05, "total": 0.35,
+               "tabs": {"Loan Calculator": 0.02}}
+
+    lines = startup_check.format_report(timings, budget=1.5).splitlines()
+
+    assert lines[0].startswith("Imports") and lines[0].endswith("200.0 ms")
+    assert lines[2].strip().startswith("Loan Calculator")
+    assert lines[-1].endswith("350.0 ms (budget 1500 ms)")